@@ -0,0 +1,139 @@
+"""
+分析结果缓存 - 以规范化正文和分析器版本的哈希为键，缓存关键词与情感打分结果
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+
+from crawl_cache import SQLiteCacheTier, TTLCache
+
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_content(text):
+    """
+    规范化正文：全角/半角统一（NFKC），合并连续空白，去掉首尾空白
+
+    Returns:
+        str: 规范化后的正文
+    """
+    return WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', text or '')).strip()
+
+
+def content_key(text, version, top_k=10):
+    """
+    构建缓存键
+
+    Args:
+        text (str): 正文
+        version (str): 分析器版本（词典、IDF 或算法变化时应随之变化）
+        top_k (int): 关键词数量
+
+    Returns:
+        str: SHA1 十六进制串
+    """
+    data = f'{version}\x00{top_k}\x00{normalize_content(text)}'
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """分析结果缓存
+
+    内存层为不过期的 LRU 缓存；可选的 SQLite 持久化层使服务重启后仍可命中。
+    缓存值为 analyze_text 的结果（keywords、sentiment、sentiment_score）。
+    """
+
+    def __init__(self, max_size=4096, db_path=None, disk_ttl=None):
+        """
+        初始化分析结果缓存
+
+        Args:
+            max_size (int): 内存缓存最大条目数
+            db_path (str): 可选的 SQLite 持久化缓存路径
+            disk_ttl (float): 持久化条目有效期（秒），None 表示不过期
+        """
+        self.memory = TTLCache(max_size=max_size, ttl=None)
+        self.disk = SQLiteCacheTier(db_path, table='analysis_cache') if db_path else None
+        self.disk_ttl = disk_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        if self.disk is not None:
+            self.disk.purge_expired()
+
+    @staticmethod
+    def _restore(value):
+        """JSON 往返后关键词变为列表，恢复为与 jieba 一致的 (词语, 权重) 元组"""
+        return dict(value, keywords=[tuple(item) for item in value['keywords']])
+
+    def get(self, key):
+        """
+        读取缓存并计入命中统计
+
+        Returns:
+            dict: 缓存的分析结果，未命中时返回 None
+        """
+        found, value = self.memory.get(key)
+        if not found and self.disk is not None:
+            found, value = self.disk.get(key)
+            if found:
+                value = self._restore(value)
+                self.memory.set(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value if found else None
+
+    def set(self, key, value):
+        """写入内存缓存和持久化缓存"""
+        value = self._restore(value)
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl=self.disk_ttl)
+
+    def get_or_analyze(self, text, version, analyze, top_k=10):
+        """
+        读取缓存，未命中时调用 analyze(text) 并写入缓存
+
+        Args:
+            text (str): 正文
+            version (str): 分析器版本
+            analyze (callable): 未命中时执行的分析函数
+            top_k (int): 关键词数量
+
+        Returns:
+            dict: 分析结果（与其他请求共享，调用方不应修改）
+        """
+        key = content_key(text, version, top_k)
+        value = self.get(key)
+        if value is None:
+            value = self._restore(analyze(text))
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """清空全部缓存"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        """缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'disk_hits': self.disk_hits,
+            'size': len(self.memory),
+            'max_size': self.memory.max_size,
+            'evictions': self.memory.evictions,
+            'persistent': self.disk is not None
+        }
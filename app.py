@@ -4,9 +4,12 @@
 技术栈: Flask + SQLite + layui + 舆情分析
 """
 
+import math
 import os
+import threading
+import time
 import bcrypt
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from datetime import datetime
@@ -26,6 +29,87 @@ app.config['SECRET_KEY'] = 'zhengqi-secret-key-2024'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///enterprise.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# 舆情分析配置
+app.config['SENTIMENT_LEXICON_DIR'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexicons')  # 情感词典目录
+app.config['OPINION_BATCH_MAX_DOCUMENTS'] = 1000  # 批量分析单次最多文档数
+app.config['TOKENIZER_POOL_WORKERS'] = os.cpu_count() or 1  # 分词工作进程数，0 表示在请求线程中分词
+app.config['TOKENIZER_INLINE_THRESHOLD'] = 2000  # 不超过该字数的输入直接在请求线程中分词
+app.config['TOKENIZER_TIMEOUT'] = 30  # 等待分词结果的最长时间（秒）
+app.config['TOKENIZER_START_METHOD'] = 'fork'  # 工作进程启动方式：fork 在启动阶段预先创建并共享已加载的词典，spawn 各自加载
+app.config['NLP_WARMUP'] = True  # 启动时预热 jieba 词典、IDF 表和情感词典
+app.config['JIEBA_CACHE_FILE'] = os.path.join(app.instance_path, 'jieba.cache')  # 预构建的 jieba 词典缓存
+app.config['CORPUS_INDEX_FILE'] = os.path.join(app.instance_path, 'corpus_idf.npz')  # 报告语料词频索引
+app.config['CORPUS_MIN_DOCUMENTS'] = 20  # 语料报告数达到该值后关键词提取改用语料 IDF
+app.config['OPINION_BATCH_CHUNK_SIZE'] = 16  # 每个分析任务包含的文档数
+app.config['OPINION_REANALYZE_BATCH_SIZE'] = 2000  # 重新分析历史报告时每批读取的报告数
+app.config['ANALYSIS_CACHE_VERSION'] = '1'  # 分析器版本，修改分析算法或情感词典后递增，使旧缓存失效
+app.config['ANALYSIS_CACHE_SIZE'] = 4096  # 分析结果内存缓存最大条目数
+app.config['ANALYSIS_CACHE_DB'] = os.path.join(app.instance_path, 'analysis_cache.db')  # 分析结果持久化缓存，为空时仅使用内存缓存
+app.config['ANALYSIS_CACHE_TTL'] = 30 * 24 * 3600  # 持久化缓存有效期（秒）
+app.config['ANALYSIS_CACHE_IDF_DRIFT'] = 0.1  # 语料报告数增长超过该比例后，基于语料 IDF 的缓存结果失效
+
+# 汇总报告任务配置
+app.config['REPORT_JOB_WORKERS'] = 1  # 同时执行的汇总报告任务数
+app.config['REPORT_JOB_BATCH_SIZE'] = 200  # 每批读取和分析的文章数
+app.config['REPORT_JOB_CLUSTERS'] = 5  # 报告中的话题数量
+app.config['REPORT_JOB_EXCERPTS'] = 3  # 每个话题的代表性摘录数量
+app.config['REPORT_JOB_STALE_SECONDS'] = 600  # 执行中的任务超过该时间没有进度时视为中断，重新执行
+
+# SQL 语句统计配置
+app.config['SQL_QUERY_STATS'] = True  # 统计每个请求执行的 SQL 语句数和耗时，写入 X-SQL-Count / X-SQL-Time 响应头
+app.config['SQL_QUERY_WARN_COUNT'] = 30  # 单个请求的 SQL 语句数超过该值时打印警告（多为 N+1 查询）
+
+# 报告列表配置
+app.config['REPORT_LIST_PAGE_SIZE'] = 20  # 报告列表每页条数
+app.config['REPORT_LIST_MAX_PAGE_SIZE'] = 100  # 报告列表每页最多条数
+
+# 报告全文检索配置
+app.config['SEARCH_PAGE_SIZE'] = 20  # 检索结果每页条数
+app.config['SEARCH_MAX_PAGE_SIZE'] = 100  # 检索结果每页最多条数
+app.config['SEARCH_SNIPPET_TOKENS'] = 32  # 摘要包含的最多词语数
+app.config['SEARCH_INDEX_BATCH_SIZE'] = 2000  # 重建全文索引时每批读取的报告数
+
+# 话题聚类配置
+app.config['TOPIC_CLUSTERS'] = 20  # 话题数量
+app.config['TOPIC_BATCH_SIZE'] = 1000  # 每批增量聚类的文档数
+app.config['TOPIC_MODEL_FILE'] = os.path.join(app.instance_path, 'topic_model.pkl')  # 话题模型文件
+
+# 数据抓取配置
+app.config['CRAWLER_MAX_WORKERS'] = 8  # 批量抓取线程数
+app.config['CRAWLER_PER_HOST_LIMIT'] = 4  # 单个数据源主机最大并发数
+app.config['CRAWLER_BATCH_TIMEOUT'] = 30  # 批量抓取截止时间（秒）
+app.config['CRAWLER_BATCH_MAX_KEYWORDS'] = 50  # 单次批量抓取最多关键词数
+app.config['CRAWLER_POOL_CONNECTIONS'] = 10  # 共享连接池缓存的主机数
+app.config['CRAWLER_POOL_MAXSIZE'] = 10  # 单个主机的最大连接数
+app.config['CRAWLER_MAX_RETRIES'] = 3  # 请求失败最大重试次数
+app.config['CRAWLER_RETRY_BACKOFF'] = 0.5  # 重试退避系数（秒）
+app.config['CRAWLER_PARSER_BACKEND'] = 'lxml'  # 结果页解析后端: lxml / streaming / html.parser
+app.config['CRAWLER_CACHE_TTL'] = 300  # 抓取结果缓存有效期（秒）
+app.config['CRAWLER_CACHE_SIZE'] = 1024  # 内存缓存最大条目数
+app.config['CRAWLER_CACHE_DB'] = None  # 持久化缓存路径，如 instance/crawl_cache.db，为空时仅使用内存缓存
+app.config['CRAWLER_REAL_SEARCH'] = False  # 没有模拟数据时是否请求真实数据源
+app.config['CRAWLER_REQUEST_TIMEOUT'] = 10  # 请求超时时间（秒）
+app.config['CRAWLER_RESPONSE_CACHE_DIR'] = os.path.join(app.instance_path, 'http_cache')  # 条件请求响应缓存目录
+app.config['CRAWLER_SEEN_DB'] = os.path.join(app.instance_path, 'crawl_seen.db')  # 已抓取文章记录（增量抓取）
+app.config['CRAWLER_DEDUP'] = True  # 是否默认合并近似重复（转载）的新闻
+app.config['CRAWLER_NEAR_DUP_DISTANCE'] = 3  # 判定为近似重复的最大 SimHash 汉明距离
+app.config['CRAWLER_RATE_LIMIT'] = 1.0  # 单个数据源主机的最大请求速率（次/秒）
+app.config['CRAWLER_RATE_BURST'] = 3  # 单个数据源主机允许的突发请求数
+app.config['CRAWLER_RATE_MIN'] = 0.05  # 被限流后自适应降速的下限（次/秒）
+app.config['CRAWLER_BREAKER_THRESHOLD'] = 3  # 连续失败多少次后熔断数据源
+app.config['CRAWLER_BREAKER_COOLDOWN'] = 60  # 熔断冷却时间（秒），再次熔断时加倍
+app.config['CRAWLER_MIN_BODY_SIZE'] = 2048  # 正常结果页的最小字节数，更小的页面视为异常
+
+# 定时抓取配置
+app.config['CRAWLER_SCHEDULE_ENABLED'] = False  # 是否随应用启动后台定时抓取
+app.config['CRAWLER_SCHEDULE_KEYWORDS'] = ['西昌', '科技', '人工智能', '财经']  # 定时抓取的关键词
+app.config['CRAWLER_SCHEDULE_INTERVAL'] = 1800  # 每个关键词的抓取间隔（秒）
+app.config['CRAWLER_SCHEDULE_JITTER'] = 0.2  # 抓取间隔随机抖动比例
+app.config['CRAWLER_SCHEDULE_WORKERS'] = 2  # 定时抓取工作线程数
+app.config['CRAWLER_SCHEDULE_MAX_RESULTS'] = 20  # 每次定时抓取的最大结果数量
+app.config['CRAWLER_POLITENESS_DELAY'] = 2.0  # 同一数据源两次请求的最小间隔（秒）
+app.config['CRAWLER_JOB_DB'] = os.path.join(app.instance_path, 'crawl_jobs.db')  # 抓取任务队列
+
 # 初始化数据库
 db = SQLAlchemy(app)
 
@@ -81,6 +165,15 @@ class SystemSetting(db.Model):
 
 class PublicOpinionReport(db.Model):
     """舆情报告模型"""
+    # 与 migrations.py 中的迁移 1 一致：新建数据库由 create_all 创建，已有数据库由迁移添加
+    __table_args__ = (
+        db.Index('ix_report_created_at_id', 'created_at', 'id'),
+        db.Index('ix_report_sentiment_created_at', 'sentiment', 'created_at', 'id'),
+        db.Index('ix_report_created_by_created_at', 'created_by', 'created_at'),
+        db.Index('ix_report_report_date', 'report_date'),
+        db.Index('ix_report_source_report_date', 'source', 'report_date'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text)
@@ -94,6 +187,419 @@ class PublicOpinionReport(db.Model):
     # 关系
     creator = db.relationship('User', backref='reports')
 
+class CrawledArticle(db.Model):
+    """抓取文章模型（定时抓取结果）"""
+    id = db.Column(db.Integer, primary_key=True)
+    url_hash = db.Column(db.String(40), unique=True, nullable=False)  # URL（没有时为标题）的 SHA1
+    keyword = db.Column(db.String(100), index=True)  # 抓取关键词
+    title = db.Column(db.String(500), nullable=False)
+    summary = db.Column(db.Text)
+    url = db.Column(db.String(1000))
+    source = db.Column(db.String(100))
+    cover = db.Column(db.String(1000))
+    duplicate_count = db.Column(db.Integer, default=0)  # 合并的转载数量
+    crawled_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    def to_dict(self):
+        """转换为与抓取结果一致的字典"""
+        return {
+            'id': self.id,
+            'keyword': self.keyword,
+            'title': self.title,
+            'summary': self.summary or '',
+            'url': self.url or '',
+            'source': self.source or '',
+            'cover': self.cover or '',
+            'duplicate_count': self.duplicate_count or 0,
+            'crawl_time': self.crawled_at.strftime('%Y-%m-%d %H:%M:%S') if self.crawled_at else ''
+        }
+
+# 情感打分器（每个进程共享一个实例，词典只编译一次）
+_sentiment_scorer = None
+
+def get_sentiment_scorer():
+    """获取情感打分器"""
+    global _sentiment_scorer
+    if _sentiment_scorer is None:
+        from sentiment_scorer import SentimentScorer
+        _sentiment_scorer = SentimentScorer.from_directory(app.config['SENTIMENT_LEXICON_DIR'])
+    return _sentiment_scorer
+
+# 报告语料词频索引（每个进程共享一个实例）
+_corpus_index = None
+
+def get_corpus_index():
+    """获取报告语料词频索引，首次获取时补充索引上次保存之后新增的报告（需在应用上下文中调用）"""
+    global _corpus_index
+    if _corpus_index is None:
+        from corpus_index import CorpusIndex
+        index = CorpusIndex.load(app.config['CORPUS_INDEX_FILE'])
+        reports = (db.session.query(PublicOpinionReport.id, PublicOpinionReport.content)
+                   .filter(PublicOpinionReport.id > index.last_doc_id)
+                   .order_by(PublicOpinionReport.id)
+                   .all())
+        for report_id, content in reports:
+            index.add_document(content, doc_id=report_id)
+        if reports:
+            index.save(app.config['CORPUS_INDEX_FILE'])
+        _corpus_index = index
+    return _corpus_index
+
+def get_corpus_idf_path():
+    """语料足够大时返回语料 IDF 文件路径，否则返回 None（使用 jieba 自带的 IDF）"""
+    if _corpus_index is None or _corpus_index.n_docs < app.config['CORPUS_MIN_DOCUMENTS']:
+        return None
+    return app.config['CORPUS_INDEX_FILE']
+
+# 分析结果缓存（每个进程共享一个实例）
+_analysis_cache = None
+
+def get_analysis_cache():
+    """获取分析结果缓存"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        from analysis_cache import AnalysisCache
+        db_path = app.config['ANALYSIS_CACHE_DB']
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        _analysis_cache = AnalysisCache(
+            max_size=app.config['ANALYSIS_CACHE_SIZE'],
+            db_path=db_path,
+            disk_ttl=app.config['ANALYSIS_CACHE_TTL']
+        )
+    return _analysis_cache
+
+def get_analysis_version():
+    """
+    分析器版本，参与分析结果缓存键的计算
+
+    使用语料 IDF 时附加语料规模的分代编号：报告数每增长 ANALYSIS_CACHE_IDF_DRIFT 比例换一代，
+    避免每新增一篇报告就使全部缓存失效。
+    """
+    version = app.config['ANALYSIS_CACHE_VERSION']
+    if get_corpus_idf_path() is None:
+        return f'{version}:jieba'
+    generation = int(math.log(_corpus_index.n_docs) / math.log(1 + app.config['ANALYSIS_CACHE_IDF_DRIFT']))
+    return f'{version}:corpus-{generation}'
+
+@db.event.listens_for(PublicOpinionReport, 'after_insert')
+def queue_report_indexing(mapper, connection, target):
+    """新报告在事务提交后加入语料索引"""
+    db.session.info.setdefault('corpus_pending', []).append((1, target.id, target.content))
+
+@db.event.listens_for(PublicOpinionReport, 'after_delete')
+def queue_report_unindexing(mapper, connection, target):
+    """删除的报告在事务提交后移出语料索引"""
+    db.session.info.setdefault('corpus_pending', []).append((-1, target.id, target.content))
+
+@db.event.listens_for(db.session, 'after_commit')
+def apply_corpus_updates(session):
+    """把已提交的报告变更应用到语料索引并保存"""
+    pending = session.info.pop('corpus_pending', None)
+    # 索引尚未加载时无需处理，加载时会按编号补充索引
+    if not pending or _corpus_index is None:
+        return
+    for sign, report_id, content in pending:
+        if sign > 0 and report_id <= _corpus_index.last_doc_id:
+            continue
+        _corpus_index.add_document(content, doc_id=report_id, sign=sign)
+    _corpus_index.save(app.config['CORPUS_INDEX_FILE'])
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_corpus_updates(session):
+    """回滚的报告变更不进入语料索引"""
+    session.info.pop('corpus_pending', None)
+
+class TopicCluster(db.Model):
+    """话题模型（聚类中心的关键词与规模，由增量聚类更新）"""
+    id = db.Column(db.Integer, primary_key=True)  # 聚类编号
+    keywords = db.Column(db.Text)  # JSON 格式的话题关键词
+    size = db.Column(db.Integer, default=0)  # 累计文档数
+    heat = db.Column(db.Float, default=0.0, index=True)  # 按时间衰减的近期文档数
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """转换为字典"""
+        import json
+        return {
+            'id': self.id,
+            'keywords': json.loads(self.keywords or '[]'),
+            'size': self.size,
+            'heat': self.heat,
+            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else ''
+        }
+
+class TopicAssignment(db.Model):
+    """文档所属话题"""
+    __table_args__ = (db.UniqueConstraint('item_type', 'item_id'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    item_type = db.Column(db.String(20), nullable=False)  # report, article
+    item_id = db.Column(db.Integer, nullable=False)
+    cluster_id = db.Column(db.Integer, nullable=False, index=True)
+    assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SentimentDaily(db.Model):
+    """按日、来源汇总的报告情感分布（报告新增/删除时在同一事务中更新）"""
+    __table_args__ = (db.UniqueConstraint('day', 'source'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)  # 报告日期
+    source = db.Column(db.String(100), nullable=False)
+    positive = db.Column(db.Integer, default=0)
+    negative = db.Column(db.Integer, default=0)
+    neutral = db.Column(db.Integer, default=0)
+    total = db.Column(db.Integer, default=0)
+
+class KeywordDaily(db.Model):
+    """按日、来源汇总的报告关键词频次（报告新增/删除时在同一事务中更新）"""
+    __table_args__ = (db.UniqueConstraint('day', 'source', 'keyword'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    source = db.Column(db.String(100), nullable=False)
+    keyword = db.Column(db.String(100), nullable=False)
+    report_count = db.Column(db.Integer, default=0)  # 包含该关键词的报告数
+    weight = db.Column(db.Float, default=0.0)  # 关键词权重之和
+
+class ReportKeyword(db.Model):
+    """报告关键词（由报告的 keywords 列拆分，报告新增/修改/删除时在同一事务中更新）"""
+    __table_args__ = (
+        db.UniqueConstraint('report_id', 'keyword'),
+        db.Index('ix_report_keyword_keyword_report', 'keyword', 'report_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    report_id = db.Column(db.Integer, db.ForeignKey('public_opinion_report.id'), nullable=False)
+    keyword = db.Column(db.String(100), nullable=False)
+    weight = db.Column(db.Float, default=0.0)
+
+def write_report_keywords(connection, report, replace=False):
+    """
+    把报告的关键词写入 report_keyword 表
+
+    Args:
+        connection: 报告写入所在的数据库连接，与报告在同一事务中提交
+        report (PublicOpinionReport): 报告
+        replace (bool): 是否先删除该报告已有的关键词行
+    """
+    from trend_rollups import merge_keywords, parse_keywords
+    
+    table = ReportKeyword.__table__
+    if replace:
+        connection.execute(table.delete().where(table.c.report_id == report.id))
+    rows = [{'report_id': report.id, 'keyword': word, 'weight': weight}
+            for word, weight in merge_keywords(parse_keywords(report.keywords))]
+    if rows:
+        connection.execute(table.insert(), rows)
+
+@db.event.listens_for(PublicOpinionReport, 'after_insert')
+def insert_report_keywords(mapper, connection, target):
+    """新报告的关键词写入关键词表"""
+    write_report_keywords(connection, target)
+
+@db.event.listens_for(PublicOpinionReport, 'after_update')
+def update_report_keywords(mapper, connection, target):
+    """关键词修改后重写该报告的关键词行"""
+    if db.inspect(target).attrs.keywords.history.has_changes():
+        write_report_keywords(connection, target, replace=True)
+
+@db.event.listens_for(PublicOpinionReport, 'after_delete')
+def delete_report_keywords(mapper, connection, target):
+    """删除的报告移出关键词表"""
+    table = ReportKeyword.__table__
+    connection.execute(table.delete().where(table.c.report_id == target.id))
+
+def apply_report_rollup(connection, report, sign=1):
+    """
+    把一篇报告计入（sign=-1 时移出）按日汇总表
+
+    Args:
+        connection: 报告写入所在的数据库连接，汇总与报告在同一事务中提交
+        report (PublicOpinionReport): 报告
+        sign (int): 1 新增，-1 删除
+    """
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    from trend_rollups import report_rollup_rows
+    
+    sentiment_row, keyword_rows = report_rollup_rows(report.report_date, report.source, report.sentiment,
+                                                     report.keywords, sign)
+    table = SentimentDaily.__table__
+    stmt = sqlite_insert(table)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=['day', 'source'],
+            set_={name: table.c[name] + stmt.excluded[name]
+                  for name in ('positive', 'negative', 'neutral', 'total')}
+        ),
+        [sentiment_row]
+    )
+    if keyword_rows:
+        table = KeywordDaily.__table__
+        stmt = sqlite_insert(table)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=['day', 'source', 'keyword'],
+                set_={'report_count': table.c.report_count + stmt.excluded.report_count,
+                      'weight': table.c.weight + stmt.excluded.weight}
+            ),
+            keyword_rows
+        )
+
+@db.event.listens_for(PublicOpinionReport, 'after_insert')
+def rollup_inserted_report(mapper, connection, target):
+    """新报告计入按日汇总"""
+    apply_report_rollup(connection, target, 1)
+
+@db.event.listens_for(PublicOpinionReport, 'after_delete')
+def rollup_deleted_report(mapper, connection, target):
+    """删除的报告移出按日汇总"""
+    apply_report_rollup(connection, target, -1)
+
+def rebuild_rollups(batch_size=2000):
+    """
+    由全部报告重新生成按日汇总表（批量更新报告等绕过 ORM 事件的操作之后调用）
+
+    Returns:
+        int: 汇总的报告数
+    """
+    from collections import defaultdict
+    from trend_rollups import SENTIMENTS, report_rollup_rows
+    
+    sentiments = defaultdict(lambda: dict.fromkeys(SENTIMENTS + ('total',), 0))
+    keywords = defaultdict(lambda: [0, 0.0])
+    columns = (PublicOpinionReport.id, PublicOpinionReport.report_date, PublicOpinionReport.source,
+               PublicOpinionReport.sentiment, PublicOpinionReport.keywords)
+    last_id = 0
+    total = 0
+    while True:
+        rows = (db.session.query(*columns)
+                .filter(PublicOpinionReport.id > last_id)
+                .order_by(PublicOpinionReport.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+        for report_id, day, source, sentiment, keywords_text in rows:
+            sentiment_row, keyword_rows = report_rollup_rows(day, source, sentiment, keywords_text)
+            counts = sentiments[(sentiment_row['day'], sentiment_row['source'])]
+            for name in counts:
+                counts[name] += sentiment_row[name]
+            for row in keyword_rows:
+                entry = keywords[(row['day'], row['source'], row['keyword'])]
+                entry[0] += row['report_count']
+                entry[1] += row['weight']
+        total += len(rows)
+        last_id = rows[-1][0]
+    
+    KeywordDaily.query.delete()
+    SentimentDaily.query.delete()
+    if sentiments:
+        db.session.execute(db.insert(SentimentDaily),
+                           [dict(counts, day=day, source=source) for (day, source), counts in sentiments.items()])
+    if keywords:
+        db.session.execute(db.insert(KeywordDaily),
+                           [{'day': day, 'source': source, 'keyword': keyword,
+                             'report_count': count, 'weight': weight}
+                            for (day, source, keyword), (count, weight) in keywords.items()])
+    db.session.commit()
+    return total
+
+@db.event.listens_for(PublicOpinionReport, 'after_insert')
+def index_inserted_report(mapper, connection, target):
+    """新报告写入全文索引（与报告在同一事务中提交）"""
+    from report_search import index_rows
+    index_rows(connection, [(target.id, target.title, target.content)])
+
+@db.event.listens_for(PublicOpinionReport, 'after_update')
+def index_updated_report(mapper, connection, target):
+    """标题或正文修改后重建该报告的全文索引"""
+    from report_search import index_rows
+    state = db.inspect(target)
+    if state.attrs.title.history.has_changes() or state.attrs.content.history.has_changes():
+        index_rows(connection, [(target.id, target.title, target.content)])
+
+@db.event.listens_for(PublicOpinionReport, 'after_delete')
+def unindex_deleted_report(mapper, connection, target):
+    """删除的报告移出全文索引"""
+    from report_search import remove_rows
+    remove_rows(connection, [target.id])
+
+def rebuild_search_index(batch_size=None):
+    """
+    由全部报告重新生成全文索引（索引为新建、或批量修改报告标题/正文等绕过 ORM 事件的操作之后调用）
+
+    按编号分批读取报告，分词在分词进程池中并行执行，每批在一个事务中写入。
+
+    Returns:
+        int: 索引的报告数
+    """
+    from report_search import FTS_TABLE, prepare_rows, write_rows
+
+    batch_size = batch_size or app.config['SEARCH_INDEX_BATCH_SIZE']
+    chunk_size = app.config['OPINION_BATCH_CHUNK_SIZE']
+    pool = get_tokenizer_pool()
+    with db.engine.begin() as conn:
+        conn.execute(db.text(f'DELETE FROM {FTS_TABLE}'))
+    last_id = 0
+    total = 0
+    while True:
+        query = (db.select(PublicOpinionReport.id, PublicOpinionReport.title, PublicOpinionReport.content)
+                 .where(PublicOpinionReport.id > last_id)
+                 .order_by(PublicOpinionReport.id)
+                 .limit(batch_size))
+        with db.engine.connect() as conn:
+            rows = [tuple(row) for row in conn.execute(query)]
+        if not rows:
+            break
+        futures = [pool.submit(prepare_rows, rows[i:i + chunk_size], docs=len(rows[i:i + chunk_size]))
+                   for i in range(0, len(rows), chunk_size)]
+        params = [item for future in futures for item in future.result(timeout=app.config['TOKENIZER_TIMEOUT'])]
+        with db.engine.begin() as conn:
+            write_rows(conn, params)
+        total += len(rows)
+        last_id = rows[-1][0]
+    return total
+
+class ReportJob(db.Model):
+    """汇总报告任务（按关键词和日期范围汇总抓取文章，在后台线程中执行）"""
+    id = db.Column(db.Integer, primary_key=True)
+    keyword = db.Column(db.String(100), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    status = db.Column(db.String(20), default='pending', index=True)  # pending, running, done, failed
+    total = db.Column(db.Integer, default=0)  # 符合条件的文章数
+    processed = db.Column(db.Integer, default=0)  # 已分析的文章数
+    stats = db.Column(db.Text)  # JSON 格式的情感分布、来源和话题统计
+    error = db.Column(db.Text)
+    report_id = db.Column(db.Integer, db.ForeignKey('public_opinion_report.id'))
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        """转换为字典"""
+        import json
+        return {
+            'id': self.id,
+            'keyword': self.keyword,
+            'start_date': self.start_date.strftime('%Y-%m-%d'),
+            'end_date': self.end_date.strftime('%Y-%m-%d'),
+            'title': self.title,
+            'status': self.status,
+            'total': self.total or 0,
+            'processed': self.processed or 0,
+            'progress': round((self.processed or 0) / self.total, 4) if self.total else 0.0,
+            'stats': json.loads(self.stats) if self.stats else None,
+            'error': self.error,
+            'report_id': self.report_id,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else '',
+            'finished_at': self.finished_at.strftime('%Y-%m-%d %H:%M:%S') if self.finished_at else ''
+        }
+
 @login_manager.user_loader
 def load_user(user_id):
     """加载用户"""
@@ -105,41 +611,74 @@ class PublicOpinionAnalyzer:
     
     @staticmethod
     def extract_keywords(text, top_k=10):
-        """提取关键词"""
-        keywords = jieba.analyse.extract_tags(text, topK=top_k, withWeight=True)
+        """提取关键词（长文本在分词进程池中处理）"""
+        keywords = get_tokenizer_pool().extract_tags(text, top_k=top_k, with_weight=True,
+                                                     idf_path=get_corpus_idf_path())
         return keywords
     
     @staticmethod
     def sentiment_analysis(text):
-        """简单情感分析"""
-        positive_words = ['好', '优秀', '满意', '成功', '进步', '发展', '提升', '改善']
-        negative_words = ['差', '问题', '困难', '失败', '下降', '恶化', '投诉', '不满']
-        
-        positive_count = sum(1 for word in positive_words if word in text)
-        negative_count = sum(1 for word in negative_words if word in text)
-        
-        if positive_count > negative_count:
-            return 'positive'
-        elif negative_count > positive_count:
-            return 'negative'
-        else:
-            return 'neutral'
+        """情感分析，返回 positive / negative / neutral"""
+        return PublicOpinionAnalyzer.sentiment_scores(text)['label']
+    
+    @staticmethod
+    def sentiment_scores(text):
+        """情感打分，返回加权得分、积极/消极得分、命中次数和推导的标签"""
+        return get_sentiment_scorer().score(text)
+    
+    @staticmethod
+    def analyze(text, top_k=10):
+        """关键词提取与情感打分，相同内容直接返回缓存结果"""
+        def run(content):
+            scores = PublicOpinionAnalyzer.sentiment_scores(content)
+            return {
+                'keywords': PublicOpinionAnalyzer.extract_keywords(content, top_k),
+                'sentiment': scores['label'],
+                'sentiment_score': scores
+            }
+        return get_analysis_cache().get_or_analyze(text, get_analysis_version(), run, top_k)
     
     @staticmethod
     def generate_report(title, content, source='手动输入'):
         """生成舆情报告"""
-        keywords = PublicOpinionAnalyzer.extract_keywords(content)
-        sentiment = PublicOpinionAnalyzer.sentiment_analysis(content)
+        analysis = PublicOpinionAnalyzer.analyze(content)
         
         return {
             'title': title,
             'content': content,
-            'keywords': keywords,
-            'sentiment': sentiment,
+            'keywords': analysis['keywords'],
+            'sentiment': analysis['sentiment'],
             'source': source,
             'report_date': datetime.now().date()
         }
 
+@app.before_request
+def start_query_stats():
+    """开始统计本次请求的 SQL 语句"""
+    if app.config['SQL_QUERY_STATS']:
+        import query_stats
+        g.query_stats, g.query_stats_token = query_stats.start()
+
+@app.after_request
+def report_query_stats(response):
+    """把本次请求的 SQL 语句数和耗时写入响应头，语句过多时打印警告"""
+    stats = g.get('query_stats')
+    if stats is not None:
+        response.headers['X-SQL-Count'] = str(stats.count)
+        response.headers['X-SQL-Time'] = f'{stats.elapsed * 1000:.3f}ms'
+        if stats.count > app.config['SQL_QUERY_WARN_COUNT']:
+            print(f"请求 {request.method} {request.path} 执行了 {stats.count} 条 SQL 语句，"
+                  f"耗时 {stats.elapsed * 1000:.1f} ms")
+    return response
+
+@app.teardown_request
+def stop_query_stats(exc):
+    """结束本次请求的 SQL 语句统计"""
+    token = g.pop('query_stats_token', None)
+    if token is not None:
+        import query_stats
+        query_stats.stop(token)
+
 # 路由定义
 @app.route('/')
 def index():
@@ -229,13 +768,31 @@ def dashboard():
     user_count = User.query.count()
     report_count = PublicOpinionReport.query.count()
     
+    article_count = CrawledArticle.query.count()
+    
     # 获取最近的报告
-    recent_reports = PublicOpinionReport.query.order_by(PublicOpinionReport.created_at.desc()).limit(5).all()
+    recent_reports = (PublicOpinionReport.query
+                      .options(db.defer(PublicOpinionReport.content), db.defer(PublicOpinionReport.keywords),
+                               db.joinedload(PublicOpinionReport.creator))
+                      .order_by(PublicOpinionReport.created_at.desc())
+                      .limit(5)
+                      .all())
+    
+    # 获取定时抓取的最新文章
+    recent_articles = CrawledArticle.query.order_by(CrawledArticle.id.desc()).limit(5).all()
+    
+    # 获取当前热门话题（话题表只有 TOPIC_CLUSTERS 行）
+    current_topics = [topic.to_dict() for topic in
+                      TopicCluster.query.filter(TopicCluster.size > 0)
+                      .order_by(TopicCluster.heat.desc()).limit(5).all()]
     
     return render_template('dashboard.html', 
                          user_count=user_count,
                          report_count=report_count,
-                         recent_reports=recent_reports)
+                         article_count=article_count,
+                         recent_reports=recent_reports,
+                         recent_articles=recent_articles,
+                         current_topics=current_topics)
 
 @app.route('/admin/users')
 @login_required
@@ -264,12 +821,129 @@ def admin_settings():
     
     return render_template('admin_settings.html', settings=settings)
 
+def encode_report_cursor(report):
+    """报告列表游标：最后一条报告的 (创建时间, 编号)，编码为 URL 安全的字符串"""
+    import base64
+    value = f"{report.created_at.strftime('%Y-%m-%dT%H:%M:%S.%f')}|{report.id}"
+    return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_report_cursor(cursor):
+    """
+    解析报告列表游标
+
+    Returns:
+        tuple: (创建时间, 报告编号)
+
+    Raises:
+        ValueError: 游标格式不正确
+    """
+    import base64
+    import binascii
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, report_id = value.split('|')
+        return datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%S.%f'), int(report_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f'无效的分页游标: {cursor}')
+
+def list_reports(cursor=None, limit=None, sentiment=None, keyword=None):
+    """
+    按创建时间倒序读取一页报告（键集分页）
+
+    以 (created_at, id) 作为排序键和游标，翻页时直接从上一页最后一条之后读取，
+    不随页数增加扫描更多行；列表中不显示的正文和关键词列延迟加载。
+
+    Args:
+        cursor (str): 上一页返回的游标，为空时读取第一页
+        limit (int): 每页条数
+        sentiment (str): 可选，只返回该情感倾向的报告
+        keyword (str): 可选，只返回包含该关键词的报告（查询关键词表）
+
+    Returns:
+        tuple: (报告列表, 下一页游标，没有下一页时为 None)
+
+    Raises:
+        ValueError: 游标格式不正确
+    """
+    limit = max(1, min(limit or app.config['REPORT_LIST_PAGE_SIZE'], app.config['REPORT_LIST_MAX_PAGE_SIZE']))
+    query = PublicOpinionReport.query.options(db.defer(PublicOpinionReport.content),
+                                              db.defer(PublicOpinionReport.keywords),
+                                              db.joinedload(PublicOpinionReport.creator))
+    if sentiment:
+        query = query.filter(PublicOpinionReport.sentiment == sentiment)
+    if keyword:
+        query = query.filter(PublicOpinionReport.id.in_(
+            db.select(ReportKeyword.report_id).where(ReportKeyword.keyword == keyword)))
+    if cursor:
+        created_at, report_id = decode_report_cursor(cursor)
+        query = query.filter(db.tuple_(PublicOpinionReport.created_at, PublicOpinionReport.id)
+                             < (created_at, report_id))
+    # 多读一条判断是否还有下一页
+    reports = (query.order_by(PublicOpinionReport.created_at.desc(), PublicOpinionReport.id.desc())
+               .limit(limit + 1)
+               .all())
+    next_cursor = encode_report_cursor(reports[limit - 1]) if len(reports) > limit else None
+    return reports[:limit], next_cursor
+
+def report_list_item(report):
+    """报告列表项（不含正文和关键词；创建人应已随报告预加载）"""
+    return {
+        'id': report.id,
+        'title': report.title,
+        'sentiment': report.sentiment,
+        'source': report.source,
+        'report_date': report.report_date.strftime('%Y-%m-%d'),
+        'created_at': report.created_at.strftime('%Y-%m-%d %H:%M:%S') if report.created_at else '',
+        'created_by': report.creator.username if report.creator else ''
+    }
+
 @app.route('/opinion/reports')
 @login_required
 def opinion_reports():
-    """舆情报告页面"""
-    reports = PublicOpinionReport.query.order_by(PublicOpinionReport.created_at.desc()).all()
-    return render_template('opinion_reports.html', reports=reports)
+    """舆情报告页面（q 不为空时按全文检索相关度显示，否则按创建时间倒序分页）"""
+    query = request.args.get('q', '').strip()
+    sentiment = request.args.get('sentiment', '')
+    if query:
+        from report_search import search
+        page = max(1, request.args.get('page', 1, type=int))
+        with db.engine.connect() as conn:
+            result = search(conn, query, page, app.config['SEARCH_PAGE_SIZE'], app.config['SEARCH_SNIPPET_TOKENS'],
+                            sentiment or None)
+        result.update(page=page, per_page=app.config['SEARCH_PAGE_SIZE'])
+        order = [item['id'] for item in result['items']]
+        found = {report.id: report for report in
+                 PublicOpinionReport.query
+                 .options(db.defer(PublicOpinionReport.content), db.defer(PublicOpinionReport.keywords),
+                          db.joinedload(PublicOpinionReport.creator))
+                 .filter(PublicOpinionReport.id.in_(order))}
+        reports = [found[report_id] for report_id in order if report_id in found]
+        highlights = {item['id']: item for item in result['items']}
+        return render_template('opinion_reports.html', reports=reports, query=query, sentiment=sentiment,
+                               highlights=highlights, search=result, cursor=None, next_cursor=None)
+    cursor = request.args.get('cursor') or None
+    try:
+        reports, next_cursor = list_reports(cursor, sentiment=sentiment)
+    except ValueError:
+        return redirect(url_for('opinion_reports', sentiment=sentiment or None))
+    return render_template('opinion_reports.html', reports=reports, query='', sentiment=sentiment,
+                           highlights={}, search=None, cursor=cursor, next_cursor=next_cursor)
+
+@app.route('/api/opinion/reports')
+@login_required
+def api_list_reports():
+    """报告列表API（与报告页面相同的键集分页：cursor 为上一页返回的 next_cursor，可按 keyword 筛选）"""
+    try:
+        reports, next_cursor = list_reports(request.args.get('cursor') or None,
+                                            request.args.get('limit', type=int),
+                                            request.args.get('sentiment') or None,
+                                            request.args.get('keyword', '').strip() or None)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({
+        'success': True,
+        'data': [report_list_item(report) for report in reports],
+        'next_cursor': next_cursor
+    }), 200
 
 @app.route('/opinion/generate', methods=['GET', 'POST'])
 @login_required
@@ -285,10 +959,11 @@ def generate_opinion_report():
             report_data = PublicOpinionAnalyzer.generate_report(title, content, source)
             
             # 保存到数据库
+            from trend_rollups import dump_keywords
             report = PublicOpinionReport(
                 title=report_data['title'],
                 content=report_data['content'],
-                keywords=str(report_data['keywords']),
+                keywords=dump_keywords(report_data['keywords']),
                 sentiment=report_data['sentiment'],
                 source=report_data['source'],
                 report_date=report_data['report_date'],
@@ -297,6 +972,7 @@ def generate_opinion_report():
             
             db.session.add(report)
             db.session.commit()
+            schedule_topic_refresh()
             
             flash('舆情报告生成成功！', 'success')
             return redirect(url_for('opinion_reports'))
@@ -316,23 +992,622 @@ def api_analyze_opinion():
     
     content = data['content']
     
-    # 关键词提取
-    keywords = PublicOpinionAnalyzer.extract_keywords(content)
-    
-    # 情感分析
-    sentiment = PublicOpinionAnalyzer.sentiment_analysis(content)
+    # 关键词提取与情感分析（相同内容命中缓存）
+    analysis = PublicOpinionAnalyzer.analyze(content)
+    keywords = analysis['keywords']
+    scores = analysis['sentiment_score']
+    sentiment = analysis['sentiment']
     
     return jsonify({
         'keywords': keywords,
         'sentiment': sentiment,
+        'sentiment_score': scores,
         'summary': f'分析完成，共提取{len(keywords)}个关键词，情感倾向为{"积极" if sentiment == "positive" else "消极" if sentiment == "negative" else "中性"}。'
     }), 200
 
+# 分词进程池（每个进程共享一个实例，工作进程在首次提交长文本时启动）
+_tokenizer_pool = None
+
+def get_tokenizer_pool():
+    """获取分词进程池"""
+    global _tokenizer_pool
+    if _tokenizer_pool is None:
+        from opinion_batch import init_worker
+        from tokenizer_pool import TokenizerPool
+        _tokenizer_pool = TokenizerPool(
+            workers=app.config['TOKENIZER_POOL_WORKERS'],
+            inline_threshold=app.config['TOKENIZER_INLINE_THRESHOLD'],
+            initializer=init_worker,
+            initargs=(app.config['SENTIMENT_LEXICON_DIR'],),
+            timeout=app.config['TOKENIZER_TIMEOUT'],
+            start_method=app.config['TOKENIZER_START_METHOD']
+        )
+    return _tokenizer_pool
+
+@app.route('/api/opinion/analyze/batch', methods=['POST'])
+@login_required
+def api_analyze_opinion_batch():
+    """批量舆情分析API"""
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get('documents'), list) or not data['documents']:
+        return jsonify({'error': '文档列表不能为空'}), 400
+    
+    documents = data['documents']
+    if len(documents) > app.config['OPINION_BATCH_MAX_DOCUMENTS']:
+        return jsonify({'error': f"单次最多分析 {app.config['OPINION_BATCH_MAX_DOCUMENTS']} 篇文档"}), 400
+    
+    from opinion_batch import analyze_documents
+    
+    results = analyze_documents(
+        documents,
+        top_k=int(data.get('top_k', 10)),
+        pool=get_tokenizer_pool(),
+        scorer=get_sentiment_scorer(),
+        chunk_size=app.config['OPINION_BATCH_CHUNK_SIZE'],
+        idf_path=get_corpus_idf_path(),
+        cache=get_analysis_cache(),
+        cache_version=get_analysis_version()
+    )
+    failed = sum(1 for item in results if 'error' in item)
+    
+    return jsonify({
+        'results': results,
+        'total': len(results),
+        'failed': failed,
+        'summary': f'分析完成，共 {len(results)} 篇文档，其中 {failed} 篇分析失败。'
+    }), 200
+
+@app.route('/api/opinion/cache/stats')
+@login_required
+def api_opinion_cache_stats():
+    """分析结果缓存统计API"""
+    return jsonify({
+        'success': True,
+        'data': dict(get_analysis_cache().stats(), version=get_analysis_version())
+    }), 200
+
+@app.route('/api/opinion/tokenizer/stats')
+@login_required
+def api_tokenizer_stats():
+    """分词进程池运行指标API"""
+    return jsonify(get_tokenizer_pool().stats()), 200
+
+@app.route('/api/opinion/corpus/stats')
+@login_required
+def api_corpus_stats():
+    """报告语料词频索引概况API"""
+    return jsonify(dict(get_corpus_index().stats(), idf_active=get_corpus_idf_path() is not None)), 200
+
+def reanalyze_reports(batch_size=None):
+    """
+    用 DataFrame 批量分析重新计算全部历史报告的关键词和情感倾向
+
+    按编号分批读取报告（读完一批再写回，避免读游标与写事务同时占用 SQLite），
+    每批整列分析后批量更新。
+
+    Returns:
+        dict: 更新的报告数、耗时和每秒处理行数
+    """
+    from bulk_analysis import analyze_frame
+    from migrations import backfill_report_keywords
+    from trend_rollups import dump_keywords
+    
+    batch_size = batch_size or app.config['OPINION_REANALYZE_BATCH_SIZE']
+    started = time.perf_counter()
+    updated = 0
+    last_id = 0
+    while True:
+        query = (db.select(PublicOpinionReport.id, PublicOpinionReport.content)
+                 .where(PublicOpinionReport.id > last_id)
+                 .order_by(PublicOpinionReport.id)
+                 .limit(batch_size))
+        with db.engine.connect() as conn:
+            frame = pd.read_sql(query, conn, index_col='id')
+        if frame.empty:
+            break
+        result = analyze_frame(frame, top_k=10, scorer=get_sentiment_scorer(), chunk_size=batch_size,
+                               pool=get_tokenizer_pool(), idf_path=get_corpus_idf_path())
+        db.session.execute(
+            db.update(PublicOpinionReport),
+            [{'id': int(report_id), 'keywords': dump_keywords(keywords), 'sentiment': sentiment}
+             for report_id, keywords, sentiment in zip(result.index, result['keywords'], result['sentiment'])]
+        )
+        db.session.commit()
+        updated += len(frame)
+        last_id = int(frame.index[-1])
+    
+    # 批量更新不触发 ORM 事件，重新生成趋势汇总和报告关键词表
+    rebuild_rollups()
+    with db.engine.begin() as conn:
+        backfill_report_keywords(conn, batch_size)
+    elapsed = time.perf_counter() - started
+    return {
+        'updated': updated,
+        'elapsed': round(elapsed, 3),
+        'rows_per_sec': round(updated / elapsed, 1) if elapsed else 0.0
+    }
+
+@app.route('/api/opinion/reports/reanalyze', methods=['POST'])
+@login_required
+def api_reanalyze_reports():
+    """重新分析全部历史报告API（管理员）"""
+    if not current_user.is_admin():
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    result = reanalyze_reports()
+    return jsonify({
+        'success': True,
+        'data': result,
+        'message': f"已重新分析 {result['updated']} 篇报告"
+    }), 200
+
+def search_reports(query, page=1, per_page=None, sentiment=None):
+    """
+    全文检索报告，结果附带报告的情感倾向、来源和日期
+
+    Returns:
+        dict: total、page、per_page 以及按相关度排序的 items
+    """
+    from report_search import search
+    
+    per_page = max(1, min(per_page or app.config['SEARCH_PAGE_SIZE'], app.config['SEARCH_MAX_PAGE_SIZE']))
+    page = max(1, page)
+    with db.engine.connect() as conn:
+        result = search(conn, query, page, per_page, app.config['SEARCH_SNIPPET_TOKENS'], sentiment or None)
+    reports = {report.id: report for report in
+               PublicOpinionReport.query.filter(PublicOpinionReport.id.in_([item['id'] for item in result['items']]))}
+    items = []
+    for item in result['items']:
+        report = reports.get(item['id'])
+        if report is None:
+            continue
+        item.update({
+            'sentiment': report.sentiment,
+            'source': report.source,
+            'report_date': report.report_date.strftime('%Y-%m-%d'),
+            'created_at': report.created_at.strftime('%Y-%m-%d %H:%M:%S') if report.created_at else ''
+        })
+        items.append(item)
+    return {'total': result['total'], 'page': page, 'per_page': per_page, 'items': items}
+
+@app.route('/api/opinion/search')
+@login_required
+def api_search_reports():
+    """报告全文检索API（q 为查询词，支持 sentiment 筛选和 page、per_page 分页）"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'message': '查询词不能为空'}), 400
+    result = search_reports(query, request.args.get('page', 1, type=int), request.args.get('per_page', type=int),
+                            request.args.get('sentiment'))
+    return jsonify({'success': True, 'data': result}), 200
+
+@app.route('/api/opinion/search/rebuild', methods=['POST'])
+@login_required
+def api_rebuild_search_index():
+    """重建报告全文索引API（管理员）"""
+    if not current_user.is_admin():
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    count = rebuild_search_index()
+    return jsonify({'success': True, 'message': f'已重建 {count} 篇报告的全文索引'}), 200
+
+def parse_trend_window(default_days):
+    """
+    解析趋势查询的时间范围参数 days（天数）和 end（截止日期，默认今天）
+
+    Returns:
+        tuple: (开始日期, 截止日期, 天数)
+    """
+    from datetime import timedelta
+    
+    days = max(1, min(request.args.get('days', default_days, type=int), 366))
+    end = request.args.get('end')
+    end = datetime.strptime(end, '%Y-%m-%d').date() if end else datetime.now().date()
+    return end - timedelta(days=days - 1), end, days
+
+@app.route('/api/opinion/trends/sentiment')
+@login_required
+def api_sentiment_trend():
+    """按日/周、来源统计的情感趋势API（读取按日汇总表）"""
+    from trend_rollups import bucket_sentiment
+    
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in ('day', 'week'):
+        return jsonify({'success': False, 'message': 'granularity 只能为 day 或 week'}), 400
+    try:
+        start, end, _ = parse_trend_window(30)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'end 格式应为 YYYY-MM-DD'}), 400
+    
+    query = SentimentDaily.query.filter(SentimentDaily.day >= start, SentimentDaily.day <= end)
+    source = request.args.get('source')
+    if source:
+        query = query.filter(SentimentDaily.source == source)
+    by_source = request.args.get('by_source', '1') != '0'
+    
+    return jsonify({
+        'success': True,
+        'data': bucket_sentiment(query.all(), granularity, by_source),
+        'start': start.strftime('%Y-%m-%d'),
+        'end': end.strftime('%Y-%m-%d')
+    }), 200
+
+@app.route('/api/opinion/trends/keywords')
+@login_required
+def api_keyword_trend():
+    """上升关键词API：比较最近 days 天与之前相同天数内包含各关键词的报告数"""
+    from datetime import timedelta
+    from trend_rollups import rising_keywords
+    
+    try:
+        start, end, days = parse_trend_window(7)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'end 格式应为 YYYY-MM-DD'}), 400
+    source = request.args.get('source')
+    
+    def totals(first_day, last_day):
+        query = (db.session.query(KeywordDaily.keyword, db.func.sum(KeywordDaily.report_count))
+                 .filter(KeywordDaily.day >= first_day, KeywordDaily.day <= last_day))
+        if source:
+            query = query.filter(KeywordDaily.source == source)
+        return dict(query.group_by(KeywordDaily.keyword).all())
+    
+    recent = totals(start, end)
+    previous = totals(start - timedelta(days=days), start - timedelta(days=1))
+    rising = rising_keywords(recent, previous,
+                             limit=min(request.args.get('limit', 20, type=int), 100),
+                             min_count=request.args.get('min_count', 2, type=int))
+    return jsonify({
+        'success': True,
+        'data': rising,
+        'start': start.strftime('%Y-%m-%d'),
+        'end': end.strftime('%Y-%m-%d')
+    }), 200
+
+@app.route('/api/opinion/trends/rebuild', methods=['POST'])
+@login_required
+def api_rebuild_trends():
+    """重新生成趋势汇总API（管理员）"""
+    if not current_user.is_admin():
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    count = rebuild_rollups()
+    return jsonify({
+        'success': True,
+        'data': {'reports': count},
+        'message': f'已由 {count} 篇报告重新生成趋势汇总'
+    }), 200
+
+@app.route('/api/opinion/keywords/top')
+@login_required
+def api_top_keywords():
+    """热门关键词API：最近 days 天（按报告日期）内包含各关键词的报告数和权重之和（查询关键词表）"""
+    try:
+        start, end, days = parse_trend_window(7)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'end 格式应为 YYYY-MM-DD'}), 400
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    report_count = db.func.count(ReportKeyword.report_id)
+    query = (db.session.query(ReportKeyword.keyword, report_count, db.func.sum(ReportKeyword.weight))
+             .join(PublicOpinionReport, PublicOpinionReport.id == ReportKeyword.report_id)
+             .filter(PublicOpinionReport.report_date >= start, PublicOpinionReport.report_date <= end))
+    source = request.args.get('source')
+    if source:
+        query = query.filter(PublicOpinionReport.source == source)
+    rows = query.group_by(ReportKeyword.keyword).order_by(report_count.desc(), ReportKeyword.keyword).limit(limit)
+    return jsonify({
+        'success': True,
+        'data': [{'keyword': keyword, 'report_count': count, 'weight': round(weight or 0.0, 4)}
+                 for keyword, count, weight in rows],
+        'start': start.strftime('%Y-%m-%d'),
+        'end': end.strftime('%Y-%m-%d')
+    }), 200
+
+# 汇总报告任务线程池（每个进程共享一个实例）
+_report_executor = None
+_report_executor_lock = threading.Lock()
+
+def get_report_executor():
+    """获取汇总报告任务线程池，首次创建时恢复上次未完成的任务（需在应用上下文中调用）"""
+    global _report_executor
+    with _report_executor_lock:
+        created = _report_executor is None
+        if created:
+            from concurrent.futures import ThreadPoolExecutor
+            _report_executor = ThreadPoolExecutor(max_workers=app.config['REPORT_JOB_WORKERS'],
+                                                  thread_name_prefix='report-job')
+    if created:
+        resume_report_jobs()
+    return _report_executor
+
+def resume_report_jobs():
+    """重新提交等待中的任务，以及长时间没有进度（进程退出时中断）的执行中任务"""
+    from datetime import timedelta
+    
+    stale_before = datetime.utcnow() - timedelta(seconds=app.config['REPORT_JOB_STALE_SECONDS'])
+    ReportJob.query.filter(ReportJob.status == 'running', ReportJob.updated_at < stale_before) \
+        .update({'status': 'pending'}, synchronize_session=False)
+    db.session.commit()
+    for (job_id,) in db.session.query(ReportJob.id).filter(ReportJob.status == 'pending').all():
+        _report_executor.submit(run_report_job, job_id)
+
+def report_job_articles(job):
+    """任务范围内的文章筛选条件：抓取关键词或标题匹配，抓取时间在日期范围内"""
+    from datetime import timedelta
+    
+    return (
+        db.or_(CrawledArticle.keyword == job.keyword, CrawledArticle.title.contains(job.keyword)),
+        CrawledArticle.crawled_at >= datetime.combine(job.start_date, datetime.min.time()),
+        CrawledArticle.crawled_at < datetime.combine(job.end_date + timedelta(days=1), datetime.min.time())
+    )
+
+def run_report_job(job_id):
+    """
+    执行汇总报告任务（在后台线程中运行）
+
+    按文章编号分批读取范围内的文章，每批分析后更新进度；全部完成后保存舆情报告。
+    """
+    import json
+    from report_jobs import ReportBuilder
+    
+    with app.app_context():
+        # 只有把任务从 pending 改为 running 的线程执行该任务
+        claimed = db.session.execute(
+            db.update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == 'pending')
+            .values(status='running', processed=0, started_at=datetime.utcnow(), updated_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return
+        
+        job = db.session.get(ReportJob, job_id)
+        try:
+            filters = report_job_articles(job)
+            job.total = CrawledArticle.query.filter(*filters).count()
+            db.session.commit()
+            if not job.total:
+                raise ValueError('日期范围内没有与关键词相关的抓取文章')
+            
+            builder = ReportBuilder(
+                job.total,
+                scorer=get_sentiment_scorer(),
+                n_clusters=app.config['REPORT_JOB_CLUSTERS'],
+                excerpts=app.config['REPORT_JOB_EXCERPTS'],
+                pool=get_tokenizer_pool(),
+                idf_path=get_corpus_idf_path()
+            )
+            columns = (CrawledArticle.id, CrawledArticle.title, CrawledArticle.summary,
+                       CrawledArticle.source, CrawledArticle.url)
+            last_id = 0
+            while True:
+                query = (db.select(*columns)
+                         .where(*filters, CrawledArticle.id > last_id)
+                         .order_by(CrawledArticle.id)
+                         .limit(app.config['REPORT_JOB_BATCH_SIZE']))
+                with db.engine.connect() as conn:
+                    frame = pd.read_sql(query, conn, index_col='id')
+                if frame.empty:
+                    break
+                builder.add_batch(frame)
+                last_id = int(frame.index[-1])
+                job.processed = builder.processed
+                db.session.commit()
+            
+            description = (f"关键词“{job.keyword}”在 {job.start_date.strftime('%Y-%m-%d')} 至 "
+                           f"{job.end_date.strftime('%Y-%m-%d')} 期间")
+            result = builder.build(job.title, description)
+            from trend_rollups import dump_keywords
+            report = PublicOpinionReport(
+                title=result['title'],
+                content=result['content'],
+                keywords=dump_keywords(result['keywords']),
+                sentiment=result['sentiment'],
+                source='汇总报告',
+                report_date=datetime.now().date(),
+                created_by=job.created_by
+            )
+            db.session.add(report)
+            db.session.flush()
+            job.report_id = report.id
+            job.stats = json.dumps(result['stats'], ensure_ascii=False)
+            job.status = 'done'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"汇总报告任务 {job_id} 失败: {e}")
+            job = db.session.get(ReportJob, job_id)
+            job.status = 'failed'
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            return
+    schedule_topic_refresh()
+
+@app.route('/api/opinion/report_jobs', methods=['POST'])
+@login_required
+def api_create_report_job():
+    """创建汇总报告任务API：按关键词和日期范围汇总抓取文章，后台生成舆情报告"""
+    from datetime import timedelta
+    
+    data = request.get_json() or {}
+    keyword = (data.get('keyword') or '').strip()
+    if not keyword:
+        return jsonify({'success': False, 'message': '关键词不能为空'}), 400
+    try:
+        end_date = (datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+                    if data.get('end_date') else datetime.now().date())
+        start_date = (datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+                      if data.get('start_date') else end_date - timedelta(days=6))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': '日期格式应为 YYYY-MM-DD'}), 400
+    if start_date > end_date:
+        return jsonify({'success': False, 'message': '开始日期不能晚于结束日期'}), 400
+    
+    job = ReportJob(
+        keyword=keyword,
+        start_date=start_date,
+        end_date=end_date,
+        title=data.get('title') or f'“{keyword}”舆情汇总报告（{start_date:%Y-%m-%d} 至 {end_date:%Y-%m-%d}）',
+        created_by=current_user.id
+    )
+    db.session.add(job)
+    db.session.commit()
+    get_report_executor().submit(run_report_job, job.id)
+    
+    return jsonify({
+        'success': True,
+        'data': job.to_dict(),
+        'message': '汇总报告任务已创建'
+    }), 202
+
+@app.route('/api/opinion/report_jobs')
+@login_required
+def api_report_jobs():
+    """汇总报告任务列表API（普通用户只能查看自己创建的任务）"""
+    query = ReportJob.query
+    if not current_user.is_admin():
+        query = query.filter(ReportJob.created_by == current_user.id)
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    jobs = query.order_by(ReportJob.id.desc()).limit(limit).all()
+    return jsonify({
+        'success': True,
+        'data': [job.to_dict() for job in jobs]
+    }), 200
+
+@app.route('/api/opinion/report_jobs/<int:job_id>')
+@login_required
+def api_report_job(job_id):
+    """汇总报告任务进度API"""
+    job = ReportJob.query.get_or_404(job_id)
+    if job.created_by != current_user.id and not current_user.is_admin():
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    }), 200
+
+# 话题模型（每个进程共享一个实例）
+_topic_model = None
+_topic_lock = threading.Lock()
+_topic_refresh_state = {'running': False, 'again': False}
+_topic_state_lock = threading.Lock()
+
+def get_topic_model():
+    """获取话题模型"""
+    global _topic_model
+    if _topic_model is None:
+        from topic_clustering import TopicModel
+        _topic_model = TopicModel.load(app.config['TOPIC_MODEL_FILE'],
+                                       n_clusters=app.config['TOPIC_CLUSTERS'])
+    return _topic_model
+
+def refresh_topics():
+    """
+    增量更新话题聚类
+
+    只处理上次更新之后新增的报告和抓取文章，按批次更新聚类中心并保存文档所属话题，
+    最后刷新话题表。
+
+    Returns:
+        int: 本次处理的文档数
+    """
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    import json
+    
+    with _topic_lock, app.app_context():
+        model = get_topic_model()
+        batch_size = app.config['TOPIC_BATCH_SIZE']
+        sources = (
+            ('report', PublicOpinionReport, lambda row: f'{row.title} {row.content or ""}'),
+            ('article', CrawledArticle, lambda row: f'{row.title} {row.summary or ""}'),
+        )
+        processed = 0
+        for item_type, model_class, text_of in sources:
+            while True:
+                rows = (model_class.query
+                        .filter(model_class.id > model.cursors.get(item_type, 0))
+                        .order_by(model_class.id)
+                        .limit(batch_size)
+                        .all())
+                if not rows:
+                    break
+                assignments = model.partial_fit([((item_type, row.id), text_of(row)) for row in rows])
+                model.cursors[item_type] = rows[-1].id
+                processed += len(rows)
+                if assignments:
+                    now = datetime.utcnow()
+                    stmt = sqlite_insert(TopicAssignment.__table__)
+                    db.session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=['item_type', 'item_id'],
+                            set_={'cluster_id': stmt.excluded.cluster_id, 'assigned_at': stmt.excluded.assigned_at}
+                        ),
+                        [{'item_type': key[0], 'item_id': key[1], 'cluster_id': label, 'assigned_at': now}
+                         for key, label in assignments]
+                    )
+        
+        if processed:
+            TopicCluster.query.delete()
+            db.session.add_all(TopicCluster(id=topic['cluster_id'],
+                                            keywords=json.dumps(topic['keywords'], ensure_ascii=False),
+                                            size=topic['size'], heat=topic['heat'])
+                               for topic in model.topics())
+            db.session.commit()
+            model.save(app.config['TOPIC_MODEL_FILE'])
+        return processed
+
+def schedule_topic_refresh():
+    """在后台线程中增量更新话题，已有更新在运行时合并为其结束后的一次更新"""
+    with _topic_state_lock:
+        if _topic_refresh_state['running']:
+            _topic_refresh_state['again'] = True
+            return
+        _topic_refresh_state['running'] = True
+    
+    def run():
+        while True:
+            try:
+                refresh_topics()
+            except Exception as e:
+                print(f"更新话题聚类时发生错误: {e}")
+            with _topic_state_lock:
+                if not _topic_refresh_state['again']:
+                    _topic_refresh_state['running'] = False
+                    return
+                _topic_refresh_state['again'] = False
+    
+    threading.Thread(target=run, name='topic-refresh', daemon=True).start()
+
+@app.route('/api/topics')
+@login_required
+def api_topics():
+    """当前话题列表API"""
+    limit = min(request.args.get('limit', 10, type=int), app.config['TOPIC_CLUSTERS'])
+    topics = (TopicCluster.query.filter(TopicCluster.size > 0)
+              .order_by(TopicCluster.heat.desc()).limit(limit).all())
+    return jsonify({
+        'success': True,
+        'data': [topic.to_dict() for topic in topics]
+    }), 200
+
+@app.route('/api/topics/refresh', methods=['POST'])
+@login_required
+def api_topics_refresh():
+    """立即增量更新话题API（管理员）"""
+    if not current_user.is_admin():
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    processed = refresh_topics()
+    return jsonify({
+        'success': True,
+        'data': {'processed': processed},
+        'message': f'已处理 {processed} 篇新文档'
+    }), 200
+
 @app.route('/api/opinion/report/<int:report_id>')
 @login_required
 def api_get_report_detail(report_id):
     """获取报告详情API"""
-    report = PublicOpinionReport.query.get_or_404(report_id)
+    report = db.get_or_404(PublicOpinionReport, report_id, options=[db.joinedload(PublicOpinionReport.creator)])
     
     # 检查权限（只能查看自己创建的报告或管理员可以查看所有报告）
     if report.created_by != current_user.id and not current_user.is_admin():
@@ -342,11 +1617,14 @@ def api_get_report_detail(report_id):
         'id': report.id,
         'title': report.title,
         'content': report.content,
-        'keywords': report.keywords if report.keywords else "[]",
+        'keywords': [{'keyword': keyword, 'weight': weight} for keyword, weight in
+                     db.session.query(ReportKeyword.keyword, ReportKeyword.weight)
+                     .filter(ReportKeyword.report_id == report.id)
+                     .order_by(ReportKeyword.weight.desc())],
         'sentiment': report.sentiment,
         'source': report.source,
         'created_at': report.created_at.strftime('%Y-%m-%d %H:%M'),
-        'created_by': report.creator.username
+        'created_by': report.creator.username if report.creator else ''
     }), 200
 
 # API 路由
@@ -407,8 +1685,14 @@ def api_update_settings():
 def create_tables():
     """创建数据库表"""
     with app.app_context():
+        import query_stats
+        query_stats.track(db.engine)
         db.create_all()
         
+        # 为已有数据库补充 create_all 不会修改的结构（索引等）
+        from migrations import migrate
+        migrate(db.engine)
+        
         # 添加默认管理员用户
         if User.query.count() == 0:
             admin_user = User(username='admin', email='admin@zhengqi.com', role='admin')
@@ -426,6 +1710,20 @@ def create_tables():
             
             db.session.commit()
             print("数据库初始化完成，默认用户和设置已添加")
+        
+        # 汇总表为新建时，由已有报告生成
+        if SentimentDaily.query.first() is None and PublicOpinionReport.query.first() is not None:
+            count = rebuild_rollups()
+            print(f"趋势汇总已由 {count} 篇报告生成")
+        
+        # 全文索引为新建或与报告表不一致时重新生成
+        from report_search import FTS_TABLE, create_index
+        with db.engine.begin() as conn:
+            create_index(conn)
+            indexed = conn.execute(db.text(f'SELECT count(*) FROM {FTS_TABLE}')).scalar()
+        if indexed != PublicOpinionReport.query.count():
+            count = rebuild_search_index()
+            print(f"全文索引已由 {count} 篇报告生成")
 
 # 数据抓取模块路由
 @app.route('/crawler')
@@ -449,24 +1747,51 @@ def api_crawler_search():
         
         keyword = data['keyword']
         max_results = data.get('max_results', 10)
+        incremental = bool(data.get('incremental')) or data.get('since') is not None
+        dedup = bool(data.get('dedup', app.config['CRAWLER_DEDUP']))
         
-        # 导入数据抓取模块
-        from data_crawler import NewsCrawler
+        from crawl_engine import CrawlEngine
+        
+        # 定时抓取的关键词优先读取已入库的结果
+        if not incremental:
+            stored = get_recent_articles(keyword, max_results)
+            if stored:
+                return jsonify({
+                    'success': True,
+                    'data': stored,
+                    'precomputed': True,
+                    'message': f'成功获取 {len(stored)} 条新闻数据'
+                }), 200
         
-        # 创建抓取器实例
-        crawler = NewsCrawler()
+        # 搜索新闻（基本搜索没有结果时尝试高级搜索），结果经缓存复用
+        results = get_crawl_cache().get_or_fetch(
+            keyword, max_results,
+            lambda: CrawlEngine.crawl_keyword(create_news_crawler(), keyword, max_results)
+        )
         
-        # 搜索新闻
-        results = crawler.search_news(keyword, max_results)
+        # 合并转载等近似重复的新闻；增量模式下同时与此前抓取过的文章比较
+        if dedup:
+            results = get_near_dup_detector().collapse(results, use_index=incremental)
+        
+        if not incremental:
+            return jsonify({
+                'success': True,
+                'data': results,
+                'message': f'成功获取 {len(results)} 条新闻数据'
+            }), 200
         
-        # 如果基本搜索没有结果，尝试高级搜索
-        if not results:
-            results = crawler.advanced_search(keyword, max_results)
+        # 增量模式：只返回首次出现的文章，since 游标用于读取上次之后新增的全部文章
+        seen_store = get_seen_store()
+        new_items = seen_store.record(keyword, results)
+        if data.get('since') is not None:
+            new_items = seen_store.items_since(int(data['since']), keyword=keyword,
+                                               limit=max(int(max_results), 100))
         
         return jsonify({
             'success': True,
-            'data': results,
-            'message': f'成功获取 {len(results)} 条新闻数据'
+            'data': new_items,
+            'cursor': seen_store.latest_cursor(keyword),
+            'message': f'成功获取 {len(new_items)} 条新增新闻数据'
         }), 200
         
     except Exception as e:
@@ -480,16 +1805,313 @@ def api_crawler_search():
             'data': []
         }), 500
 
+# 共享连接池是否已按应用配置初始化
+_crawler_pool_configured = False
+
+def create_news_crawler():
+    """创建使用进程内共享连接池的抓取器"""
+    global _crawler_pool_configured
+    from data_crawler import NewsCrawler, configure_shared_session
+    from http_cache import ResponseCache
+    
+    if not _crawler_pool_configured:
+        configure_shared_session(
+            pool_connections=app.config['CRAWLER_POOL_CONNECTIONS'],
+            pool_maxsize=app.config['CRAWLER_POOL_MAXSIZE'],
+            max_retries=app.config['CRAWLER_MAX_RETRIES'],
+            backoff_factor=app.config['CRAWLER_RETRY_BACKOFF']
+        )
+        _crawler_pool_configured = True
+    
+    cache_dir = app.config['CRAWLER_RESPONSE_CACHE_DIR']
+    return NewsCrawler(
+        parser_backend=app.config['CRAWLER_PARSER_BACKEND'],
+        response_cache=ResponseCache(cache_dir) if cache_dir else None,
+        enable_real_search=app.config['CRAWLER_REAL_SEARCH'],
+        timeout=app.config['CRAWLER_REQUEST_TIMEOUT'],
+        rate_limiter=get_rate_limiter()
+    )
+
+# 数据源限流器（每个进程共享一个实例）
+_rate_limiter = None
+
+def get_rate_limiter():
+    """获取按主机的数据源限流器"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        from rate_limiter import HostRateLimiter
+        _rate_limiter = HostRateLimiter(
+            rate=app.config['CRAWLER_RATE_LIMIT'],
+            capacity=app.config['CRAWLER_RATE_BURST'],
+            min_rate=app.config['CRAWLER_RATE_MIN'],
+            failure_threshold=app.config['CRAWLER_BREAKER_THRESHOLD'],
+            cooldown=app.config['CRAWLER_BREAKER_COOLDOWN'],
+            min_body_size=app.config['CRAWLER_MIN_BODY_SIZE']
+        )
+    return _rate_limiter
+
+# 抓取结果缓存（每个进程共享一个实例）
+_crawl_cache = None
+
+def get_crawl_cache():
+    """获取抓取结果缓存"""
+    global _crawl_cache
+    if _crawl_cache is None:
+        from crawl_cache import CrawlResultCache
+        _crawl_cache = CrawlResultCache(
+            max_size=app.config['CRAWLER_CACHE_SIZE'],
+            ttl=app.config['CRAWLER_CACHE_TTL'],
+            db_path=app.config['CRAWLER_CACHE_DB']
+        )
+    return _crawl_cache
+
+# 已抓取文章记录（每个进程共享一个实例）
+_seen_store = None
+
+def get_seen_store():
+    """获取已抓取文章记录"""
+    global _seen_store
+    if _seen_store is None:
+        from seen_store import SeenUrlStore
+        os.makedirs(os.path.dirname(app.config['CRAWLER_SEEN_DB']), exist_ok=True)
+        _seen_store = SeenUrlStore(app.config['CRAWLER_SEEN_DB'])
+    return _seen_store
+
+# 近似重复检测器（每个进程共享一个实例，指纹索引保存在内存中）
+_near_dup_detector = None
+
+def get_near_dup_detector():
+    """获取近似重复检测器"""
+    global _near_dup_detector
+    if _near_dup_detector is None:
+        from near_dup import NearDuplicateDetector
+        _near_dup_detector = NearDuplicateDetector(
+            max_distance=app.config['CRAWLER_NEAR_DUP_DISTANCE']
+        )
+    return _near_dup_detector
+
+# 批量抓取引擎（每个进程共享一个实例）
+_crawl_engine = None
+
+def get_crawl_engine():
+    """获取批量抓取引擎"""
+    global _crawl_engine
+    if _crawl_engine is None:
+        from crawl_engine import CrawlEngine
+        _crawl_engine = CrawlEngine(
+            crawler_factory=create_news_crawler,
+            max_workers=app.config['CRAWLER_MAX_WORKERS'],
+            per_host_limit=app.config['CRAWLER_PER_HOST_LIMIT'],
+            result_cache=get_crawl_cache()
+        )
+    return _crawl_engine
+
+def get_recent_articles(keyword, max_results):
+    """
+    读取定时抓取入库的文章
+
+    只对定时抓取的关键词生效，且最近一次入库需在两个抓取间隔内，否则视为没有可用数据。
+
+    Returns:
+        list: 新闻数据列表，没有可用数据时返回空列表
+    """
+    if keyword not in app.config['CRAWLER_SCHEDULE_KEYWORDS']:
+        return []
+    from datetime import timedelta
+    fresh_after = datetime.utcnow() - timedelta(seconds=app.config['CRAWLER_SCHEDULE_INTERVAL'] * 2)
+    articles = (CrawledArticle.query
+                .filter(CrawledArticle.keyword == keyword, CrawledArticle.crawled_at >= fresh_after)
+                .order_by(CrawledArticle.id.desc())
+                .limit(int(max_results))
+                .all())
+    return [article.to_dict() for article in articles]
+
+def store_crawled_articles(keyword, items):
+    """
+    批量写入抓取文章，已入库的 URL 自动跳过
+
+    Args:
+        keyword (str): 抓取关键词
+        items (list): 新闻数据列表
+
+    Returns:
+        int: 新写入的文章数量
+    """
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    from seen_store import SeenUrlStore
+    
+    with app.app_context():
+        if app.config['CRAWLER_DEDUP']:
+            items = get_near_dup_detector().collapse(items)
+        now = datetime.utcnow()
+        rows = [{
+            'url_hash': SeenUrlStore.item_key(item),
+            'keyword': keyword,
+            'title': item.get('title', ''),
+            'summary': item.get('summary', ''),
+            'url': item.get('url', ''),
+            'source': item.get('source', ''),
+            'cover': item.get('cover', ''),
+            'duplicate_count': item.get('duplicate_count', 0),
+            'crawled_at': now
+        } for item in items if item.get('title')]
+        if not rows:
+            return 0
+        
+        result = db.session.execute(
+            sqlite_insert(CrawledArticle.__table__).on_conflict_do_nothing(index_elements=['url_hash']),
+            rows
+        )
+        db.session.commit()
+        if result.rowcount:
+            schedule_topic_refresh()
+        return result.rowcount
+
+# 定时抓取调度器（每个进程一个实例）
+_crawl_scheduler = None
+
+def get_crawl_scheduler():
+    """获取定时抓取调度器"""
+    global _crawl_scheduler
+    if _crawl_scheduler is None:
+        from crawl_engine import CrawlEngine
+        from crawl_scheduler import CrawlJobQueue, CrawlScheduler
+        from data_crawler import NewsCrawler
+        
+        os.makedirs(os.path.dirname(app.config['CRAWLER_JOB_DB']), exist_ok=True)
+        _crawl_scheduler = CrawlScheduler(
+            CrawlJobQueue(app.config['CRAWLER_JOB_DB']),
+            crawl_func=lambda keyword, max_results: CrawlEngine.crawl_keyword(
+                create_news_crawler(), keyword, max_results),
+            store_func=store_crawled_articles,
+            keywords=app.config['CRAWLER_SCHEDULE_KEYWORDS'],
+            host_func=NewsCrawler().get_source_host,
+            interval=app.config['CRAWLER_SCHEDULE_INTERVAL'],
+            jitter=app.config['CRAWLER_SCHEDULE_JITTER'],
+            workers=app.config['CRAWLER_SCHEDULE_WORKERS'],
+            politeness_delay=app.config['CRAWLER_POLITENESS_DELAY'],
+            max_results=app.config['CRAWLER_SCHEDULE_MAX_RESULTS']
+        )
+    return _crawl_scheduler
+
+@app.route('/api/crawler/articles')
+@login_required
+def api_crawler_articles():
+    """定时抓取文章列表API"""
+    keyword = request.args.get('keyword')
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    
+    query = CrawledArticle.query
+    if keyword:
+        query = query.filter(CrawledArticle.keyword == keyword)
+    articles = query.order_by(CrawledArticle.id.desc()).limit(limit).all()
+    
+    return jsonify({
+        'success': True,
+        'data': [article.to_dict() for article in articles],
+        'message': f'成功获取 {len(articles)} 条新闻数据'
+    }), 200
+
+@app.route('/api/crawler/scheduler')
+@login_required
+def api_crawler_scheduler_status():
+    """定时抓取状态API"""
+    scheduler = get_crawl_scheduler()
+    return jsonify({
+        'success': True,
+        'data': dict(scheduler.status(), recent_jobs=scheduler.queue.recent(10))
+    }), 200
+
+@app.route('/api/crawler/scheduler/run', methods=['POST'])
+@login_required
+def api_crawler_scheduler_run():
+    """立即执行定时抓取API（管理员）"""
+    if not current_user.is_admin():
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    scheduler = get_crawl_scheduler()
+    keywords = data.get('keywords') or scheduler.keywords
+    job_ids = [scheduler.queue.enqueue(keyword, scheduler.max_results) for keyword in keywords]
+    
+    return jsonify({
+        'success': True,
+        'data': {'job_ids': job_ids, 'running': scheduler.is_running()},
+        'message': f'已添加 {len(job_ids)} 个抓取任务'
+    }), 200
+
+@app.route('/api/crawler/batch_search', methods=['POST'])
+@login_required
+def api_crawler_batch_search():
+    """批量关键词抓取API"""
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get('keywords'), list) or not data['keywords']:
+        return jsonify({
+            'success': False,
+            'message': '关键词列表不能为空'
+        }), 400
+    
+    keywords = [str(k).strip() for k in data['keywords'] if str(k).strip()]
+    if len(keywords) > app.config['CRAWLER_BATCH_MAX_KEYWORDS']:
+        return jsonify({
+            'success': False,
+            'message': f"单次最多抓取 {app.config['CRAWLER_BATCH_MAX_KEYWORDS']} 个关键词"
+        }), 400
+    
+    max_results = data.get('max_results', 10)
+    timeout = min(float(data.get('timeout', app.config['CRAWLER_BATCH_TIMEOUT'])),
+                  app.config['CRAWLER_BATCH_TIMEOUT'])
+    
+    try:
+        batch = get_crawl_engine().batch_search(keywords, max_results, timeout=timeout)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'批量抓取失败: {str(e)}',
+            'data': {}
+        }), 500
+    
+    total = sum(len(items) for items in batch['results'].values())
+    message = f"完成 {len(batch['results'])}/{len(keywords)} 个关键词，共获取 {total} 条新闻数据"
+    if batch['timed_out']:
+        message += f"，{len(batch['timed_out'])} 个关键词超时"
+    
+    return jsonify({
+        'success': True,
+        'data': batch['results'],
+        'errors': batch['errors'],
+        'timed_out': batch['timed_out'],
+        'complete': batch['complete'],
+        'elapsed': batch['elapsed'],
+        'message': message
+    }), 200
+
+@app.route('/api/crawler/cache/stats')
+@login_required
+def api_crawler_cache_stats():
+    """抓取结果缓存统计API"""
+    return jsonify({
+        'success': True,
+        'data': get_crawl_cache().stats()
+    }), 200
+
+@app.route('/api/crawler/sources')
+@login_required
+def api_crawler_sources():
+    """数据源限流与熔断状态API"""
+    return jsonify({
+        'success': True,
+        'data': get_rate_limiter().status()
+    }), 200
+
 @app.route('/api/crawler/test')
 @login_required
 def api_crawler_test():
     """数据抓取测试API"""
     try:
-        # 导入数据抓取模块
-        from data_crawler import NewsCrawler
-        
-        # 创建抓取器实例
-        crawler = NewsCrawler()
+        # 创建抓取器实例（复用进程内共享连接池）
+        crawler = create_news_crawler()
         
         # 测试搜索
         results = crawler.search_news('测试', 3)
@@ -506,12 +2128,37 @@ def api_crawler_test():
             'message': f'测试失败: {str(e)}'
         }), 500
 
+def warm_up_nlp(start_workers=True):
+    """
+    启动阶段预热分词资源
+
+    加载 jieba 词典缓存、IDF 表和情感词典后冻结堆内存，再 fork 分词工作进程，
+    工作进程以写时复制的方式共享这些数据，首个请求不再承担加载耗时。
+    """
+    from nlp_warmup import freeze_heap, warm_up
+    
+    timings = warm_up(app.config['JIEBA_CACHE_FILE'], scorer_factory=get_sentiment_scorer)
+    with app.app_context():
+        get_corpus_index()
+    if start_workers and app.config['TOKENIZER_START_METHOD'] == 'fork':
+        freeze_heap()
+        get_tokenizer_pool().start()
+    print(f"分词资源预热完成: {timings}")
+
 # 在应用启动时初始化数据库
 create_tables()
 
+# 预热分词资源（调试模式下重载器的监控进程不处理请求，不启动工作进程）
+if app.config['NLP_WARMUP']:
+    warm_up_nlp(start_workers=not (__name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'))
+
 if __name__ == '__main__':
     # 创建数据库目录
     os.makedirs('data', exist_ok=True)
     
+    # 启动定时抓取（调试模式下只在重载器的子进程中启动）
+    if app.config['CRAWLER_SCHEDULE_ENABLED'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_crawl_scheduler().start()
+    
     # 运行应用
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
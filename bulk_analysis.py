@@ -0,0 +1,218 @@
+"""
+批量舆情分析（DataFrame） - 按列对大量文本执行关键词提取和情感打分，分块处理以限制内存占用
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from sentiment_scorer import CLAUSE_RE, DEGREE, NEGATION, SENTIMENT, SentimentScorer
+from tokenizer_pool import extract_tags_batch
+
+# 拼接文本时使用的分隔符（属于分句符，修饰词不会跨文档生效）
+SEPARATOR = '\n'
+
+KIND_CODES = {SENTIMENT: 0, NEGATION: 1, DEGREE: 2}
+
+
+def trie_pattern(words):
+    """
+    把词表编译为前缀树形式的正则表达式（整体为一个捕获组）
+
+    各分支按首字符区分，结尾词语之后的后续部分为贪婪可选，因此在每个位置匹配到的
+    都是最长的词语；finditer 从左到右跳过已匹配部分，结果与 SentimentScorer 取
+    最长且互不重叠匹配的规则一致，扫描在正则引擎中完成。
+    """
+    trie = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return re.compile(f'({build(trie)})')
+
+
+@lru_cache(maxsize=8)
+def lexicon_arrays(scorer):
+    """
+    打分器词典的数组形式（每个打分器只构建一次）
+
+    Returns:
+        tuple: (正则表达式, 词语 -> 编号, 各编号的类型代码数组, 各编号的权重数组)
+    """
+    patterns = scorer.automaton.patterns
+    words = list(patterns)
+    kinds = np.array([KIND_CODES[patterns[word][0]] for word in words], dtype=np.int8)
+    values = np.array([patterns[word][1] for word in words], dtype=np.float64)
+    return trie_pattern(words), {word: i for i, word in enumerate(words)}, kinds, values
+
+
+def match_table(scorer, texts):
+    """
+    在拼接后的文本上一次扫描全部词典匹配（最长且互不重叠）
+
+    Args:
+        scorer (SentimentScorer): 情感打分器
+        texts (list): 文本列表
+
+    Returns:
+        tuple: (匹配表 DataFrame，包含 start、end、word、doc 列, 拼接后的文本)
+    """
+    regex = lexicon_arrays(scorer)[0]
+    joined = SEPARATOR.join(texts)
+    lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+    doc_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    # split 的结果交替为 未匹配片段、匹配词语，由片段长度的累加和得到各匹配的位置
+    pieces = regex.split(joined)
+    offsets = np.cumsum(np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces)))
+    words = pieces[1::2]
+    ends = offsets[1::2]
+    matches = pd.DataFrame({
+        'start': ends - np.fromiter(map(len, words), dtype=np.int64, count=len(words)),
+        'end': ends,
+        'word': words
+    })
+    matches['doc'] = np.searchsorted(doc_starts, matches['start'].to_numpy(dtype=np.int64), side='right') - 1
+    return matches, joined
+
+
+def score_matches(scorer, matches, joined, n_docs):
+    """
+    用数组运算完成否定词/程度副词修饰和按文档汇总
+
+    Returns:
+        DataFrame: 每篇文档一行，包含 score、positive、negative、positive_hits、negative_hits、hits
+    """
+    positive = np.zeros(n_docs)
+    negative = np.zeros(n_docs)
+    positive_hits = np.zeros(n_docs, dtype=np.int64)
+    negative_hits = np.zeros(n_docs, dtype=np.int64)
+    hits = [{} for _ in range(n_docs)]
+
+    if len(matches):
+        _, word_ids, kind_table, value_table = lexicon_arrays(scorer)
+        ids = matches['word'].map(word_ids).to_numpy()
+        kinds = kind_table[ids]
+        values = value_table[ids]
+        starts = matches['start'].to_numpy()
+        ends = matches['end'].to_numpy()
+        is_sentiment = kinds == KIND_CODES[SENTIMENT]
+
+        # 每个修饰词作用于其后的第一个情感词
+        positions = np.arange(len(matches))
+        next_sentiment = np.where(is_sentiment, positions, len(matches))
+        next_sentiment = np.minimum.accumulate(next_sentiment[::-1])[::-1]
+
+        # 同一分句：两者之间没有分句符（分句符均为单个字符，由 split 片段长度得到其位置）
+        pieces = CLAUSE_RE.split(joined)
+        lengths = np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces))
+        boundaries = np.cumsum(lengths)[:-1] + np.arange(len(pieces) - 1)
+
+        weights = values.copy()
+        modifier = ~is_sentiment & (next_sentiment < len(matches))
+        if modifier.any():
+            targets = next_sentiment[modifier]
+            mod_ends = ends[modifier]
+            target_starts = starts[targets]
+            same_clause = (np.searchsorted(boundaries, mod_ends, side='left')
+                           == np.searchsorted(boundaries, target_starts, side='left'))
+            valid = (same_clause & (target_starts - mod_ends <= scorer.window)
+                     & (values[targets] != 0))
+            np.multiply.at(weights, targets[valid], values[modifier][valid])
+
+        counted = is_sentiment & (values != 0)
+        docs = matches['doc'].to_numpy()
+        pos = counted & (weights > 0)
+        neg = counted & (weights < 0)
+        positive = np.bincount(docs[pos], weights=weights[pos], minlength=n_docs)
+        negative = np.bincount(docs[neg], weights=-weights[neg], minlength=n_docs)
+        positive_hits = np.bincount(docs[pos], minlength=n_docs)
+        negative_hits = np.bincount(docs[neg], minlength=n_docs)
+
+        # 按 (文档, 词语) 计数，只对出现过的组合循环
+        pairs, counts = np.unique(docs[counted] * len(value_table) + ids[counted], return_counts=True)
+        words = list(word_ids)
+        for pair, count in zip(pairs.tolist(), counts.tolist()):
+            hits[pair // len(value_table)][words[pair % len(value_table)]] = count
+
+    score = np.round(positive - negative, 4)
+    return pd.DataFrame({
+        'sentiment': np.where(score > 0, 'positive', np.where(score < 0, 'negative', 'neutral')),
+        'score': score,
+        'positive': np.round(positive, 4),
+        'negative': np.round(negative, 4),
+        'positive_hits': positive_hits,
+        'negative_hits': negative_hits,
+        'hits': hits
+    })
+
+
+def analyze_chunk_frame(texts, scorer, top_k=10, pool=None, idf_path=None, keywords=True):
+    """
+    分析一块文本
+
+    Returns:
+        DataFrame: 与 texts 顺序一致的分析结果
+    """
+    texts = [text if isinstance(text, str) else '' for text in texts]
+    matches, joined = match_table(scorer, texts)
+    result = score_matches(scorer, matches, joined, len(texts))
+    if keywords:
+        if pool is not None:
+            result.insert(0, 'keywords', pool.extract_tags_many(texts, top_k=top_k, idf_path=idf_path))
+        else:
+            result.insert(0, 'keywords', extract_tags_batch(texts, top_k, True, idf_path))
+    return result
+
+
+def iter_analyze_frame(frame, column='content', top_k=10, scorer=None, chunk_size=2000, pool=None,
+                       idf_path=None, keywords=True):
+    """
+    分块分析 DataFrame 的文本列
+
+    Args:
+        frame (DataFrame): 输入数据
+        column (str): 文本列名
+        top_k (int): 每篇文档提取的关键词数量
+        scorer (SentimentScorer): 情感打分器，为空时加载默认词典
+        chunk_size (int): 每块的行数
+        pool (TokenizerPool): 可选的分词进程池，用于关键词提取
+        idf_path (str): 语料 IDF 文件，为空时使用 jieba 自带的 IDF
+        keywords (bool): 是否提取关键词
+
+    Yields:
+        DataFrame: 每块的分析结果，索引与输入对应行一致
+    """
+    scorer = scorer or SentimentScorer.from_directory()
+    for offset in range(0, len(frame), chunk_size):
+        chunk = frame[column].iloc[offset:offset + chunk_size]
+        result = analyze_chunk_frame(chunk.tolist(), scorer, top_k, pool, idf_path, keywords)
+        result.index = chunk.index
+        yield result
+
+
+def analyze_frame(frame, column='content', **options):
+    """
+    分析 DataFrame 的文本列，参数同 iter_analyze_frame
+
+    Returns:
+        DataFrame: 输入数据加上 keywords、sentiment、score、positive、negative、
+                   positive_hits、negative_hits、hits 列（已有的同名列被覆盖）
+    """
+    parts = list(iter_analyze_frame(frame, column, **options))
+    if not parts:
+        return frame.copy()
+    result = pd.concat(parts)
+    return frame.assign(**{name: result[name] for name in result.columns})
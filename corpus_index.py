@@ -0,0 +1,199 @@
+"""
+语料词频索引 - 基于已入库舆情报告增量维护的文档频率/IDF 统计，供关键词提取使用
+"""
+import math
+import os
+import tempfile
+import threading
+
+import jieba
+import jieba.analyse
+import jieba.posseg
+import numpy as np
+
+
+def tokenize_terms(text, stop_words=None):
+    """
+    与 jieba 关键词提取一致的分词与过滤（去掉单字和停用词）
+
+    Returns:
+        list: 词语列表（保留重复）
+    """
+    stop_words = stop_words if stop_words is not None else jieba.analyse.default_tfidf.stop_words
+    return [w for w in jieba.cut(text or '')
+            if len(w.strip()) >= 2 and w.lower() not in stop_words]
+
+
+class CorpusIndex:
+    """增量维护的语料词频统计
+
+    词表为 词语 -> 编号 的字典，文档频率（df）和总词频（cf）保存在按编号排列的
+    numpy 数组中。新增文档只更新其包含的词语，不需要重新统计全部语料。
+    持久化为 npz：词表以单个 UTF-8 字节串保存，df/cf 为定长整数数组，加载时无需逐行解析。
+    """
+
+    def __init__(self):
+        self.vocab = {}
+        self.terms = []
+        self.df = np.zeros(1024, dtype=np.int32)
+        self.cf = np.zeros(1024, dtype=np.int64)
+        self.n_docs = 0
+        self.total_terms = 0
+        self.last_doc_id = 0
+        self.version = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def _term_ids(self, terms):
+        ids = []
+        for term in terms:
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                term_id = len(self.terms)
+                self.vocab[term] = term_id
+                self.terms.append(term)
+            ids.append(term_id)
+        if len(self.terms) > len(self.df):
+            size = max(len(self.terms), len(self.df) * 2)
+            self.df = np.concatenate([self.df, np.zeros(size - len(self.df), dtype=np.int32)])
+            self.cf = np.concatenate([self.cf, np.zeros(size - len(self.cf), dtype=np.int64)])
+        return np.array(ids, dtype=np.int64)
+
+    def add_document(self, text, doc_id=None, sign=1):
+        """
+        加入一篇文档（sign=-1 时移除）
+
+        Args:
+            text (str): 文档内容
+            doc_id (int): 文档编号，用于记录已索引到的位置
+            sign (int): 1 加入，-1 移除
+        """
+        terms = tokenize_terms(text)
+        with self._lock:
+            ids = self._term_ids(terms)
+            if len(ids):
+                unique_ids, counts = np.unique(ids, return_counts=True)
+                self.df[unique_ids] += sign
+                self.cf[unique_ids] += sign * counts
+            self.n_docs += sign
+            self.total_terms += sign * len(terms)
+            if doc_id is not None and sign > 0:
+                self.last_doc_id = max(self.last_doc_id, doc_id)
+            self.version += 1
+
+    def remove_document(self, text):
+        """移除一篇文档（报告删除或内容修改前调用）"""
+        self.add_document(text, sign=-1)
+
+    def idf(self, term):
+        """平滑 IDF：log((N + 1) / (df + 1)) + 1，未出现过的词语取最大值"""
+        term_id = self.vocab.get(term)
+        df = int(self.df[term_id]) if term_id is not None else 0
+        return math.log((self.n_docs + 1) / (df + 1)) + 1
+
+    def idf_table(self):
+        """
+        全部词语的 IDF
+
+        Returns:
+            tuple: (词语 -> IDF 的字典, 未出现词语的 IDF)
+        """
+        with self._lock:
+            n = len(self.terms)
+            values = np.log((self.n_docs + 1) / (self.df[:n].astype(np.float64) + 1)) + 1
+            table = dict(zip(self.terms, values.tolist()))
+            return table, math.log(self.n_docs + 1) + 1
+
+    def stats(self):
+        """索引概况"""
+        with self._lock:
+            n = len(self.terms)
+            top = np.argsort(-self.df[:n])[:10] if n else []
+            return {
+                'documents': self.n_docs,
+                'terms': n,
+                'total_terms': self.total_terms,
+                'last_doc_id': self.last_doc_id,
+                'top_terms': [(self.terms[i], int(self.df[i])) for i in top]
+            }
+
+    def save(self, path):
+        """写入 npz 文件（先写临时文件再替换）"""
+        with self._lock:
+            n = len(self.terms)
+            blob = np.frombuffer('\n'.join(self.terms).encode('utf-8'), dtype=np.uint8)
+            arrays = {
+                'terms': blob,
+                'df': self.df[:n].copy(),
+                'cf': self.cf[:n].copy(),
+                'meta': np.array([self.n_docs, self.total_terms, self.last_doc_id], dtype=np.int64)
+            }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """从 npz 文件加载，文件不存在时返回空索引"""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with np.load(path) as data:
+            blob = data['terms'].tobytes().decode('utf-8')
+            index.terms = blob.split('\n') if blob else []
+            index.vocab = {term: i for i, term in enumerate(index.terms)}
+            size = max(len(index.terms), 1024)
+            index.df = np.zeros(size, dtype=np.int32)
+            index.cf = np.zeros(size, dtype=np.int64)
+            index.df[:len(index.terms)] = data['df']
+            index.cf[:len(index.terms)] = data['cf']
+            index.n_docs, index.total_terms, index.last_doc_id = (int(v) for v in data['meta'])
+        return index
+
+
+class CorpusTFIDF(jieba.analyse.TFIDF):
+    """使用语料 IDF 的 jieba 关键词提取器（分词和停用词与默认提取器一致）"""
+
+    def __init__(self, idf_freq, median_idf):
+        # 不调用父类初始化，避免重新加载 jieba 自带的 IDF 文件
+        self.tokenizer = jieba.dt
+        self.postokenizer = jieba.posseg.dt
+        self.stop_words = jieba.analyse.default_tfidf.stop_words
+        self.idf_freq = idf_freq
+        self.median_idf = median_idf
+
+
+# 各进程内按文件修改时间缓存的提取器：路径 -> (mtime, 提取器)
+_extractors = {}
+_extractors_lock = threading.Lock()
+
+
+def get_corpus_extractor(path):
+    """
+    读取语料 IDF 文件对应的关键词提取器，文件更新后自动重新加载
+
+    Returns:
+        CorpusTFIDF: 提取器，文件不存在时返回 None
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _extractors_lock:
+        cached = _extractors.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    extractor = CorpusTFIDF(*CorpusIndex.load(path).idf_table())
+    with _extractors_lock:
+        _extractors[path] = (mtime, extractor)
+    return extractor
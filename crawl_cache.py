@@ -0,0 +1,298 @@
+"""
+抓取结果缓存 - 进程内 TTL + LRU 缓存，可选 SQLite 持久化层
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """线程安全的内存缓存，条目按 TTL 过期，超出容量时淘汰最久未使用的条目"""
+
+    def __init__(self, max_size=1024, ttl=300):
+        """
+        初始化缓存
+
+        Args:
+            max_size (int): 最大条目数
+            ttl (float): 默认过期时间（秒），None 表示不过期
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        读取缓存
+
+        Returns:
+            tuple: (是否命中, 缓存值)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        """写入缓存，ttl 为空时使用默认过期时间"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """删除缓存条目"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCacheTier:
+    """SQLite 持久化缓存层，缓存值以 JSON 存储，工作进程重启后仍可命中"""
+
+    def __init__(self, db_path, table='crawl_cache'):
+        """
+        初始化持久化缓存
+
+        Args:
+            db_path (str): SQLite 数据库文件路径
+            table (str): 缓存表名
+        """
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            'cache_key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        读取缓存
+
+        Returns:
+            tuple: (是否命中, 缓存值)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, expires_at FROM {self.table} WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute(f'DELETE FROM {self.table} WHERE cache_key = ?', (key,))
+                self._conn.commit()
+                return False, None
+        return True, json.loads(value)
+
+    def remaining_ttl(self, key):
+        """条目剩余有效期（秒），不存在时返回 0，不过期时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT expires_at FROM {self.table} WHERE cache_key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return 0
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0)
+
+    def set(self, key, value, ttl=None):
+        """写入缓存"""
+        expires_at = time.time() + ttl if ttl is not None else None
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (cache_key, value, expires_at) VALUES (?, ?, ?)',
+                (key, data, expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        """删除缓存条目"""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE cache_key = ?', (key,))
+            self._conn.commit()
+
+    def purge_expired(self):
+        """清理已过期的条目"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f'DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table}')
+            self._conn.commit()
+
+
+class CrawlResultCache:
+    """抓取结果缓存
+
+    以 (关键词, 最大结果数) 为键缓存搜索结果。同一个键同时只允许一个抓取在执行，
+    其余请求等待该抓取完成后直接读取缓存结果，避免热点关键词过期瞬间的并发穿透。
+    """
+
+    def __init__(self, max_size=1024, ttl=300, db_path=None):
+        """
+        初始化抓取结果缓存
+
+        Args:
+            max_size (int): 内存缓存最大条目数
+            ttl (float): 缓存有效期（秒）
+            db_path (str): 可选的 SQLite 持久化缓存路径
+        """
+        self.ttl = ttl
+        self.memory = TTLCache(max_size=max_size, ttl=ttl)
+        self.disk = SQLiteCacheTier(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(keyword, max_results):
+        """构建缓存键"""
+        return f'{keyword}\x00{max_results}'
+
+    def lookup(self, key):
+        """依次查找内存缓存和持久化缓存"""
+        found, value = self.memory.get(key)
+        if found:
+            return True, value
+        if self.disk is not None:
+            found, value = self.disk.get(key)
+            if found:
+                # 回填内存缓存，剩余有效期与持久化条目一致
+                self.memory.set(key, value, ttl=self.disk.remaining_ttl(key))
+                with self._lock:
+                    self.disk_hits += 1
+                return True, value
+        return False, None
+
+    def store(self, key, value):
+        """写入内存缓存和持久化缓存"""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl=self.ttl)
+
+    def _acquire_key_lock(self, key):
+        with self._lock:
+            entry = self._key_locks.get(key)
+            if entry is None:
+                entry = self._key_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+            return entry
+
+    def _release_key_lock(self, key, entry):
+        with self._lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._key_locks.pop(key, None)
+
+    def get_or_fetch(self, keyword, max_results, fetch):
+        """
+        读取缓存，未命中时调用 fetch() 抓取并写入缓存
+
+        Args:
+            keyword (str): 搜索关键词
+            max_results (int): 最大结果数量
+            fetch (callable): 未命中时执行的抓取函数
+
+        Returns:
+            list: 新闻数据列表（与其他请求共享，调用方不应修改）
+        """
+        key = self.make_key(keyword, max_results)
+        found, value = self.lookup(key)
+        if found:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        entry = self._acquire_key_lock(key)
+        try:
+            waited = not entry[0].acquire(blocking=False)
+            if waited:
+                entry[0].acquire()
+            try:
+                # 等待期间其他线程可能已完成抓取
+                if waited:
+                    found, value = self.lookup(key)
+                    if found:
+                        with self._lock:
+                            self.hits += 1
+                            self.coalesced += 1
+                        return value
+
+                with self._lock:
+                    self.misses += 1
+                value = fetch()
+                self.store(key, value)
+                return value
+            finally:
+                entry[0].release()
+        finally:
+            self._release_key_lock(key, entry)
+
+    def invalidate(self, keyword, max_results):
+        """删除指定关键词的缓存"""
+        key = self.make_key(keyword, max_results)
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        """清空全部缓存"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        """缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'disk_hits': self.disk_hits,
+            'coalesced': self.coalesced,
+            'size': len(self.memory),
+            'max_size': self.memory.max_size,
+            'evictions': self.memory.evictions,
+            'expirations': self.memory.expirations,
+            'ttl': self.ttl,
+            'persistent': self.disk is not None
+        }
@@ -0,0 +1,134 @@
+"""
+批量抓取引擎 - 使用线程池并发抓取多个关键词
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from data_crawler import NewsCrawler
+
+
+class CrawlEngine:
+    """多关键词并发抓取引擎
+
+    每个关键词仍以 NewsCrawler.search_news / advanced_search 作为抓取单元，
+    引擎负责并发调度、按主机限制并发数以及整体截止时间控制。
+    """
+
+    def __init__(self, crawler_factory=NewsCrawler, max_workers=8, per_host_limit=4, result_cache=None):
+        """
+        初始化抓取引擎
+
+        Args:
+            crawler_factory (callable): 创建抓取器实例的工厂函数
+            max_workers (int): 线程池最大工作线程数
+            per_host_limit (int): 单个数据源主机的最大并发请求数
+            result_cache (CrawlResultCache): 可选的抓取结果缓存
+        """
+        self.crawler_factory = crawler_factory
+        self.result_cache = result_cache
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='crawl-engine')
+        self._local = threading.local()
+        self._host_semaphores = {}
+        self._lock = threading.Lock()
+
+    def get_crawler(self):
+        """获取当前工作线程专用的抓取器实例"""
+        crawler = getattr(self._local, 'crawler', None)
+        if crawler is None:
+            crawler = self.crawler_factory()
+            self._local.crawler = crawler
+        return crawler
+
+    def get_host_semaphore(self, host):
+        """获取主机对应的并发信号量"""
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    @staticmethod
+    def crawl_keyword(crawler, keyword, max_results):
+        """单个关键词的抓取单元：基本搜索无结果时回退到高级搜索"""
+        return crawler.search_with_fallback(keyword, max_results)
+
+    def _run_task(self, keyword, max_results, deadline_at):
+        """在工作线程中执行单个关键词抓取"""
+        if self.result_cache is not None:
+            return self.result_cache.get_or_fetch(
+                keyword, max_results,
+                lambda: self._crawl_limited(keyword, max_results, deadline_at)
+            )
+        return self._crawl_limited(keyword, max_results, deadline_at)
+
+    def _crawl_limited(self, keyword, max_results, deadline_at):
+        """在主机并发限制内执行抓取"""
+        crawler = self.get_crawler()
+        semaphore = self.get_host_semaphore(crawler.get_source_host(keyword))
+
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0 or not semaphore.acquire(timeout=remaining):
+            raise TimeoutError(f'等待数据源并发名额超时: {keyword}')
+        try:
+            return self.crawl_keyword(crawler, keyword, max_results)
+        finally:
+            semaphore.release()
+
+    def batch_search(self, keywords, max_results=10, timeout=30):
+        """
+        并发抓取多个关键词
+
+        Args:
+            keywords (list): 关键词列表
+            max_results (int): 每个关键词的最大结果数量
+            timeout (float): 整批抓取的截止时间（秒）
+
+        Returns:
+            dict: 包含 results、errors、timed_out、elapsed、complete 字段，
+                  超时的关键词不会阻塞已完成关键词的结果返回
+        """
+        started = time.monotonic()
+        deadline_at = started + timeout
+
+        # 去重并保持原有顺序
+        keywords = list(dict.fromkeys(k for k in keywords if k))
+
+        futures = {
+            self.executor.submit(self._run_task, keyword, max_results, deadline_at): keyword
+            for keyword in keywords
+        }
+        done, not_done = wait(futures, timeout=timeout)
+
+        results = {}
+        errors = {}
+        timed_out = []
+        for future, keyword in futures.items():
+            if future in not_done:
+                # 尚未开始的任务直接取消，正在运行的任务结果将被丢弃
+                future.cancel()
+                timed_out.append(keyword)
+                continue
+            try:
+                results[keyword] = future.result()
+            except TimeoutError:
+                timed_out.append(keyword)
+            except Exception as e:
+                print(f"批量抓取关键词 {keyword} 时发生错误: {e}")
+                errors[keyword] = str(e)
+
+        return {
+            'results': results,
+            'errors': errors,
+            'timed_out': timed_out,
+            'elapsed': round(time.monotonic() - started, 3),
+            'complete': not errors and not timed_out
+        }
+
+    def shutdown(self, wait=True):
+        """关闭线程池"""
+        self.executor.shutdown(wait=wait)
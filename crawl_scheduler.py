@@ -0,0 +1,335 @@
+"""
+后台定时抓取 - 基于 SQLite 的持久化任务队列、工作线程池与按数据源的礼貌延迟
+"""
+import random
+import sqlite3
+import threading
+import time
+
+
+class CrawlJobQueue:
+    """持久化抓取任务队列
+
+    任务状态: pending（等待执行）、running（执行中）、done（完成）、failed（重试耗尽）。
+    进程重启后，遗留的 running 任务会被重新置为 pending。
+    """
+
+    def __init__(self, db_path, max_attempts=3):
+        """
+        初始化任务队列
+
+        Args:
+            db_path (str): SQLite 数据库文件路径
+            max_attempts (int): 单个任务最多执行次数
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS crawl_job ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'keyword TEXT NOT NULL, '
+            'max_results INTEGER NOT NULL, '
+            "status TEXT NOT NULL DEFAULT 'pending', "
+            'run_at REAL NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'result_count INTEGER, '
+            'error TEXT, '
+            'created_at REAL NOT NULL, '
+            'started_at REAL, '
+            'finished_at REAL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS ix_crawl_job_status_run_at ON crawl_job (status, run_at)'
+        )
+        self._conn.commit()
+
+    def enqueue(self, keyword, max_results=10, run_at=None):
+        """
+        添加抓取任务，同一关键词已有未完成任务时不重复添加
+
+        Returns:
+            int: 任务 id，已有未完成任务时返回该任务的 id
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM crawl_job WHERE keyword = ? AND status IN ('pending', 'running')",
+                (keyword,)
+            ).fetchone()
+            if row:
+                return row[0]
+            now = time.time()
+            cursor = self._conn.execute(
+                'INSERT INTO crawl_job (keyword, max_results, run_at, created_at) VALUES (?, ?, ?, ?)',
+                (keyword, max_results, run_at if run_at is not None else now, now)
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def claim(self):
+        """
+        领取一个已到执行时间的任务并标记为 running
+
+        Returns:
+            dict: 任务信息，没有可执行任务时返回 None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, keyword, max_results, attempts FROM crawl_job "
+                "WHERE status = 'pending' AND run_at <= ? ORDER BY run_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE crawl_job SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (now, row[0])
+            )
+            self._conn.commit()
+        return {'id': row[0], 'keyword': row[1], 'max_results': row[2], 'attempts': row[3] + 1}
+
+    def complete(self, job_id, result_count):
+        """标记任务完成"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_job SET status = 'done', result_count = ?, error = NULL, finished_at = ? "
+                "WHERE id = ?",
+                (result_count, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def fail(self, job_id, error, retry_delay=60):
+        """
+        记录任务失败，未超过最大执行次数时延迟重试
+
+        Returns:
+            bool: 是否会重试
+        """
+        with self._lock:
+            attempts = self._conn.execute(
+                'SELECT attempts FROM crawl_job WHERE id = ?', (job_id,)
+            ).fetchone()[0]
+            retry = attempts < self.max_attempts
+            if retry:
+                # 重试间隔按执行次数指数增长
+                self._conn.execute(
+                    "UPDATE crawl_job SET status = 'pending', error = ?, run_at = ? WHERE id = ?",
+                    (error, time.time() + retry_delay * 2 ** (attempts - 1), job_id)
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE crawl_job SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (error, time.time(), job_id)
+                )
+            self._conn.commit()
+        return retry
+
+    def recover(self):
+        """把上次进程退出时遗留的 running 任务重新置为 pending"""
+        with self._lock:
+            cursor = self._conn.execute("UPDATE crawl_job SET status = 'pending' WHERE status = 'running'")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def purge(self, older_than):
+        """删除完成时间早于 older_than（时间戳）的已结束任务"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM crawl_job WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (older_than,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        """各状态的任务数量"""
+        with self._lock:
+            rows = self._conn.execute('SELECT status, COUNT(*) FROM crawl_job GROUP BY status').fetchall()
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(rows))
+        return counts
+
+    def recent(self, limit=20):
+        """最近的任务记录"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, keyword, status, attempts, result_count, error, created_at, finished_at '
+                'FROM crawl_job ORDER BY id DESC LIMIT ?', (limit,)
+            ).fetchall()
+        keys = ('id', 'keyword', 'status', 'attempts', 'result_count', 'error', 'created_at', 'finished_at')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
+
+
+class PolitenessGate:
+    """按数据源主机控制请求间隔，同一主机两次请求之间至少间隔 delay 秒"""
+
+    def __init__(self, delay=2.0):
+        self.delay = delay
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host, stop_event=None):
+        """
+        预约主机的下一个请求时段并等待到该时段
+
+        Returns:
+            bool: 是否等到了请求时段（stop_event 被设置时返回 False）
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.delay
+        remaining = slot - time.monotonic()
+        if remaining <= 0:
+            return True
+        if stop_event is not None:
+            return not stop_event.wait(remaining)
+        time.sleep(remaining)
+        return True
+
+
+class CrawlScheduler:
+    """定时抓取调度器
+
+    调度线程按带抖动的间隔为每个关键词生成任务写入队列，
+    工作线程从队列领取任务，按数据源礼貌延迟执行抓取，并将结果交给 store_func 批量入库。
+    """
+
+    def __init__(self, queue, crawl_func, store_func, keywords, host_func=None,
+                 interval=1800, jitter=0.2, workers=2, politeness_delay=2.0,
+                 max_results=20, poll_interval=1.0, retry_delay=60):
+        """
+        初始化调度器
+
+        Args:
+            queue (CrawlJobQueue): 持久化任务队列
+            crawl_func (callable): (keyword, max_results) -> 新闻列表
+            store_func (callable): (keyword, 新闻列表) -> 新写入的条数
+            keywords (list): 定时抓取的关键词列表
+            host_func (callable): keyword -> 数据源主机，用于礼貌延迟
+            interval (float): 每个关键词的抓取间隔（秒）
+            jitter (float): 间隔随机抖动比例，避免所有关键词同时抓取
+            workers (int): 工作线程数
+            politeness_delay (float): 同一数据源两次请求的最小间隔（秒）
+            max_results (int): 每次抓取的最大结果数量
+            poll_interval (float): 队列为空时工作线程的轮询间隔（秒）
+            retry_delay (float): 任务失败后首次重试的延迟（秒）
+        """
+        self.queue = queue
+        self.crawl_func = crawl_func
+        self.store_func = store_func
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self.host_func = host_func or (lambda keyword: 'default')
+        self.interval = interval
+        self.jitter = jitter
+        self.workers = workers
+        self.max_results = max_results
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.gate = PolitenessGate(politeness_delay)
+        self._stop = threading.Event()
+        self._threads = []
+        self._next_run = {}
+        self.last_error = None
+
+    def next_interval(self):
+        """带随机抖动的抓取间隔"""
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def schedule_due(self, now=None):
+        """
+        为已到抓取时间的关键词生成任务
+
+        Returns:
+            list: 本次生成任务的关键词
+        """
+        now = time.time() if now is None else now
+        scheduled = []
+        for keyword in self.keywords:
+            if self._next_run.get(keyword, 0) <= now:
+                self.queue.enqueue(keyword, self.max_results, run_at=now)
+                self._next_run[keyword] = now + self.next_interval()
+                scheduled.append(keyword)
+        return scheduled
+
+    def run_job(self, job):
+        """执行单个抓取任务"""
+        keyword = job['keyword']
+        if not self.gate.wait(self.host_func(keyword), self._stop):
+            # 调度器停止时任务留在 running 状态，下次启动时恢复
+            return
+        try:
+            items = self.crawl_func(keyword, job['max_results'])
+            self.store_func(keyword, items)
+            self.queue.complete(job['id'], len(items))
+        except Exception as e:
+            print(f"定时抓取关键词 {keyword} 时发生错误: {e}")
+            self.last_error = str(e)
+            self.queue.fail(job['id'], str(e), retry_delay=self.retry_delay)
+
+    def _schedule_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.schedule_due()
+            except Exception as e:
+                print(f"生成定时抓取任务时发生错误: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                print(f"领取抓取任务时发生错误: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_job(job)
+
+    def start(self):
+        """启动调度线程和工作线程"""
+        if self.is_running():
+            return
+        self._stop.clear()
+        self.queue.recover()
+        # 首轮抓取时间在一个抖动区间内错开
+        now = time.time()
+        for keyword in self.keywords:
+            self._next_run.setdefault(keyword, now + random.uniform(0, self.interval * self.jitter))
+
+        self._threads = [threading.Thread(target=self._schedule_loop, name='crawl-scheduler', daemon=True)]
+        self._threads += [threading.Thread(target=self._worker_loop, name=f'crawl-worker-{i}', daemon=True)
+                          for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=5):
+        """停止调度器并等待线程退出"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def is_running(self):
+        """调度器是否正在运行"""
+        return any(thread.is_alive() for thread in self._threads)
+
+    def status(self):
+        """调度器状态"""
+        return {
+            'running': self.is_running(),
+            'keywords': self.keywords,
+            'interval': self.interval,
+            'workers': self.workers,
+            'jobs': self.queue.stats(),
+            'next_run': {k: round(v, 3) for k, v in self._next_run.items()},
+            'last_error': self.last_error
+        }
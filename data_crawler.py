@@ -2,28 +2,157 @@
 新闻数据抓取模块 - 使用多种数据源
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import gzip
 import json
+import os
 import re
+import threading
 from bs4 import BeautifulSoup
-from urllib.parse import quote
+from http_cache import ResponseCache
+from news_parsers import get_parser_backend
+from rate_limiter import SourceBlockedError
+from urllib.parse import quote, urlparse
 from datetime import datetime
 import time
 import random
 
 
+# 默认请求头
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9',
+    # 只声明能够解压的编码（安装 brotli 后才包含 br），由 urllib3 在读取时流式解压
+    'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
+    'Connection': 'keep-alive'
+}
+
+# 共享连接池默认配置
+DEFAULT_POOL_CONFIG = {
+    'pool_connections': 10,  # 缓存的主机连接池数量
+    'pool_maxsize': 10,  # 单个主机的最大连接数
+    'max_retries': 3,  # 连接错误和5xx响应的最大重试次数
+    'backoff_factor': 0.5  # 重试退避系数（秒）
+}
+
+_pool_config = dict(DEFAULT_POOL_CONFIG)
+_shared_session = None
+_shared_session_pid = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=10, pool_maxsize=10, max_retries=3, backoff_factor=0.5):
+    """
+    创建带连接池和重试策略的会话
+
+    Args:
+        pool_connections (int): 缓存的主机连接池数量
+        pool_maxsize (int): 单个主机的最大连接数
+        max_retries (int): 最大重试次数
+        backoff_factor (float): 重试退避系数
+
+    Returns:
+        requests.Session: 会话对象
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD'])
+    )
+    # pool_block=True 保证单个主机的连接数不超过 pool_maxsize
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=retry, pool_block=True)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def configure_shared_session(**options):
+    """
+    更新共享连接池配置，已创建的会话会被关闭并在下次使用时按新配置重建
+
+    Args:
+        **options: 与 create_session 参数相同的配置项
+    """
+    global _shared_session
+    unknown = set(options) - set(DEFAULT_POOL_CONFIG)
+    if unknown:
+        raise ValueError(f"未知的连接池配置项: {', '.join(sorted(unknown))}")
+
+    with _session_lock:
+        _pool_config.update(options)
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
+
+def get_shared_session():
+    """
+    获取进程内共享的会话，复用 keep-alive 连接和 TLS 会话
+
+    进程 fork 之后会为子进程重新创建会话，避免多个进程共用同一套连接。
+    """
+    global _shared_session, _shared_session_pid
+    pid = os.getpid()
+    if _shared_session is None or _shared_session_pid != pid:
+        with _session_lock:
+            if _shared_session is None or _shared_session_pid != pid:
+                _shared_session = create_session(**_pool_config)
+                _shared_session_pid = pid
+    return _shared_session
+
+
+def decode_body(response):
+    """
+    获取解压后的响应内容
+
+    gzip/deflate/br 由 urllib3 根据 Content-Encoding 自动解压；服务器未声明编码
+    却返回 gzip 数据时，按 gzip 魔数兜底解压。返回 bytes，由解析器按页面声明的字符集解码。
+    """
+    body = response.content
+    if body[:2] == b'\x1f\x8b':
+        try:
+            body = gzip.decompress(body)
+        except OSError:
+            pass
+    return body
+
+
 class NewsCrawler:
     """新闻数据抓取器 - 支持多种数据源"""
-    
-    def __init__(self):
-        """初始化爬虫"""
-        self.session = requests.Session()
-        # 设置请求头
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.9',
-            'Connection': 'keep-alive'
-        })
+
+    # 百度新闻搜索地址
+    SEARCH_URL = 'https://www.baidu.com/s?rtt=1&bsst=1&cl=2&tn=news&word={keyword}'
+
+    def __init__(self, session=None, parser_backend=None, response_cache=None,
+                 enable_real_search=False, timeout=10, seen_store=None, rate_limiter=None):
+        """
+        初始化爬虫
+
+        Args:
+            session (requests.Session): 自定义会话，默认使用进程内共享的连接池会话
+            parser_backend (str): 结果页解析后端名称（lxml / streaming / html.parser），
+                默认优先使用 lxml，未安装时回退到 html.parser
+            response_cache (ResponseCache): 可选的磁盘响应缓存，用于条件请求
+            enable_real_search (bool): 没有模拟数据时是否请求真实数据源
+            timeout (float): 请求超时时间（秒）
+            seen_store (SeenUrlStore): 已抓取文章记录，增量抓取时使用
+            rate_limiter (HostRateLimiter): 可选的按主机限流器，多个抓取器共享同一实例
+        """
+        self.session = session if session is not None else get_shared_session()
+        self.parser = get_parser_backend(parser_backend)
+        self.response_cache = response_cache
+        self.enable_real_search = enable_real_search
+        self.timeout = timeout
+        self.seen_store = seen_store
+        self.rate_limiter = rate_limiter
         
         # 模拟新闻数据（用于测试和演示）
         self.mock_news_data = {
@@ -77,6 +206,14 @@ class NewsCrawler:
             ]
         }
     
+    def build_search_url(self, keyword):
+        """构建关键词对应的搜索地址"""
+        return self.SEARCH_URL.format(keyword=quote(keyword))
+
+    def get_source_host(self, keyword):
+        """获取关键词搜索所访问的数据源主机名"""
+        return urlparse(self.build_search_url(keyword)).netloc
+
     def search_news(self, keyword, max_results=10):
         """
         搜索新闻 - 优先使用模拟数据，支持真实数据源
@@ -101,6 +238,28 @@ class NewsCrawler:
             # 返回默认模拟数据
             return self.get_default_news(keyword, max_results)
     
+    def search_with_fallback(self, keyword, max_results=10):
+        """基本搜索，没有结果时回退到高级搜索"""
+        results = self.search_news(keyword, max_results)
+        if not results:
+            results = self.advanced_search(keyword, max_results)
+        return results
+    
+    def search_incremental(self, keyword, max_results=10):
+        """
+        增量搜索 - 只返回此前没有抓取过的新闻
+        
+        Args:
+            keyword (str): 搜索关键词
+            max_results (int): 最大结果数量
+            
+        Returns:
+            list: 首次出现的新闻数据列表，带有 seen_id 游标字段
+        """
+        if self.seen_store is None:
+            raise ValueError('增量抓取需要配置已抓取文章记录（seen_store）')
+        return self.seen_store.record(keyword, self.search_with_fallback(keyword, max_results))
+    
     def parse_news_html(self, html_content, max_results):
         """
         解析HTML内容，提取新闻数据
@@ -112,90 +271,113 @@ class NewsCrawler:
         Returns:
             list: 新闻数据列表
         """
-        news_list = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # 查找新闻结果容器
-        news_containers = soup.find_all('div', class_='result')
-        
-        for container in news_containers[:max_results]:
-            try:
-                news_data = self.extract_news_info(container)
-                if news_data:
-                    news_list.append(news_data)
-            except Exception as e:
-                print(f"解析新闻数据时发生错误: {str(e)}")
-                continue
-        
-        return news_list
+        return self.parser.parse_news(html_content, max_results)
     
     def extract_news_info(self, container):
         """
         从单个新闻容器中提取信息
         
         Args:
-            container: BeautifulSoup对象
+            container: 当前解析后端的元素对象
             
         Returns:
             dict: 新闻信息字典
         """
-        news_data = {}
+        return self.parser.extract_news_info(container)
+    
+    def fetch_page(self, url):
+        """
+        抓取页面，携带缓存的 ETag/Last-Modified 发送条件请求
         
-        # 提取标题
-        title_elem = container.find('h3', class_='news-title')
-        if title_elem:
-            title_link = title_elem.find('a')
-            if title_link:
-                news_data['title'] = title_link.get_text(strip=True)
-                news_data['url'] = title_link.get('href', '')
+        Args:
+            url (str): 页面地址
+            
+        Returns:
+            tuple: (页面内容 bytes，304 时为 None；缓存条目；是否未修改)
+            
+        Raises:
+            SourceBlockedError: 数据源熔断中，或返回了验证页面/异常页面
+            RateLimitTimeout: 在超时时间内无法获得请求令牌
+        """
+        entry = self.response_cache.get(url) if self.response_cache else None
+        headers = ResponseCache.conditional_headers(entry)
+        host = urlparse(url).netloc
+        limiter = self.rate_limiter
         
-        # 提取概要
-        summary_elem = container.find('div', class_='c-summary')
-        if summary_elem:
-            news_data['summary'] = summary_elem.get_text(strip=True)
+        # 等待主机的请求令牌，数据源熔断时直接跳过
+        if limiter is not None:
+            limiter.acquire(host, timeout=self.timeout)
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception:
+            if limiter is not None:
+                limiter.record(host, 'error')
+            raise
         
-        # 提取来源和时间
-        source_elem = container.find('p', class_='c-author')
-        if source_elem:
-            source_text = source_elem.get_text(strip=True)
-            # 分离来源和时间
-            parts = source_text.split(' ')
-            if len(parts) >= 2:
-                news_data['source'] = parts[0]
-                news_data['publish_time'] = parts[1]
+        if response.status_code == 304 and entry is not None:
+            if limiter is not None:
+                limiter.record(host, 'ok')
+            self.response_cache.touch(url, entry)
+            return None, entry, True
         
-        # 提取封面图片
-        img_elem = container.find('img')
-        if img_elem:
-            news_data['cover'] = img_elem.get('src', '')
-            # 处理相对路径
-            if news_data['cover'].startswith('//'):
-                news_data['cover'] = 'https:' + news_data['cover']
-            elif news_data['cover'].startswith('/'):
-                news_data['cover'] = 'https://www.baidu.com' + news_data['cover']
+        if limiter is not None and response.status_code >= 400:
+            limiter.inspect(host, response)
+        response.raise_for_status()
+        body = decode_body(response)
         
-        # 如果没有提取到封面，设置默认值
-        if 'cover' not in news_data or not news_data['cover']:
-            news_data['cover'] = ''
+        # 被要求验证或返回异常短小的页面时不解析、不缓存
+        if limiter is not None:
+            signal = limiter.inspect(host, response, body)
+            if signal in ('blocked', 'suspicious'):
+                raise SourceBlockedError(f'数据源 {host} 返回了验证页面或异常页面（{signal}）')
         
-        # 确保所有必需字段都存在
-        required_fields = ['title', 'summary', 'cover', 'url', 'source']
-        for field in required_fields:
-            if field not in news_data:
-                news_data[field] = ''
+        entry = None
+        if self.response_cache is not None:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            # 没有校验信息的响应无法发送条件请求，不写入缓存
+            if etag or last_modified:
+                entry = self.response_cache.set(url, body, etag, last_modified)
+        return body, entry, False
+    
+    def try_real_search(self, keyword, max_results, mode='news'):
+        """
+        尝试真实数据源搜索
         
-        # 添加抓取时间
-        news_data['crawl_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        Args:
+            keyword (str): 搜索关键词
+            max_results (int): 最大结果数量
+            mode (str): news 使用基本解析，advanced 使用高级解析
+            
+        Returns:
+            list: 新闻数据列表，未启用真实数据源或请求失败时返回空列表
+        """
+        if not self.enable_real_search:
+            return []
         
-        return news_data if news_data['title'] else None
-    
-    def try_real_search(self, keyword, max_results):
-        """尝试真实数据源搜索"""
         try:
-            # 这里可以添加真实的数据源API调用
-            # 目前返回空列表，表示使用模拟数据
-            return []
-        except:
+            url = self.build_search_url(keyword)
+            body, entry, not_modified = self.fetch_page(url)
+            parse_key = f'{mode}:{max_results}'
+            
+            if not_modified:
+                # 页面未变化：直接复用上次的解析结果
+                if parse_key in entry.get('parsed', {}):
+                    return entry['parsed'][parse_key]
+                body = self.response_cache.get_body(url)
+                if body is None:
+                    return []
+            
+            if mode == 'advanced':
+                results = self.parse_advanced_news_html(body, max_results)
+            else:
+                results = self.parse_news_html(body, max_results)
+            
+            if entry is not None:
+                self.response_cache.set_parsed(url, entry, parse_key, results)
+            return results
+        except Exception as e:
+            print(f"真实数据源搜索失败: {e}")
             return []
     
     def get_default_news(self, keyword, max_results):
@@ -229,7 +411,7 @@ class NewsCrawler:
                 return self.mock_news_data[keyword][:max_results]
             
             # 尝试真实数据源
-            return self.try_real_search(keyword, max_results)
+            return self.try_real_search(keyword, max_results, mode='advanced')
                 
         except Exception as e:
             print(f"高级搜索时发生错误: {e}")
@@ -247,96 +429,7 @@ class NewsCrawler:
         Returns:
             list: 新闻数据列表
         """
-        news_list = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # 方法1: 查找新闻标题（h3标签）
-        news_titles = soup.find_all('h3')
-        
-        for title_elem in news_titles[:max_results*2]:
-            try:
-                # 查找标题链接
-                title_link = title_elem.find('a')
-                if title_link:
-                    title = title_link.get_text(strip=True)
-                    url = title_link.get('href', '')
-                    
-                    # 过滤无效标题
-                    if title and len(title) > 5 and not title.startswith('百度'):
-                        # 查找父容器中的其他信息
-                        parent_container = title_elem.find_parent('div')
-                        summary = ''
-                        source = '百度新闻'
-                        cover = ''
-                        
-                        if parent_container:
-                            # 查找概要
-                            summary_elems = parent_container.find_all('div', class_=True)
-                            for elem in summary_elems:
-                                text = elem.get_text(strip=True)
-                                if len(text) > 20 and len(text) < 200:
-                                    summary = text
-                                    break
-                            
-                            # 查找来源和时间
-                            source_elems = parent_container.find_all('span', class_=True)
-                            for elem in source_elems:
-                                text = elem.get_text(strip=True)
-                                if '·' in text or '前' in text or '小时' in text:
-                                    source = text
-                                    break
-                            
-                            # 查找图片
-                            img_elem = parent_container.find('img')
-                            if img_elem:
-                                cover = img_elem.get('src', '')
-                                if cover.startswith('//'):
-                                    cover = 'https:' + cover
-                                elif cover.startswith('/'):
-                                    cover = 'https://www.baidu.com' + cover
-                        
-                        news_data = {
-                            'title': title,
-                            'url': url,
-                            'summary': summary,
-                            'source': source,
-                            'cover': cover,
-                            'crawl_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        
-                        if len(news_list) < max_results:
-                            news_list.append(news_data)
-            except Exception as e:
-                continue
-        
-        # 方法2: 如果方法1没有结果，尝试直接搜索新闻链接
-        if not news_list:
-            news_links = soup.find_all('a', href=re.compile(r'^https?://'))
-            
-            for link in news_links[:max_results*3]:
-                try:
-                    title = link.get_text(strip=True)
-                    # 过滤有效标题
-                    if (title and len(title) > 10 and 
-                        not title.startswith('百度') and 
-                        not '首页' in title and 
-                        not '登录' in title):
-                        
-                        news_data = {
-                            'title': title,
-                            'url': link.get('href', ''),
-                            'summary': '',
-                            'source': '网络来源',
-                            'cover': '',
-                            'crawl_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        
-                        if len(news_list) < max_results:
-                            news_list.append(news_data)
-                except Exception as e:
-                    continue
-        
-        return news_list
+        return self.parser.parse_advanced(html_content, max_results)
     
     def extract_advanced_news_info(self, title_elem):
         """
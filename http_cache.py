@@ -0,0 +1,117 @@
+"""
+HTTP 响应磁盘缓存 - 保存 ETag/Last-Modified 校验信息、页面内容和解析结果
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class ResponseCache:
+    """磁盘响应缓存
+
+    每个 URL 对应两个文件：<hash>.json 保存校验信息与已解析的结果列表，
+    <hash>.html.gz 保存解压后的页面内容（gzip 压缩存储）。
+    """
+
+    def __init__(self, cache_dir):
+        """
+        初始化响应缓存
+
+        Args:
+            cache_dir (str): 缓存目录，不存在时在首次写入时创建
+        """
+        self.cache_dir = cache_dir
+
+    def _base_path(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+
+    def _write_atomic(self, path, data):
+        """先写临时文件再替换，避免并发读取到半个文件"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, url):
+        """
+        读取缓存条目的校验信息和解析结果
+
+        Returns:
+            dict: 缓存条目，不存在时返回 None
+        """
+        try:
+            with open(self._base_path(url) + '.json', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def get_body(self, url):
+        """读取缓存的页面内容（bytes），不存在时返回 None"""
+        try:
+            with gzip.open(self._base_path(url) + '.html.gz', 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, url, body, etag=None, last_modified=None):
+        """
+        保存新的页面内容，已有的解析结果随之失效
+
+        Returns:
+            dict: 新的缓存条目
+        """
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'validated_at': time.time(),
+            'parsed': {}
+        }
+        base_path = self._base_path(url)
+        self._write_atomic(base_path + '.html.gz', gzip.compress(body))
+        self._write_entry(base_path, entry)
+        return entry
+
+    def _write_entry(self, base_path, entry):
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        self._write_atomic(base_path + '.json', data)
+
+    def touch(self, url, entry):
+        """服务器返回 304 时更新校验时间"""
+        entry['validated_at'] = time.time()
+        self._write_entry(self._base_path(url), entry)
+
+    def set_parsed(self, url, entry, parse_key, results):
+        """保存某种解析方式的结果，304 时直接复用"""
+        entry.setdefault('parsed', {})[parse_key] = results
+        self._write_entry(self._base_path(url), entry)
+
+    @staticmethod
+    def conditional_headers(entry):
+        """根据缓存条目构建条件请求头"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def delete(self, url):
+        """删除缓存条目"""
+        base_path = self._base_path(url)
+        for suffix in ('.json', '.html.gz'):
+            if os.path.exists(base_path + suffix):
+                os.remove(base_path + suffix)
@@ -0,0 +1,107 @@
+"""
+数据库迁移 - 用 SQLite 的 PRAGMA user_version 记录数据库版本，启动时依次执行未应用的迁移
+
+db.create_all() 只会创建缺少的表，不会修改已有的表（例如为已有的表添加索引），
+这类变更写成迁移追加到 MIGRATIONS 末尾。已发布的迁移不要修改，只能追加新的版本。
+"""
+from sqlalchemy import text
+
+
+def backfill_report_keywords(connection, batch_size=2000):
+    """
+    由报告的 keywords 列重新生成 report_keyword 表，并把能解析的 keywords 列改写为紧凑 JSON
+
+    按编号分批读取报告，每批读完后再写入。先清空 report_keyword，可重复执行。
+    report_keyword 表由 db.create_all() 创建。
+
+    Returns:
+        int: 处理的报告数
+    """
+    from trend_rollups import dump_keywords, merge_keywords, parse_keywords
+
+    connection.execute(text('DELETE FROM report_keyword'))
+    last_id = 0
+    total = 0
+    while True:
+        rows = connection.execute(
+            text('SELECT id, keywords FROM public_opinion_report WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': batch_size}
+        ).all()
+        if not rows:
+            break
+        keyword_rows = []
+        updates = []
+        for report_id, keywords_text in rows:
+            keywords = merge_keywords(parse_keywords(keywords_text))
+            keyword_rows.extend({'report_id': report_id, 'keyword': word, 'weight': weight}
+                                for word, weight in keywords)
+            # 无法解析的内容保持原样
+            stored = dump_keywords(keywords) if keywords else keywords_text
+            if stored != keywords_text:
+                updates.append({'id': report_id, 'keywords': stored})
+        if keyword_rows:
+            connection.execute(
+                text('INSERT INTO report_keyword (report_id, keyword, weight) VALUES (:report_id, :keyword, :weight)'),
+                keyword_rows
+            )
+        if updates:
+            connection.execute(text('UPDATE public_opinion_report SET keywords = :keywords WHERE id = :id'), updates)
+        total += len(rows)
+        last_id = rows[-1][0]
+    return total
+
+
+# (版本号, 说明, 步骤列表)；步骤为 SQL 语句或接收连接的函数。
+# SQLite 的 DDL 在 Python sqlite3 驱动中可能不在事务内执行，步骤应可重复执行
+# （CREATE INDEX IF NOT EXISTS 等），迁移中途失败时重新启动即可继续。
+MIGRATIONS = [
+    (1, '舆情报告表常用排序和筛选列的索引', [
+        # 报告列表和仪表板：按 (created_at, id) 倒序的键集分页
+        'CREATE INDEX IF NOT EXISTS ix_report_created_at_id ON public_opinion_report (created_at, id)',
+        # 按情感倾向筛选的报告列表
+        'CREATE INDEX IF NOT EXISTS ix_report_sentiment_created_at ON public_opinion_report (sentiment, created_at, id)',
+        # 某个用户创建的报告
+        'CREATE INDEX IF NOT EXISTS ix_report_created_by_created_at ON public_opinion_report (created_by, created_at)',
+        # 按日期范围、来源筛选
+        'CREATE INDEX IF NOT EXISTS ix_report_report_date ON public_opinion_report (report_date)',
+        'CREATE INDEX IF NOT EXISTS ix_report_source_report_date ON public_opinion_report (source, report_date)',
+    ]),
+    (2, '报告关键词拆分到 report_keyword 表，keywords 列改为 JSON', [
+        backfill_report_keywords,
+    ]),
+]
+
+
+def get_version(connection):
+    """数据库当前版本（新建的数据库为 0）"""
+    return connection.execute(text('PRAGMA user_version')).scalar()
+
+
+def migrate(engine, migrations=None):
+    """
+    依次执行版本号大于数据库当前版本的迁移，每个迁移完成后更新版本号
+
+    Args:
+        engine: SQLAlchemy 引擎
+        migrations (list): 迁移列表，默认为 MIGRATIONS
+
+    Returns:
+        list: 本次执行的迁移版本号
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    with engine.connect() as conn:
+        current = get_version(conn)
+    applied = []
+    for version, description, steps in sorted(migrations, key=lambda item: item[0]):
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.execute(text(f'PRAGMA user_version = {int(version)}'))
+        print(f"数据库迁移 {version}: {description}")
+        applied.append(version)
+    return applied
@@ -0,0 +1,218 @@
+"""
+近似重复新闻检测 - 基于 jieba 分词的 SimHash 指纹与分段索引
+"""
+import hashlib
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+
+import jieba
+import jieba.analyse
+import numpy as np
+
+
+# 指纹位数
+FINGERPRINT_BITS = 64
+
+# 标题分词的权重（相对概要）：转载稿的概要常被截断或增删，标题更稳定
+TITLE_WEIGHT = 3
+
+# 转载时常见的标题/概要修饰：栏目前缀、站点后缀、来源与编辑署名
+DECORATION_PATTERNS = [
+    re.compile(r'^\s*(【[^】]*】|\[[^\]]*\]|(转载|转发|原创|独家|快讯)\s*[:：])\s*'),
+    re.compile(r'\s*[_\-|—–]+\s*[^_\-|—–\s]{2,12}$'),
+    re.compile(r'\s*[（(](来源|编辑|责任编辑|记者)[:：][^）)]*[）)]\s*$'),
+]
+
+
+@lru_cache(maxsize=200000)
+def token_hash(token):
+    """词语的 64 位稳定哈希（不受 PYTHONHASHSEED 影响，可跨进程比较）"""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def strip_decorations(text):
+    """去掉转载时添加的栏目前缀、站点后缀和署名"""
+    text = text or ''
+    for pattern in DECORATION_PATTERNS:
+        text = pattern.sub('', text)
+    return text
+
+
+def tokenize(text):
+    """分词并过滤空白、标点和单字"""
+    return [token for token in jieba.lcut(text or '')
+            if len(token.strip()) > 1 and any(ch.isalnum() for ch in token)]
+
+
+def default_idf(token):
+    """jieba 内置 IDF 表中的词语权重，常见词权重低，未收录的词使用中位数"""
+    tfidf = jieba.analyse.default_tfidf
+    return tfidf.idf_freq.get(token, tfidf.median_idf)
+
+
+def simhash(weighted_tokens):
+    """
+    计算 SimHash 指纹
+
+    Args:
+        weighted_tokens (dict): 词语 -> 权重
+
+    Returns:
+        int: 64 位指纹，没有词语时返回 0
+    """
+    if not weighted_tokens:
+        return 0
+    hashes = np.array([token_hash(token) for token in weighted_tokens], dtype='>u8')
+    weights = np.array(list(weighted_tokens.values()), dtype=np.float64)
+    # 每个词语展开为 64 个比特（高位在前），比特为 1 记 +w，为 0 记 -w
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1)
+    totals = weights @ (bits.astype(np.float64) * 2 - 1)
+    return int.from_bytes(np.packbits(totals > 0).tobytes(), 'big')
+
+
+def hamming_distance(a, b):
+    """两个指纹的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+def article_fingerprint(title, summary='', idf=default_idf):
+    """
+    按标题+概要计算文章指纹
+
+    词语权重为 词频 × IDF，标题中的词语额外乘以 TITLE_WEIGHT。
+
+    Args:
+        title (str): 标题
+        summary (str): 概要
+        idf (callable): 词语 -> IDF 权重
+
+    Returns:
+        int: 64 位指纹
+    """
+    weights = Counter()
+    for token in tokenize(strip_decorations(title)):
+        weights[token] += TITLE_WEIGHT * idf(token)
+    for token in tokenize(strip_decorations(summary)):
+        weights[token] += idf(token)
+    return simhash(weights)
+
+
+class SimHashIndex:
+    """SimHash 近邻索引
+
+    把 64 位指纹切分为 max_distance+1 段，按每段的值分别建桶。根据鸽巢原理，
+    汉明距离不超过 max_distance 的两个指纹至少有一段完全相同，因此查询只需检查
+    各段命中的桶内候选，无需与全部指纹比较。
+    """
+
+    def __init__(self, max_distance=3):
+        """
+        初始化索引
+
+        Args:
+            max_distance (int): 判定为近似重复的最大汉明距离
+        """
+        self.max_distance = max_distance
+        blocks = max_distance + 1
+        # 每段的 (位移, 掩码)
+        size = FINGERPRINT_BITS // blocks
+        self._blocks = []
+        for i in range(blocks):
+            width = size if i < blocks - 1 else FINGERPRINT_BITS - size * (blocks - 1)
+            self._blocks.append((size * i, (1 << width) - 1))
+        self._tables = [{} for _ in self._blocks]
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def _keys(self, fingerprint):
+        return [(fingerprint >> shift) & mask for shift, mask in self._blocks]
+
+    def add(self, doc_id, fingerprint):
+        """加入一个指纹"""
+        entry = (fingerprint, doc_id)
+        with self._lock:
+            for table, key in zip(self._tables, self._keys(fingerprint)):
+                table.setdefault(key, []).append(entry)
+            self.size += 1
+
+    def find(self, fingerprint):
+        """
+        查找近似重复
+
+        Returns:
+            tuple: (doc_id, 汉明距离)，没有近似重复时返回 None
+        """
+        best = None
+        with self._lock:
+            for table, key in zip(self._tables, self._keys(fingerprint)):
+                for candidate, doc_id in table.get(key, ()):
+                    distance = hamming_distance(candidate, fingerprint)
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (doc_id, distance)
+                        if distance == 0:
+                            return best
+        return best
+
+    def __len__(self):
+        return self.size
+
+
+class NearDuplicateDetector:
+    """近似重复新闻检测器"""
+
+    def __init__(self, max_distance=3):
+        self.index = SimHashIndex(max_distance=max_distance)
+
+    @staticmethod
+    def fingerprint(item):
+        """计算新闻条目的指纹"""
+        return article_fingerprint(item.get('title', ''), item.get('summary', ''))
+
+    def check_and_add(self, item, doc_id=None):
+        """
+        检查条目是否与索引中的文章近似重复，不重复时加入索引
+
+        Returns:
+            近似重复文章的 doc_id，不重复时返回 None
+        """
+        fingerprint = self.fingerprint(item)
+        if fingerprint == 0:
+            return None
+        match = self.index.find(fingerprint)
+        if match is not None:
+            return match[0]
+        self.index.add(doc_id if doc_id is not None else item.get('url') or item.get('title'), fingerprint)
+        return None
+
+    def collapse(self, items, use_index=False):
+        """
+        合并近似重复的新闻，保留每组中第一条
+
+        Args:
+            items (list): 新闻数据列表
+            use_index (bool): 是否同时与索引中此前见过的文章比较（并把新文章加入索引）
+
+        Returns:
+            list: 去重后的新闻列表（副本），保留的条目带有 duplicate_count 和 duplicate_sources 字段
+        """
+        batch_index = SimHashIndex(max_distance=self.index.max_distance)
+        kept = []
+        for item in items:
+            fingerprint = self.fingerprint(item)
+            match = batch_index.find(fingerprint) if fingerprint else None
+            if match is not None:
+                group = kept[match[0]]
+                group['duplicate_count'] += 1
+                group['duplicate_sources'].append(item.get('source', ''))
+                continue
+            if use_index and fingerprint and self.index.find(fingerprint) is not None:
+                continue
+
+            if fingerprint:
+                batch_index.add(len(kept), fingerprint)
+                if use_index:
+                    self.index.add(item.get('url') or item.get('title'), fingerprint)
+            kept.append(dict(item, duplicate_count=0, duplicate_sources=[]))
+        return kept
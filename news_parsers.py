@@ -0,0 +1,665 @@
+"""
+新闻搜索结果页解析后端 - 支持 html.parser、lxml 与流式扫描三种实现
+"""
+import re
+from bisect import bisect_left
+from datetime import datetime
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml 为可选依赖，未安装时回退到 html.parser
+    etree = None
+
+
+# 链接地址匹配（高级解析的兜底方法使用）
+HTTP_LINK_RE = re.compile(r'^https?://')
+
+
+def normalize_cover(cover):
+    """处理封面图片的相对路径"""
+    if cover.startswith('//'):
+        return 'https:' + cover
+    if cover.startswith('/'):
+        return 'https://www.baidu.com' + cover
+    return cover
+
+
+def now_str():
+    """当前抓取时间字符串"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def finalize_news_info(news_data):
+    """
+    补全新闻字段并添加抓取时间
+
+    Args:
+        news_data (dict): 已提取的新闻字段
+
+    Returns:
+        dict: 新闻信息字典，没有标题时返回 None
+    """
+    # 如果没有提取到封面，设置默认值
+    if 'cover' not in news_data or not news_data['cover']:
+        news_data['cover'] = ''
+
+    # 确保所有必需字段都存在
+    required_fields = ['title', 'summary', 'cover', 'url', 'source']
+    for field in required_fields:
+        if field not in news_data:
+            news_data[field] = ''
+
+    # 添加抓取时间
+    news_data['crawl_time'] = now_str()
+
+    return news_data if news_data['title'] else None
+
+
+def is_valid_title(title):
+    """高级解析：过滤无效的 h3 标题"""
+    return bool(title) and len(title) > 5 and not title.startswith('百度')
+
+
+def is_valid_link_title(title):
+    """高级解析兜底方法：过滤无效的链接标题"""
+    return (bool(title) and len(title) > 10 and
+            not title.startswith('百度') and
+            '首页' not in title and
+            '登录' not in title)
+
+
+def is_summary_text(text):
+    """高级解析：判断文本是否可作为概要"""
+    return 20 < len(text) < 200
+
+
+def is_source_text(text):
+    """高级解析：判断文本是否为来源/时间信息"""
+    return '·' in text or '前' in text or '小时' in text
+
+
+class SoupParserBackend:
+    """基于 BeautifulSoup(html.parser) 的解析后端，纯 Python 实现，作为兜底方案"""
+
+    name = 'html.parser'
+
+    def make_soup(self, html_content):
+        """构建整页文档树"""
+        return BeautifulSoup(html_content, 'html.parser')
+
+    def parse_news(self, html_content, max_results):
+        """
+        解析 div.result 结果块
+
+        Args:
+            html_content (str): HTML内容
+            max_results (int): 最大结果数量
+
+        Returns:
+            list: 新闻数据列表
+        """
+        news_list = []
+        soup = self.make_soup(html_content)
+
+        # 查找新闻结果容器
+        news_containers = soup.find_all('div', class_='result')
+
+        for container in news_containers[:max_results]:
+            try:
+                news_data = self.extract_news_info(container)
+                if news_data:
+                    news_list.append(news_data)
+            except Exception as e:
+                print(f"解析新闻数据时发生错误: {str(e)}")
+                continue
+
+        return news_list
+
+    def extract_news_info(self, container):
+        """
+        从单个新闻容器中提取信息
+
+        Args:
+            container: BeautifulSoup对象
+
+        Returns:
+            dict: 新闻信息字典
+        """
+        news_data = {}
+
+        # 提取标题
+        title_elem = container.find('h3', class_='news-title')
+        if title_elem:
+            title_link = title_elem.find('a')
+            if title_link:
+                news_data['title'] = title_link.get_text(strip=True)
+                news_data['url'] = title_link.get('href', '')
+
+        # 提取概要
+        summary_elem = container.find('div', class_='c-summary')
+        if summary_elem:
+            news_data['summary'] = summary_elem.get_text(strip=True)
+
+        # 提取来源和时间
+        source_elem = container.find('p', class_='c-author')
+        if source_elem:
+            source_text = source_elem.get_text(strip=True)
+            # 分离来源和时间
+            parts = source_text.split(' ')
+            if len(parts) >= 2:
+                news_data['source'] = parts[0]
+                news_data['publish_time'] = parts[1]
+
+        # 提取封面图片
+        img_elem = container.find('img')
+        if img_elem:
+            news_data['cover'] = normalize_cover(img_elem.get('src', ''))
+
+        return finalize_news_info(news_data)
+
+    def parse_advanced(self, html_content, max_results):
+        """
+        按 h3 标题及其父容器解析新闻
+
+        Args:
+            html_content (str): HTML内容
+            max_results (int): 最大结果数量
+
+        Returns:
+            list: 新闻数据列表
+        """
+        soup = self.make_soup(html_content)
+
+        # 方法1: 查找新闻标题（h3标签）
+        news_list = self.extract_title_blocks(soup.find_all('h3')[:max_results*2], max_results)
+
+        # 方法2: 如果方法1没有结果，尝试直接搜索新闻链接
+        if not news_list:
+            news_list = self.extract_links(soup.find_all('a', href=HTTP_LINK_RE), max_results)
+
+        return news_list
+
+    def extract_title_blocks(self, title_elems, max_results):
+        """从 h3 标题元素及其最近的父级 div 中提取新闻"""
+        news_list = []
+        for title_elem in title_elems:
+            try:
+                news_data = self.extract_title_block(title_elem)
+                if news_data and len(news_list) < max_results:
+                    news_list.append(news_data)
+            except Exception:
+                continue
+        return news_list
+
+    def extract_title_block(self, title_elem):
+        """从单个 h3 标题元素中提取新闻，无效标题返回 None"""
+        # 查找标题链接
+        title_link = title_elem.find('a')
+        if not title_link:
+            return None
+
+        title = title_link.get_text(strip=True)
+        url = title_link.get('href', '')
+
+        # 过滤无效标题
+        if not is_valid_title(title):
+            return None
+
+        # 查找父容器中的其他信息
+        parent_container = title_elem.find_parent('div')
+        summary = ''
+        source = '百度新闻'
+        cover = ''
+
+        if parent_container:
+            # 查找概要
+            for elem in parent_container.find_all('div', class_=True):
+                text = elem.get_text(strip=True)
+                if is_summary_text(text):
+                    summary = text
+                    break
+
+            # 查找来源和时间
+            for elem in parent_container.find_all('span', class_=True):
+                text = elem.get_text(strip=True)
+                if is_source_text(text):
+                    source = text
+                    break
+
+            # 查找图片
+            img_elem = parent_container.find('img')
+            if img_elem:
+                cover = normalize_cover(img_elem.get('src', ''))
+
+        return {
+            'title': title,
+            'url': url,
+            'summary': summary,
+            'source': source,
+            'cover': cover,
+            'crawl_time': now_str()
+        }
+
+    def extract_links(self, links, max_results):
+        """兜底方法：从正文链接中提取新闻"""
+        news_list = []
+        for link in links[:max_results*3]:
+            try:
+                title = link.get_text(strip=True)
+                # 过滤有效标题
+                if is_valid_link_title(title) and len(news_list) < max_results:
+                    news_list.append({
+                        'title': title,
+                        'url': link.get('href', ''),
+                        'summary': '',
+                        'source': '网络来源',
+                        'cover': '',
+                        'crawl_time': now_str()
+                    })
+            except Exception:
+                continue
+        return news_list
+
+
+class LxmlParserBackend:
+    """基于 lxml (libxml2) 的解析后端，直接在C实现的文档树上用 XPath 提取字段
+
+    与 SoupParserBackend 返回相同结构的数据：文本提取与 get_text(strip=True)
+    一致（忽略注释、script、style、template 内容），元素查找顺序与 find/find_all 一致。
+    """
+
+    name = 'lxml'
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError('lxml 未安装')
+        # 只返回普通字符串，避免 XPath "smart string" 额外保留父节点引用
+        self._text_nodes = etree.XPath(
+            './/text()[not(ancestor::script or ancestor::style or ancestor::template)]',
+            smart_strings=False
+        )
+        self._result_divs = etree.XPath(
+            "//div[contains(concat(' ', normalize-space(@class), ' '), ' result ')]"
+        )
+
+    def make_tree(self, html_content):
+        """构建文档树，空文档返回 None"""
+        if isinstance(html_content, str):
+            # 字符串统一按 UTF-8 交给 libxml2，避免编码声明冲突
+            parser = etree.HTMLParser(encoding='utf-8')
+            html_content = html_content.encode('utf-8', errors='replace')
+        else:
+            parser = etree.HTMLParser()
+        if not html_content.strip():
+            return None
+        return etree.fromstring(html_content, parser)
+
+    def get_text(self, elem):
+        """等价于 BeautifulSoup 的 get_text(strip=True)"""
+        return ''.join(text.strip() for text in self._text_nodes(elem))
+
+    @staticmethod
+    def has_class(elem, class_name):
+        """判断元素 class 属性是否包含指定类名"""
+        return class_name in (elem.get('class') or '').split()
+
+    def find(self, elem, tag, class_name=None, has_class=False):
+        """等价于 BeautifulSoup 的 find：返回第一个匹配的后代元素"""
+        for child in elem.iterdescendants(tag):
+            if class_name is not None and not self.has_class(child, class_name):
+                continue
+            if has_class and child.get('class') is None:
+                continue
+            return child
+        return None
+
+    def parse_news(self, html_content, max_results):
+        """解析 div.result 结果块"""
+        news_list = []
+        root = self.make_tree(html_content)
+        if root is None:
+            return news_list
+
+        for container in self._result_divs(root)[:max_results]:
+            try:
+                news_data = self.extract_news_info(container)
+                if news_data:
+                    news_list.append(news_data)
+            except Exception as e:
+                print(f"解析新闻数据时发生错误: {str(e)}")
+                continue
+
+        return news_list
+
+    def extract_news_info(self, container):
+        """从单个新闻容器中提取信息"""
+        news_data = {}
+
+        title_elem = self.find(container, 'h3', 'news-title')
+        if title_elem is not None:
+            title_link = self.find(title_elem, 'a')
+            if title_link is not None:
+                news_data['title'] = self.get_text(title_link)
+                news_data['url'] = title_link.get('href', '')
+
+        summary_elem = self.find(container, 'div', 'c-summary')
+        if summary_elem is not None:
+            news_data['summary'] = self.get_text(summary_elem)
+
+        source_elem = self.find(container, 'p', 'c-author')
+        if source_elem is not None:
+            parts = self.get_text(source_elem).split(' ')
+            if len(parts) >= 2:
+                news_data['source'] = parts[0]
+                news_data['publish_time'] = parts[1]
+
+        img_elem = self.find(container, 'img')
+        if img_elem is not None:
+            news_data['cover'] = normalize_cover(img_elem.get('src', ''))
+
+        return finalize_news_info(news_data)
+
+    def parse_advanced(self, html_content, max_results):
+        """按 h3 标题及其父容器解析新闻"""
+        root = self.make_tree(html_content)
+        if root is None:
+            return []
+
+        # 方法1: 查找新闻标题（h3标签）
+        title_elems = list(root.iter('h3'))[:max_results*2]
+        news_list = self.extract_title_blocks(title_elems, max_results)
+
+        # 方法2: 如果方法1没有结果，尝试直接搜索新闻链接
+        if not news_list:
+            links = [link for link in root.iter('a')
+                     if HTTP_LINK_RE.search(link.get('href') or '')]
+            news_list = self.extract_links(links, max_results)
+
+        return news_list
+
+    def extract_title_blocks(self, title_elems, max_results):
+        """从 h3 标题元素及其最近的父级 div 中提取新闻"""
+        news_list = []
+        for title_elem in title_elems:
+            try:
+                news_data = self.extract_title_block(title_elem)
+                if news_data and len(news_list) < max_results:
+                    news_list.append(news_data)
+            except Exception:
+                continue
+        return news_list
+
+    def extract_title_block(self, title_elem):
+        """从单个 h3 标题元素中提取新闻，无效标题返回 None"""
+        title_link = self.find(title_elem, 'a')
+        if title_link is None:
+            return None
+
+        title = self.get_text(title_link)
+        url = title_link.get('href', '')
+        if not is_valid_title(title):
+            return None
+
+        parent_container = next(title_elem.iterancestors('div'), None)
+        summary = ''
+        source = '百度新闻'
+        cover = ''
+
+        if parent_container is not None:
+            for elem in parent_container.iterdescendants('div'):
+                if elem.get('class') is None:
+                    continue
+                text = self.get_text(elem)
+                if is_summary_text(text):
+                    summary = text
+                    break
+
+            for elem in parent_container.iterdescendants('span'):
+                if elem.get('class') is None:
+                    continue
+                text = self.get_text(elem)
+                if is_source_text(text):
+                    source = text
+                    break
+
+            img_elem = self.find(parent_container, 'img')
+            if img_elem is not None:
+                cover = normalize_cover(img_elem.get('src', ''))
+
+        return {
+            'title': title,
+            'url': url,
+            'summary': summary,
+            'source': source,
+            'cover': cover,
+            'crawl_time': now_str()
+        }
+
+    def extract_links(self, links, max_results):
+        """兜底方法：从正文链接中提取新闻"""
+        news_list = []
+        for link in links[:max_results*3]:
+            try:
+                title = self.get_text(link)
+                if is_valid_link_title(title) and len(news_list) < max_results:
+                    news_list.append({
+                        'title': title,
+                        'url': link.get('href', ''),
+                        'summary': '',
+                        'source': '网络来源',
+                        'cover': '',
+                        'crawl_time': now_str()
+                    })
+            except Exception:
+                continue
+        return news_list
+
+
+# 没有结束标签的空元素（与 BeautifulSoup 的 html.parser 树构建器保持一致）
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer'
+])
+
+
+class ResultBlockScanner(HTMLParser):
+    """事件式扫描器：只记录结果块在源码中的起止位置，不构建文档树
+
+    维护与 html.parser 树构建器相同的开放标签栈（结束标签弹出到最近的同名标签，
+    不存在同名标签时忽略），栈中每一项为 [标签名, 起始位置, 结束位置]。
+    """
+
+    def __init__(self, html_content, collect_results=False, h3_limit=0):
+        super().__init__(convert_charrefs=False)
+        self.html_content = html_content
+        self.collect_results = collect_results
+        self.h3_limit = h3_limit
+        self.stack = []
+        # div.result 结果块（按起始位置排序）
+        self.result_blocks = []
+        # h3 标题：(h3 元素, 最近的父级 div 元素或 None)
+        self.titles = []
+        self.title_starts = []
+        # 每行在源码中的起始位置，用于把 getpos() 换算为绝对位置
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', html_content)]
+
+    def position(self):
+        """当前标签在源码中的绝对位置"""
+        lineno, col = self.getpos()
+        return self.line_starts[lineno - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        entry = [tag, self.position(), None]
+        if tag == 'div' and self.collect_results:
+            classes = (dict(attrs).get('class') or '').split()
+            if 'result' in classes:
+                self.result_blocks.append(entry)
+        elif tag == 'h3' and len(self.titles) < self.h3_limit:
+            parent = next((e for e in reversed(self.stack) if e[0] == 'div'), None)
+            self.titles.append((entry, parent))
+            self.title_starts.append(entry[1])
+        self.stack.append(entry)
+
+    def handle_endtag(self, tag):
+        # 与树构建器一致：弹出到最近的同名标签，中间未闭合的标签同时结束
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                start = self.position()
+                end = self.html_content.find('>', start) + 1 or len(self.html_content)
+                for entry in self.stack[i:]:
+                    entry[2] = end
+                del self.stack[i:]
+                return
+
+    def finish(self):
+        """文档结束：所有未闭合的标签在文末结束"""
+        self.close()
+        for entry in self.stack:
+            entry[2] = len(self.html_content)
+        self.stack = []
+
+    def fragment(self, entry):
+        """元素对应的源码片段"""
+        return self.html_content[entry[1]:entry[2]]
+
+
+class StreamingParserBackend(SoupParserBackend):
+    """流式解析后端：分块扫描源码，只为结果块子树构建文档树，凑满结果后立即停止
+
+    字段提取复用 SoupParserBackend 的逻辑，返回与 html.parser 后端相同的数据。
+    """
+
+    name = 'streaming'
+
+    # 每次送入扫描器的源码长度
+    chunk_size = 16 * 1024
+
+    def scan(self, scanner, is_done):
+        """分块扫描，直到 is_done() 返回 True 或文档结束"""
+        html_content = scanner.html_content
+        for pos in range(0, len(html_content), self.chunk_size):
+            scanner.feed(html_content[pos:pos + self.chunk_size])
+            if is_done():
+                return
+        scanner.finish()
+
+    @staticmethod
+    def to_text(html_content):
+        """统一转换为字符串，字节内容交给 BeautifulSoup 同样的编码探测逻辑"""
+        if isinstance(html_content, bytes):
+            from bs4.dammit import UnicodeDammit
+            return UnicodeDammit(html_content, is_html=True).unicode_markup or ''
+        return html_content
+
+    def parse_news(self, html_content, max_results):
+        """解析前 max_results 个 div.result 结果块"""
+        scanner = ResultBlockScanner(self.to_text(html_content), collect_results=True)
+        blocks = scanner.result_blocks
+
+        def is_done():
+            return len(blocks) >= max_results and all(b[2] is not None for b in blocks[:max_results])
+
+        self.scan(scanner, is_done)
+
+        news_list = []
+        for block in blocks[:max_results]:
+            try:
+                container = self.make_soup(scanner.fragment(block)).find('div')
+                news_data = self.extract_news_info(container)
+                if news_data:
+                    news_list.append(news_data)
+            except Exception as e:
+                print(f"解析新闻数据时发生错误: {str(e)}")
+                continue
+
+        return news_list
+
+    def parse_advanced(self, html_content, max_results):
+        """按 h3 标题及其最近的父级 div 解析，凑满 max_results 条后停止扫描"""
+        html_content = self.to_text(html_content)
+        scanner = ResultBlockScanner(html_content, h3_limit=max_results*2)
+        news_list = []
+        fragments = {}
+        state = {'next': 0}
+
+        def extract_ready():
+            # 按 h3 的文档顺序处理已完整扫描的结果块
+            while state['next'] < len(scanner.titles) and len(news_list) < max_results:
+                title_entry, parent = scanner.titles[state['next']]
+                container = parent or title_entry
+                if container[2] is None:
+                    return
+                state['next'] += 1
+                try:
+                    news_data = self.extract_title_block(self.locate_title(scanner, fragments, title_entry, container))
+                    if news_data:
+                        news_list.append(news_data)
+                except Exception:
+                    continue
+
+        def is_done():
+            extract_ready()
+            return len(news_list) >= max_results or state['next'] >= max_results*2
+
+        self.scan(scanner, is_done)
+        extract_ready()
+
+        # 方法2: 如果方法1没有结果，需要整页链接，回退到完整解析
+        if not news_list:
+            news_list = self.extract_links(self.make_soup(html_content).find_all('a', href=HTTP_LINK_RE), max_results)
+
+        return news_list
+
+    def locate_title(self, scanner, fragments, title_entry, container):
+        """在结果块片段的文档树中找到对应的 h3 元素"""
+        key = container[1]
+        soup = fragments.get(key)
+        if soup is None:
+            soup = fragments[key] = self.make_soup(scanner.fragment(container))
+        # 片段内位于该 h3 之前的 h3 数量即为其在片段中的序号
+        index = bisect_left(scanner.title_starts, title_entry[1]) - bisect_left(scanner.title_starts, key)
+        return soup.find_all('h3')[index]
+
+
+# 已注册的解析后端
+PARSER_BACKENDS = {
+    SoupParserBackend.name: SoupParserBackend,
+    LxmlParserBackend.name: LxmlParserBackend,
+    StreamingParserBackend.name: StreamingParserBackend,
+}
+
+# 默认优先使用的解析后端
+DEFAULT_PARSER_BACKEND = 'lxml'
+
+
+def available_backends():
+    """当前环境可用的解析后端名称列表"""
+    names = [SoupParserBackend.name, StreamingParserBackend.name]
+    if etree is not None:
+        names.append(LxmlParserBackend.name)
+    return names
+
+
+def get_parser_backend(name=None):
+    """
+    获取解析后端实例
+
+    Args:
+        name (str): 后端名称，默认优先使用 lxml
+
+    Returns:
+        解析后端实例；所需依赖未安装时回退到 html.parser
+    """
+    name = name or DEFAULT_PARSER_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"未知的解析后端: {name}，可选: {', '.join(PARSER_BACKENDS)}")
+    try:
+        return PARSER_BACKENDS[name]()
+    except ImportError:
+        return SoupParserBackend()
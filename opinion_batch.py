@@ -0,0 +1,173 @@
+"""
+批量舆情分析 - 在分词进程池中对多篇文档执行关键词提取和情感打分
+"""
+from concurrent.futures.process import BrokenProcessPool
+
+import jieba
+
+from analysis_cache import content_key
+from sentiment_scorer import DEFAULT_LEXICON_DIR, SentimentScorer
+from tokenizer_pool import extract_tags
+
+
+# 工作进程内的情感打分器，由 init_worker 创建
+_worker_scorer = None
+
+
+def init_worker(lexicon_dir=DEFAULT_LEXICON_DIR):
+    """工作进程初始化：加载 jieba 词典、IDF 表和情感词典，避免首个任务承担加载耗时"""
+    global _worker_scorer
+    # IDF 表在导入 jieba.analyse 时已加载，这里构建分词前缀词典
+    jieba.initialize()
+    _worker_scorer = SentimentScorer.from_directory(lexicon_dir)
+
+
+def analyze_text(content, top_k=10, scorer=None, idf_path=None):
+    """
+    分析单篇文档
+
+    Args:
+        content (str): 文档内容
+        top_k (int): 提取的关键词数量
+        scorer (SentimentScorer): 情感打分器，为空时使用工作进程内的实例
+        idf_path (str): 语料 IDF 文件，为空时使用 jieba 自带的 IDF
+
+    Returns:
+        dict: keywords、sentiment、sentiment_score
+    """
+    scorer = scorer or _worker_scorer
+    if scorer is None:
+        init_worker()
+        scorer = _worker_scorer
+    keywords = extract_tags(content, top_k, True, idf_path)
+    scores = scorer.score(content)
+    return {
+        'keywords': keywords,
+        'sentiment': scores['label'],
+        'sentiment_score': scores
+    }
+
+
+def analyze_chunk(chunk, top_k=10, scorer=None, idf_path=None):
+    """
+    分析一组文档，单篇出错不影响其他文档
+
+    Args:
+        chunk (list): (序号, 内容) 列表
+
+    Returns:
+        list: 与 chunk 顺序一致的结果，出错的文档只包含 index 和 error
+    """
+    results = []
+    for index, content in chunk:
+        try:
+            results.append(dict(analyze_text(content, top_k, scorer, idf_path), index=index))
+        except Exception as e:
+            results.append({'index': index, 'error': f'分析失败: {e}'})
+    return results
+
+
+def normalize_documents(documents):
+    """
+    统一文档格式
+
+    Args:
+        documents (list): 字符串，或包含 content（可选 id）的字典
+
+    Returns:
+        tuple: (待分析的 (序号, 内容) 列表, 序号 -> 结果 的预置结果字典)
+    """
+    pending = []
+    prefilled = {}
+    for index, document in enumerate(documents):
+        doc_id = None
+        if isinstance(document, dict):
+            doc_id = document.get('id')
+            content = document.get('content')
+        else:
+            content = document
+        if not isinstance(content, str) or not content.strip():
+            prefilled[index] = {'index': index, 'error': '内容不能为空'}
+        else:
+            pending.append((index, content))
+        if doc_id is not None:
+            prefilled.setdefault(index, {})['id'] = doc_id
+    return pending, prefilled
+
+
+def lookup_cached(pending, prefilled, cache, version, top_k):
+    """
+    从分析结果缓存中读取已分析过的文档，相同内容只分析一次
+
+    Returns:
+        tuple: (仍需分析的 (序号, 内容) 列表, 缓存键 -> 相同内容的全部序号)
+    """
+    remaining = []
+    indexes_by_key = {}
+    for index, content in pending:
+        key = content_key(content, version, top_k)
+        if key in indexes_by_key:
+            indexes_by_key[key].append(index)
+            continue
+        cached = cache.get(key)
+        if cached is not None:
+            prefilled[index] = dict(prefilled.get(index, {}), **cached, index=index)
+            continue
+        indexes_by_key[key] = [index]
+        remaining.append((index, content))
+    return remaining, indexes_by_key
+
+
+def analyze_documents(documents, top_k=10, pool=None, scorer=None, chunk_size=16, idf_path=None,
+                      cache=None, cache_version=None):
+    """
+    批量分析文档
+
+    Args:
+        documents (list): 字符串，或包含 content（可选 id）的字典
+        top_k (int): 每篇文档提取的关键词数量
+        pool (TokenizerPool): 分词进程池，为空或输入总字数不超过其 inline_threshold 时在当前进程中分析
+        scorer (SentimentScorer): 当前进程内分析时使用的情感打分器
+        chunk_size (int): 每个任务包含的文档数量
+        idf_path (str): 语料 IDF 文件，为空时使用 jieba 自带的 IDF
+        cache (AnalysisCache): 可选的分析结果缓存，命中的文档不再分析
+        cache_version (str): 分析器版本，参与缓存键的计算
+
+    Returns:
+        list: 与输入顺序一致的结果，每项包含 index，成功时包含 keywords、sentiment、
+              sentiment_score，失败时包含 error
+    """
+    pending, prefilled = normalize_documents(documents)
+    indexes_by_key = {}
+    if cache is not None:
+        pending, indexes_by_key = lookup_cached(pending, prefilled, cache, cache_version, top_k)
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    total_chars = sum(len(content) for _, content in pending)
+
+    analyzed = []
+    if pool is not None and chunks and total_chars > pool.inline_threshold:
+        try:
+            futures = [pool.submit(analyze_chunk, chunk, top_k, None, idf_path, docs=len(chunk),
+                                   chars=sum(len(content) for _, content in chunk))
+                       for chunk in chunks]
+            for future in futures:
+                analyzed.extend(future.result(timeout=pool.timeout))
+            chunks = []
+        except BrokenProcessPool as e:
+            print(f"分析进程池不可用，改为在当前进程中分析: {e}")
+            done = {item['index'] for item in analyzed}
+            chunks = [[doc for doc in chunk if doc[0] not in done] for chunk in chunks]
+    for chunk in chunks:
+        analyzed.extend(analyze_chunk(chunk, top_k, scorer, idf_path))
+
+    for item in analyzed:
+        prefilled[item['index']] = dict(prefilled.get(item['index'], {}), **item)
+    for key, indexes in indexes_by_key.items():
+        result = prefilled[indexes[0]]
+        if 'error' in result:
+            continue
+        value = {name: result[name] for name in ('keywords', 'sentiment', 'sentiment_score')}
+        cache.set(key, value)
+        for index in indexes[1:]:
+            prefilled[index] = dict(prefilled.get(index, {}), **value, index=index)
+    return [prefilled[index] for index in range(len(documents))]
@@ -0,0 +1,93 @@
+"""
+SQL 语句统计 - 按请求（或任意代码块）统计执行的 SQL 语句数和耗时，用于发现 N+1 查询
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# 当前上下文的统计对象，没有开始统计时为 None（后台线程等不计入）
+_current = ContextVar('query_stats', default=None)
+
+
+class QueryStats:
+    """一段代码执行的 SQL 语句统计"""
+
+    def __init__(self, keep_statements=False):
+        """
+        Args:
+            keep_statements (bool): 是否保留每条语句及其耗时（测试和调试时使用）
+        """
+        self.count = 0
+        self.elapsed = 0.0
+        self.keep_statements = keep_statements
+        self.statements = []
+
+    def record(self, statement, elapsed):
+        """记录一条语句"""
+        self.count += 1
+        self.elapsed += elapsed
+        if self.keep_statements:
+            self.statements.append((statement, elapsed))
+
+    def to_dict(self):
+        """转换为字典"""
+        return {'count': self.count, 'elapsed_ms': round(self.elapsed * 1000, 3)}
+
+
+def track(engine):
+    """为引擎注册语句计时事件（同一引擎重复调用不会重复注册）"""
+    if event.contains(engine, 'before_cursor_execute', _before_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_execute)
+    event.listen(engine, 'after_cursor_execute', _after_execute)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_started'].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def start(keep_statements=False):
+    """
+    在当前上下文开始统计
+
+    Returns:
+        tuple: (统计对象, 用于 stop 的令牌)
+    """
+    stats = QueryStats(keep_statements)
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    """结束统计，恢复之前的统计对象"""
+    _current.reset(token)
+
+
+def current():
+    """当前上下文的统计对象，没有开始统计时返回 None"""
+    return _current.get()
+
+
+@contextmanager
+def count_queries(keep_statements=True):
+    """
+    统计代码块执行的 SQL 语句
+
+    用法:
+        with count_queries() as stats:
+            ...
+        assert stats.count <= 2
+    """
+    stats, token = start(keep_statements)
+    try:
+        yield stats
+    finally:
+        stop(token)
@@ -0,0 +1,240 @@
+"""
+数据源限流 - 按主机的令牌桶限速、根据响应信号自适应调整速率与熔断
+"""
+import re
+import threading
+import time
+
+
+# 表示被限流的状态码
+THROTTLE_STATUS_CODES = (403, 429, 503)
+
+# 跳转到验证页面的地址特征
+VERIFY_URL_RE = re.compile(r'wappass\.baidu\.com|/captcha|/verify|antispider', re.I)
+
+# 验证页面的标题特征（如 debug_西昌_raw.html 中的“百度安全验证”）
+VERIFY_TITLE_RE = re.compile(r'<title>\s*[^<]*(安全验证|验证码|captcha)[^<]*</title>', re.I)
+
+
+class SourceBlockedError(Exception):
+    """数据源处于熔断状态，请求被直接跳过"""
+
+
+class RateLimitTimeout(Exception):
+    """在超时时间内无法获得请求令牌"""
+
+
+def classify_response(status_code, url='', history_urls=(), body=b'', min_body_size=2048):
+    """
+    根据响应判断数据源状态
+
+    Args:
+        status_code (int): 状态码
+        url (str): 最终地址
+        history_urls (iterable): 跳转经过的地址
+        body (bytes): 页面内容
+        min_body_size (int): 正常结果页的最小字节数
+
+    Returns:
+        str: ok 正常；throttled 被限流；blocked 被要求验证；suspicious 内容异常短小
+    """
+    if status_code in THROTTLE_STATUS_CODES:
+        return 'throttled'
+    if any(VERIFY_URL_RE.search(u or '') for u in (url, *history_urls)):
+        return 'blocked'
+    if status_code == 304:
+        return 'ok'
+    head = body[:4096].decode('utf-8', errors='ignore') if body else ''
+    if VERIFY_TITLE_RE.search(head):
+        return 'blocked'
+    if status_code == 200 and len(body or b'') < min_body_size:
+        return 'suspicious'
+    return 'ok'
+
+
+class HostLimiter:
+    """单个主机的令牌桶与熔断状态
+
+    速率采用“加性增、乘性减”：每次正常响应速率增加 increase_step，
+    被限流或要求验证时速率乘以 decrease_factor。连续失败达到阈值后熔断，
+    冷却期内的请求直接跳过；冷却结束后放行一个探测请求（半开），
+    探测成功则恢复，失败则以加倍的冷却时间再次熔断。
+    """
+
+    def __init__(self, rate=1.0, capacity=3, min_rate=0.05, max_rate=None,
+                 increase_step=0.05, decrease_factor=0.5,
+                 failure_threshold=3, cooldown=60, max_cooldown=900):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.cooldown = cooldown
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.last_signal = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, timeout):
+        """
+        预约一个请求令牌
+
+        Returns:
+            float: 需要等待的秒数
+
+        Raises:
+            SourceBlockedError: 处于熔断状态
+            RateLimitTimeout: 等待时间超过 timeout
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == 'open':
+                if now < self.open_until:
+                    raise SourceBlockedError(f'数据源熔断中，{self.open_until - now:.0f} 秒后重试')
+                self.state = 'half_open'
+            if self.state == 'half_open':
+                if self.probe_in_flight:
+                    raise SourceBlockedError('数据源熔断探测中')
+                self.probe_in_flight = True
+
+            self._refill(now)
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait > timeout:
+                self.probe_in_flight = False
+                raise RateLimitTimeout(f'等待请求令牌需要 {wait:.1f} 秒，超过 {timeout} 秒')
+            # 令牌可以透支，后续请求按顺序排队
+            self.tokens -= 1
+            return wait
+
+    def record(self, signal):
+        """
+        记录一次请求结果
+
+        Args:
+            signal (str): ok / throttled / blocked / suspicious / error
+        """
+        with self._lock:
+            self.last_signal = signal
+            self.probe_in_flight = False
+            if signal == 'ok':
+                self.consecutive_failures = 0
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                if self.state != 'closed':
+                    self.state = 'closed'
+                    self.cooldown = self.base_cooldown
+                return
+
+            if signal in ('throttled', 'blocked'):
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.consecutive_failures += 1
+            # 要求验证时立即熔断，其余情况连续失败达到阈值后熔断
+            if self.state == 'half_open' or signal == 'blocked' or \
+                    self.consecutive_failures >= self.failure_threshold:
+                if self.state == 'half_open':
+                    self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self.state = 'open'
+                self.open_until = time.monotonic() + self.cooldown
+
+    def snapshot(self):
+        """当前状态"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'rate': round(self.rate, 4),
+                'tokens': round(self.tokens, 2),
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in': round(max(0.0, self.open_until - time.monotonic()), 1) if self.state == 'open' else 0,
+                'last_signal': self.last_signal
+            }
+
+
+class HostRateLimiter:
+    """按数据源主机管理令牌桶与熔断状态（线程安全，可在多个抓取器之间共享）"""
+
+    def __init__(self, rate=1.0, capacity=3, min_rate=0.05, failure_threshold=3,
+                 cooldown=60, max_cooldown=900, min_body_size=2048):
+        """
+        初始化限流器
+
+        Args:
+            rate (float): 每个主机的初始（也是最大）请求速率（次/秒）
+            capacity (int): 令牌桶容量，允许的突发请求数
+            min_rate (float): 自适应降速的下限（次/秒）
+            failure_threshold (int): 连续失败多少次后熔断
+            cooldown (float): 首次熔断的冷却时间（秒）
+            max_cooldown (float): 冷却时间上限（秒）
+            min_body_size (int): 正常结果页的最小字节数，更小的页面视为异常
+        """
+        self.options = {
+            'rate': rate,
+            'capacity': capacity,
+            'min_rate': min_rate,
+            'failure_threshold': failure_threshold,
+            'cooldown': cooldown,
+            'max_cooldown': max_cooldown
+        }
+        self.min_body_size = min_body_size
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        """获取主机对应的限流状态"""
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = HostLimiter(**self.options)
+                self._hosts[host] = limiter
+            return limiter
+
+    def acquire(self, host, timeout=10):
+        """
+        等待主机的请求令牌
+
+        Raises:
+            SourceBlockedError: 数据源处于熔断状态
+            RateLimitTimeout: 在 timeout 秒内无法获得令牌
+        """
+        wait = self.get(host).reserve(timeout)
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, host, signal):
+        """记录请求结果信号"""
+        self.get(host).record(signal)
+
+    def inspect(self, host, response, body=b''):
+        """
+        根据响应判断数据源状态并记录
+
+        Returns:
+            str: 响应信号，见 classify_response
+        """
+        signal = classify_response(
+            response.status_code,
+            getattr(response, 'url', ''),
+            [r.headers.get('Location', '') for r in getattr(response, 'history', ())] +
+            [getattr(r, 'url', '') for r in getattr(response, 'history', ())],
+            body,
+            self.min_body_size
+        )
+        self.record(host, signal)
+        return signal
+
+    def status(self):
+        """各主机的限流状态"""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: limiter.snapshot() for host, limiter in hosts.items()}
@@ -0,0 +1,194 @@
+"""
+汇总舆情报告 - 按批次流式分析多篇文章，汇总情感分布、热点关键词、话题聚类和代表性摘录
+"""
+import heapq
+from collections import Counter, defaultdict
+
+from bulk_analysis import analyze_frame
+from sentiment_scorer import SentimentScorer
+from topic_clustering import TopicModel
+
+SENTIMENT_NAMES = {'positive': '积极', 'negative': '消极', 'neutral': '中性'}
+
+# 未能归入聚类的文章（无有效词语等）所在的话题编号
+OTHER_CLUSTER = -1
+
+
+class ReportBuilder:
+    """汇总报告生成器
+
+    每批文章只在分析期间驻留内存：累计情感计数、关键词权重和来源分布，
+    同时增量更新话题聚类，每个话题只保留距离聚类中心最近的若干篇文章作为摘录。
+    """
+
+    def __init__(self, total, scorer=None, top_k=10, n_clusters=5, excerpts=3, pool=None, idf_path=None,
+                 excerpt_length=80):
+        """
+        初始化报告生成器
+
+        Args:
+            total (int): 文章总数，话题数不超过文章数
+            scorer (SentimentScorer): 情感打分器，为空时加载默认词典
+            top_k (int): 报告中的热点关键词数量（每篇文章同样提取 top_k 个关键词）
+            n_clusters (int): 话题数量
+            excerpts (int): 每个话题的代表性摘录数量
+            pool (TokenizerPool): 可选的分词进程池，用于关键词提取
+            idf_path (str): 语料 IDF 文件，为空时使用 jieba 自带的 IDF
+            excerpt_length (int): 摘录的最大字数
+        """
+        self.total = total
+        self.scorer = scorer or SentimentScorer.from_directory()
+        self.top_k = top_k
+        self.excerpts = excerpts
+        self.pool = pool
+        self.idf_path = idf_path
+        self.excerpt_length = excerpt_length
+        self.model = TopicModel(n_clusters=max(1, min(n_clusters, total)), n_features=2 ** 14,
+                                decay=1.0, keywords_per_topic=5)
+
+        self.processed = 0
+        self.score_sum = 0.0
+        self.sentiments = Counter()
+        self.keyword_weights = Counter()
+        self.sources = Counter()
+        self.cluster_sentiments = defaultdict(Counter)
+        self._candidates = defaultdict(list)
+        # 已分析、尚未得到话题编号的文章（聚类模型凑够首批文档前暂存）
+        self._unassigned = {}
+
+    def add_batch(self, frame):
+        """
+        分析一批文章
+
+        Args:
+            frame (DataFrame): 以文章 id 为索引，包含 title、summary、source、url 列
+        """
+        if frame.empty:
+            return
+        frame = frame.assign(**{name: frame[name].fillna('') for name in ('title', 'summary', 'source', 'url')})
+        frame = frame.assign(text=frame['title'] + '。' + frame['summary'])
+        analyzed = analyze_frame(frame, column='text', top_k=self.top_k, scorer=self.scorer,
+                                 chunk_size=len(frame), pool=self.pool, idf_path=self.idf_path)
+        for row in analyzed.itertuples():
+            self.sentiments[row.sentiment] += 1
+            self.score_sum += row.score
+            self.sources[row.source or '未知'] += 1
+            for word, weight in row.keywords:
+                self.keyword_weights[word] += weight
+            self._unassigned[row.Index] = (row.title, row.summary, row.url, row.sentiment)
+
+        items = list(zip(frame.index, frame['text']))
+        for key, label, distance in self.model.partial_fit(items, with_distance=True):
+            self._assign(key, label, distance)
+        self.processed += len(frame)
+
+    def _assign(self, key, label, distance):
+        title, summary, url, sentiment = self._unassigned.pop(key)
+        self.cluster_sentiments[label][sentiment] += 1
+        # 以负距离入堆，堆顶为当前保留的最远文章
+        heap = self._candidates[label]
+        item = (-distance, key, title, summary, url)
+        if len(heap) < self.excerpts:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def top_keywords(self):
+        """热点关键词：按各文章中关键词权重之和排序的 (词语, 权重) 列表"""
+        return [(word, round(weight, 4)) for word, weight in self.keyword_weights.most_common(self.top_k)]
+
+    def _flush(self):
+        """有效文章少于话题数、聚类模型始终未拟合时，按实际文章数重新设定话题数并拟合"""
+        pending = self.model.pending
+        if self.model.fitted or not pending:
+            return
+        model = TopicModel(n_clusters=len(pending), n_features=self.model.hasher.n_features,
+                           decay=1.0, keywords_per_topic=5)
+        model.pending = pending
+        self.model = model
+        for key, label, distance in model.partial_fit([], with_distance=True):
+            self._assign(key, label, distance)
+
+    def clusters(self):
+        """
+        话题列表（按文章数排序）
+
+        Returns:
+            list: 每个话题包含 keywords、size、sentiments、excerpts
+        """
+        self._flush()
+        for key in list(self._unassigned):
+            self._assign(key, OTHER_CLUSTER, 0.0)
+        keywords = {topic['cluster_id']: topic['keywords'] for topic in self.model.topics()}
+        result = []
+        for label, sentiments in self.cluster_sentiments.items():
+            excerpts = sorted(self._candidates[label], reverse=True)
+            result.append({
+                'cluster_id': label,
+                'keywords': keywords.get(label, []),
+                'size': sum(sentiments.values()),
+                'sentiments': dict(sentiments),
+                'excerpts': [{'id': int(key), 'title': title, 'summary': summary[:self.excerpt_length], 'url': url}
+                             for _, key, title, summary, url in excerpts]
+            })
+        result.sort(key=lambda item: (item['cluster_id'] == OTHER_CLUSTER, -item['size']))
+        return result
+
+    def build(self, title, description=''):
+        """
+        生成报告
+
+        Args:
+            title (str): 报告标题
+            description (str): 报告范围说明，如关键词和日期范围
+
+        Returns:
+            dict: title、content、keywords、sentiment 以及 stats（情感分布、来源、话题）
+        """
+        clusters = self.clusters()
+        keywords = self.top_keywords()
+        sentiment = SentimentScorer.label(round(self.score_sum, 4))
+        stats = {
+            'articles': self.processed,
+            'sentiments': {name: self.sentiments.get(name, 0) for name in SENTIMENT_NAMES},
+            'source_count': len(self.sources),
+            'sources': self.sources.most_common(10),
+            'clusters': clusters
+        }
+        return {
+            'title': title,
+            'content': format_report(description, stats, keywords),
+            'keywords': keywords,
+            'sentiment': sentiment,
+            'stats': stats
+        }
+
+
+def format_report(description, stats, keywords):
+    """把汇总结果整理为报告正文"""
+    total = stats['articles']
+    lines = [f"【概况】{description}共分析文章 {total} 篇，来自 {stats['source_count']} 个来源。", '']
+
+    lines.append('【情感分布】')
+    for name, label in SENTIMENT_NAMES.items():
+        count = stats['sentiments'][name]
+        ratio = count / total * 100 if total else 0
+        lines.append(f'{label}：{count} 篇（{ratio:.1f}%）')
+    lines.append('')
+
+    lines.append('【热点关键词】')
+    lines.append('、'.join(word for word, _ in keywords) or '无')
+    lines.append('')
+
+    lines.append('【主要话题】')
+    for i, cluster in enumerate(stats['clusters'], 1):
+        name = '其他' if cluster['cluster_id'] == OTHER_CLUSTER else '、'.join(cluster['keywords']) or '未命名话题'
+        negative = cluster['sentiments'].get('negative', 0)
+        lines.append(f"{i}. {name}（{cluster['size']} 篇，消极 {negative} 篇）")
+        for excerpt in cluster['excerpts']:
+            lines.append(f"   - {excerpt['title']}：{excerpt['summary']}")
+    lines.append('')
+
+    lines.append('【主要来源】')
+    lines.append('、'.join(f'{source}（{count}）' for source, count in stats['sources']) or '无')
+    return '\n'.join(lines)
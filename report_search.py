@@ -0,0 +1,183 @@
+"""
+报告全文检索 - 基于 SQLite FTS5 的倒排索引，写入前用 jieba 分词，支持中文查询、相关度排序、高亮和分页
+"""
+import html
+import re
+
+import jieba
+from sqlalchemy import text
+
+# FTS5 表名，rowid 与报告 id 一致
+FTS_TABLE = 'report_fts'
+REPORT_TABLE = 'public_opinion_report'
+
+# 分词结果之间的分隔符（不可见分隔符 U+2063），声明为 FTS5 分隔字符。
+# 去掉该字符即可还原原文，高亮和摘要因此可以直接显示。
+TOKEN_SEPARATOR = '\u2063'
+
+WORD_RE = re.compile(r'\w', re.UNICODE)
+
+# title、content 为分词后的原文；title_terms、content_terms 为搜索引擎模式额外切出的短词，
+# 与所属字段使用相同的排序权重
+CREATE_SQL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    'title, content, title_terms, content_terms, '
+    f"tokenize = \"unicode61 separators '{TOKEN_SEPARATOR}'\")"
+)
+
+
+def segment(value):
+    """
+    按 jieba 精确模式分词，词语之间插入分隔符（保留全部原始字符）
+
+    Returns:
+        str: 分词后的文本
+    """
+    return TOKEN_SEPARATOR.join(jieba.cut(value or ''))
+
+
+def search_terms(value):
+    """
+    搜索引擎模式下额外切出的短词（如“西昌市”中的“西昌”），只用于检索，不用于显示
+
+    Returns:
+        str: 以分隔符连接的短词
+    """
+    precise = set(jieba.cut(value or ''))
+    extra = {word for word in jieba.cut_for_search(value or '')
+             if word not in precise and WORD_RE.search(word)}
+    return TOKEN_SEPARATOR.join(sorted(extra))
+
+
+def desegment(value):
+    """去掉分隔符，还原原文"""
+    return (value or '').replace(TOKEN_SEPARATOR, '')
+
+
+def query_words(query):
+    """用户输入按搜索引擎模式切分出的检索词（小写、去重）"""
+    words = []
+    for word in jieba.cut_for_search(query or ''):
+        word = word.strip().lower()
+        if word and WORD_RE.search(word) and word not in words:
+            words.append(word)
+    return words
+
+
+def build_match_query(query):
+    """
+    把用户输入转换为 FTS5 查询：所有检索词都需出现（AND）
+
+    Returns:
+        str: FTS5 MATCH 表达式，没有有效词语时返回空字符串
+    """
+    return ' '.join('"{}"'.format(word.replace('"', '""')) for word in query_words(query))
+
+
+def render_highlight(value, words):
+    """
+    还原原文、转义 HTML，并用 <mark> 标签标出检索词
+
+    检索词可能只是索引中某个词语的一部分（由短词字段命中），因此在原文上按字符串
+    匹配高亮，较长的词语优先。
+    """
+    value = desegment(value)
+    if not words:
+        return html.escape(value)
+    pattern = '({})'.format('|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True)))
+    # split 的结果交替为 未命中片段、检索词
+    pieces = re.split(pattern, value, flags=re.IGNORECASE)
+    return ''.join(f'<mark>{html.escape(piece)}</mark>' if i % 2 else html.escape(piece)
+                   for i, piece in enumerate(pieces))
+
+
+def create_index(connection):
+    """创建 FTS5 表"""
+    connection.execute(text(CREATE_SQL))
+
+
+def prepare_rows(rows):
+    """
+    分词生成索引行（耗时部分，可在分词进程池中执行）
+
+    Args:
+        rows (list): (报告 id, 标题, 正文) 列表
+
+    Returns:
+        list: 写入 FTS5 表的参数字典
+    """
+    return [{'id': report_id, 'title': segment(title), 'content': segment(content),
+             'title_terms': search_terms(title), 'content_terms': search_terms(content)}
+            for report_id, title, content in rows]
+
+
+def write_rows(connection, params):
+    """写入（或覆盖）已分词的索引行"""
+    if not params:
+        return
+    remove_rows(connection, [item['id'] for item in params])
+    connection.execute(
+        text(f'INSERT INTO {FTS_TABLE} (rowid, title, content, title_terms, content_terms) '
+             'VALUES (:id, :title, :content, :title_terms, :content_terms)'),
+        params
+    )
+
+
+def index_rows(connection, rows):
+    """
+    写入（或覆盖）报告的索引
+
+    Args:
+        connection: SQLAlchemy 连接
+        rows (list): (报告 id, 标题, 正文) 列表
+    """
+    write_rows(connection, prepare_rows(rows))
+
+
+def remove_rows(connection, ids):
+    """删除报告的索引"""
+    if ids:
+        connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), [{'id': i} for i in ids])
+
+
+def search(connection, query, page=1, per_page=20, snippet_tokens=32, sentiment=None):
+    """
+    检索报告
+
+    Args:
+        connection: SQLAlchemy 连接
+        query (str): 用户输入的查询
+        page (int): 页码（从 1 开始）
+        per_page (int): 每页条数
+        snippet_tokens (int): 摘要包含的最多词语数（FTS5 上限 64）
+        sentiment (str): 可选，只返回该情感倾向的报告
+
+    Returns:
+        dict: total 为匹配总数，items 为 id、title（高亮 HTML）、snippet（高亮 HTML）、rank
+              （bm25 得分，越小越相关；标题命中的权重是正文的 10 倍）
+    """
+    words = query_words(query)
+    if not words:
+        return {'total': 0, 'items': []}
+    params = {'match': build_match_query(query), 'sentiment': sentiment}
+    where = f'{FTS_TABLE} MATCH :match'
+    if sentiment:
+        # 按命中行逐条用主键查找报告（IN 子查询会先扫描整个报告表）
+        where += (f' AND EXISTS (SELECT 1 FROM {REPORT_TABLE} r WHERE r.id = {FTS_TABLE}.rowid'
+                  ' AND r.sentiment = :sentiment)')
+    total = connection.execute(text(f'SELECT count(*) FROM {FTS_TABLE} WHERE {where}'), params).scalar()
+    rows = connection.execute(
+        text(
+            f"SELECT rowid, title, snippet({FTS_TABLE}, 1, '', '', '…', :tokens), "
+            f'bm25({FTS_TABLE}, 10.0, 1.0, 10.0, 1.0) AS rank '
+            f'FROM {FTS_TABLE} WHERE {where} '
+            'ORDER BY rank LIMIT :limit OFFSET :offset'
+        ),
+        dict(params, tokens=min(snippet_tokens, 64), limit=per_page, offset=(max(page, 1) - 1) * per_page)
+    ).all()
+    return {
+        'total': total,
+        'items': [{'id': row[0], 'title': render_highlight(row[1], words),
+                   'snippet': render_highlight(row[2], words), 'rank': round(row[3], 4)}
+                  for row in rows]
+    }
@@ -0,0 +1,128 @@
+"""
+已抓取文章记录 - 基于 SQLite 的 URL 去重存储，支持增量抓取和游标读取
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+class SeenUrlStore:
+    """已抓取文章的持久化记录
+
+    每篇文章按 URL（没有 URL 时按标题）去重，首次出现时分配自增 id，
+    该 id 同时作为增量读取的游标（since）。
+    """
+
+    def __init__(self, db_path):
+        """
+        初始化存储
+
+        Args:
+            db_path (str): SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen_article ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'url_hash TEXT NOT NULL UNIQUE, '
+            'url TEXT, '
+            'keyword TEXT, '
+            'data TEXT NOT NULL, '
+            'first_seen REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS ix_seen_article_keyword_id ON seen_article (keyword, id)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def item_key(item):
+        """文章去重键：优先使用 URL，没有 URL 时使用标题"""
+        identity = item.get('url') or f"title:{item.get('title', '')}"
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def filter_unseen(self, items):
+        """返回尚未记录过的文章（不写入记录）"""
+        keys = [self.item_key(item) for item in items]
+        if not keys:
+            return []
+        with self._lock:
+            placeholders = ','.join('?' * len(keys))
+            seen = {row[0] for row in self._conn.execute(
+                f'SELECT url_hash FROM seen_article WHERE url_hash IN ({placeholders})', keys
+            )}
+        return [item for item, key in zip(items, keys) if key not in seen]
+
+    def record(self, keyword, items):
+        """
+        记录一批文章，返回其中首次出现的文章
+
+        Args:
+            keyword (str): 抓取关键词
+            items (list): 新闻数据列表
+
+        Returns:
+            list: 首次出现的文章（副本），带有 seen_id 游标字段
+        """
+        new_items = []
+        now = time.time()
+        with self._lock:
+            for item in items:
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO seen_article (url_hash, url, keyword, data, first_seen) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (self.item_key(item), item.get('url'), keyword,
+                     json.dumps(item, ensure_ascii=False), now)
+                )
+                if cursor.rowcount:
+                    new_items.append(dict(item, seen_id=cursor.lastrowid))
+            self._conn.commit()
+        return new_items
+
+    def items_since(self, since, keyword=None, limit=100):
+        """
+        按游标读取首次出现时间晚于 since 的文章
+
+        Args:
+            since (int): 游标，只返回 seen_id 大于该值的文章
+            keyword (str): 只返回该关键词首次抓取到的文章，为空时不限
+            limit (int): 最大返回数量
+
+        Returns:
+            list: 新闻数据列表，按 seen_id 升序，带有 seen_id 字段
+        """
+        sql = 'SELECT id, data FROM seen_article WHERE id > ?'
+        params = [since]
+        if keyword is not None:
+            sql += ' AND keyword = ?'
+            params.append(keyword)
+        sql += ' ORDER BY id LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(json.loads(data), seen_id=row_id) for row_id, data in rows]
+
+    def latest_cursor(self, keyword=None):
+        """当前最新游标"""
+        with self._lock:
+            if keyword is None:
+                row = self._conn.execute('SELECT MAX(id) FROM seen_article').fetchone()
+            else:
+                row = self._conn.execute(
+                    'SELECT MAX(id) FROM seen_article WHERE keyword = ?', (keyword,)
+                ).fetchone()
+        return row[0] or 0
+
+    def count(self):
+        """已记录的文章数量"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM seen_article').fetchone()[0]
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
@@ -0,0 +1,241 @@
+"""
+情感打分 - 基于 Aho-Corasick 自动机的多模式词典匹配，支持外部词典、否定词与程度副词
+"""
+import os
+import re
+from collections import Counter, deque
+
+
+# 默认词典目录
+DEFAULT_LEXICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexicons')
+
+# 分句标点：否定词和程度副词不跨分句修饰情感词
+CLAUSE_RE = re.compile(r'[，。！？；、,.!?;\n]')
+
+# 词语类型
+SENTIMENT = 'sentiment'
+NEGATION = 'negation'
+DEGREE = 'degree'
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配自动机
+
+    构建后对文本只做一次扫描即可找出全部词典词语的出现位置，
+    耗时与文本长度和命中数量成正比，与词典大小无关。
+    """
+
+    def __init__(self, patterns):
+        """
+        构建自动机
+
+        Args:
+            patterns (dict): 词语 -> 任意附加数据
+        """
+        self.patterns = {}
+        # 状态 0 为根节点
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for pattern, payload in patterns.items():
+            if pattern:
+                self.add(pattern, payload)
+        self._build()
+
+    def add(self, pattern, payload):
+        """加入一个词语（仅在构建阶段调用）"""
+        self.patterns[pattern] = payload
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern)
+
+    def _build(self):
+        """按广度优先计算失配指针，并合并失配链上的输出"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """
+        扫描文本
+
+        Yields:
+            tuple: (起始位置, 结束位置, 词语)
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in output[state]:
+                yield i + 1 - len(pattern), i + 1, pattern
+
+    def __len__(self):
+        return len(self.patterns)
+
+
+def load_lexicon(path, default_weight=1.0):
+    """
+    读取词典文件
+
+    每行一个词语，可用制表符或空格分隔权重；# 开头的行为注释。
+
+    Args:
+        path (str): 词典文件路径
+        default_weight (float): 没有写权重时的默认值
+
+    Returns:
+        dict: 词语 -> 权重
+    """
+    lexicon = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            try:
+                lexicon[parts[0]] = float(parts[1]) if len(parts) > 1 else default_weight
+            except ValueError:
+                print(f"词典 {path} 中的权重格式错误: {line}")
+    return lexicon
+
+
+class SentimentScorer:
+    """词典情感打分器
+
+    情感词权重为正表示积极、为负表示消极，权重为 0 的词语用于屏蔽误匹配
+    （如“不断”中的“不”）。否定词翻转其后情感词的方向，程度副词按倍数放大或减弱，
+    二者只修饰同一分句内、距离不超过 window 个字符的情感词。
+    """
+
+    def __init__(self, sentiment_words, negation_words=(), degree_words=None, window=6):
+        """
+        初始化打分器
+
+        Args:
+            sentiment_words (dict): 情感词 -> 权重
+            negation_words (iterable): 否定词
+            degree_words (dict): 程度副词 -> 倍数
+            window (int): 修饰词与情感词之间的最大距离（字符）
+        """
+        patterns = {}
+        for word in negation_words:
+            patterns[word] = (NEGATION, -1.0)
+        for word, multiplier in (degree_words or {}).items():
+            patterns[word] = (DEGREE, multiplier)
+        # 同一词语同时出现在多个词典时以情感词典为准
+        for word, weight in sentiment_words.items():
+            patterns[word] = (SENTIMENT, weight)
+        self.automaton = AhoCorasick(patterns)
+        self.window = window
+
+    @classmethod
+    def from_directory(cls, lexicon_dir=DEFAULT_LEXICON_DIR, window=6):
+        """
+        从词典目录加载
+
+        目录中 sentiment.txt 为情感词典（必需），negation.txt 为否定词，degree.txt 为程度副词。
+        """
+        sentiment_words = load_lexicon(os.path.join(lexicon_dir, 'sentiment.txt'))
+        negation_path = os.path.join(lexicon_dir, 'negation.txt')
+        degree_path = os.path.join(lexicon_dir, 'degree.txt')
+        negation_words = load_lexicon(negation_path) if os.path.exists(negation_path) else {}
+        degree_words = load_lexicon(degree_path) if os.path.exists(degree_path) else {}
+        return cls(sentiment_words, negation_words, degree_words, window=window)
+
+    def _longest_matches(self, text):
+        """从左到右取最长且互不重叠的匹配"""
+        best = {}
+        for start, end, word in self.automaton.iter_matches(text):
+            if start not in best or end > best[start][0]:
+                best[start] = (end, word)
+        matches = []
+        covered = 0
+        for start in sorted(best):
+            if start >= covered:
+                end, word = best[start]
+                matches.append((start, end, word))
+                covered = end
+        return matches
+
+    def score(self, text):
+        """
+        计算情感得分
+
+        Args:
+            text (str): 待分析文本
+
+        Returns:
+            dict: score 为加权总分，positive/negative 为积极/消极部分的得分（均为非负），
+                  positive_hits/negative_hits 为命中次数，hits 为各情感词的命中次数，
+                  label 为由得分推导的 positive/negative/neutral
+        """
+        text = text or ''
+        patterns = self.automaton.patterns
+        positive = negative = 0.0
+        positive_hits = negative_hits = 0
+        hits = Counter()
+        modifiers = []
+
+        for start, end, word in self._longest_matches(text):
+            kind, value = patterns[word]
+            if kind != SENTIMENT:
+                modifiers.append((end, kind, value))
+                continue
+            if value == 0:
+                modifiers = []
+                continue
+
+            weight = value
+            for mod_end, kind, mod_value in modifiers:
+                if start - mod_end > self.window or CLAUSE_RE.search(text, mod_end, start):
+                    continue
+                weight *= mod_value
+            modifiers = []
+
+            hits[word] += 1
+            if weight > 0:
+                positive += weight
+                positive_hits += 1
+            elif weight < 0:
+                negative -= weight
+                negative_hits += 1
+
+        score = round(positive - negative, 4)
+        return {
+            'label': self.label(score),
+            'score': score,
+            'positive': round(positive, 4),
+            'negative': round(negative, 4),
+            'positive_hits': positive_hits,
+            'negative_hits': negative_hits,
+            'hits': dict(hits)
+        }
+
+    @staticmethod
+    def label(score):
+        """由得分推导三分类标签"""
+        if score > 0:
+            return 'positive'
+        if score < 0:
+            return 'negative'
+        return 'neutral'
@@ -0,0 +1,64 @@
+"""
+测试分析结果缓存的独立脚本
+"""
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from analysis_cache import AnalysisCache, content_key
+from opinion_batch import analyze_documents, analyze_text
+
+
+def test_content_key():
+    """规范化后相同的正文得到相同的键，版本或关键词数量不同时键不同"""
+    key = content_key('西昌市 经济发展\n势头良好', 'v1')
+    assert key == content_key('  西昌市  经济发展 势头良好 ', 'v1')
+    assert key == content_key('西昌市 经济发展 势头良好', 'v1')
+    assert key != content_key('西昌市 经济发展 势头良好', 'v2')
+    assert key != content_key('西昌市 经济发展 势头良好', 'v1', top_k=5)
+
+
+def test_get_or_analyze_and_persistence():
+    """未命中时分析并写入缓存，新实例从持久化层命中"""
+    calls = []
+
+    def analyze(text):
+        calls.append(text)
+        return analyze_text(text, top_k=5)
+
+    text = '部分小区供暖出现问题，居民投诉不断。'
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analysis_cache.db')
+        cache = AnalysisCache(max_size=8, db_path=db_path)
+        first = cache.get_or_analyze(text, 'v1', analyze, top_k=5)
+        second = cache.get_or_analyze(text + ' ', 'v1', analyze, top_k=5)
+        assert len(calls) == 1 and first == second
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+        restarted = AnalysisCache(max_size=8, db_path=db_path)
+        third = restarted.get_or_analyze(text, 'v1', analyze, top_k=5)
+        assert len(calls) == 1
+        assert third == first and isinstance(third['keywords'][0], tuple)
+        assert restarted.stats()['disk_hits'] == 1
+
+
+def test_batch_uses_cache():
+    """批量分析只分析未缓存且不重复的内容"""
+    cache = AnalysisCache(max_size=8)
+    documents = ['西昌市经济发展势头良好。', '居民投诉不断。', '西昌市经济发展势头良好。']
+    results = analyze_documents(documents, top_k=5, cache=cache, cache_version='v1')
+    assert results[0]['keywords'] == results[2]['keywords'] and results[2]['index'] == 2
+    assert cache.stats()['misses'] == 2 and len(cache.memory) == 2
+
+    again = analyze_documents(documents[:2], top_k=5, cache=cache, cache_version='v1')
+    assert cache.stats()['hits'] == 2
+    assert [item['sentiment'] for item in again] == [item['sentiment'] for item in results[:2]]
+
+
+if __name__ == "__main__":
+    test_content_key()
+    test_get_or_analyze_and_persistence()
+    test_batch_uses_cache()
@@ -0,0 +1,58 @@
+"""
+测试 DataFrame 批量分析的独立脚本
+"""
+import sys
+import os
+import random
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from bulk_analysis import analyze_frame, trie_pattern
+from sentiment_scorer import SentimentScorer
+
+
+def test_trie_pattern_longest_match():
+    """前缀树正则在每个位置取最长词语，且匹配互不重叠"""
+    regex = trie_pattern(['发展', '发展中', '中国', '展'])
+    assert regex.findall('发展中国家发展') == ['发展中', '发展']
+    assert regex.findall('展望') == ['展']
+
+
+def test_matches_row_by_row_scoring():
+    """与逐行调用 SentimentScorer.score 的结果一致"""
+    scorer = SentimentScorer.from_directory()
+    words = list(scorer.automaton.patterns)
+    filler = ['今天', '西昌', '经济', '，', '。', '部门', '处理', '不', '很', '\n']
+    rng = random.Random(0)
+    texts = [''.join(rng.choice(words + filler * 3) for _ in range(rng.randint(0, 25)))
+             for _ in range(300)]
+    texts += ['', None, '服务非常好，但是投诉处理不满意。']
+    frame = pd.DataFrame({'content': texts}, index=range(10, 10 + len(texts)))
+
+    result = analyze_frame(frame, scorer=scorer, chunk_size=64, keywords=False)
+    assert list(result.index) == list(frame.index)
+    for text, row in zip(texts, result.itertuples()):
+        expected = scorer.score(text or '')
+        assert (row.sentiment, row.score, row.positive, row.negative) == \
+            (expected['label'], expected['score'], expected['positive'], expected['negative'])
+        assert (row.positive_hits, row.negative_hits, row.hits) == \
+            (expected['positive_hits'], expected['negative_hits'], expected['hits'])
+
+
+def test_keywords_and_existing_columns():
+    """提取关键词，覆盖输入中已有的同名列"""
+    frame = pd.DataFrame({'content': ['西昌市经济发展势头良好，群众满意度显著提升。'],
+                          'sentiment': ['unknown']})
+    result = analyze_frame(frame, top_k=3)
+    assert list(result.columns[:2]) == ['content', 'sentiment']
+    assert result.loc[0, 'sentiment'] == 'positive'
+    assert len(result.loc[0, 'keywords']) == 3
+
+
+if __name__ == "__main__":
+    test_trie_pattern_longest_match()
+    test_matches_row_by_row_scoring()
+    test_keywords_and_existing_columns()
@@ -0,0 +1,59 @@
+"""
+测试报告语料词频索引的独立脚本
+"""
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from corpus_index import CorpusIndex, get_corpus_extractor
+
+REPORTS = [
+    "西昌舆情周报：卫星发射成功，网民评价积极。",
+    "西昌舆情周报：乡村振兴成效显著，农民收入增长。",
+    "西昌舆情周报：暴雨导致道路积水，市民投诉增多。",
+]
+
+
+def test_incremental_idf():
+    """测试增量加入文档后，每篇报告都出现的词语权重降低"""
+    index = CorpusIndex()
+    for i, text in enumerate(REPORTS, start=1):
+        index.add_document(text, doc_id=i)
+
+    assert index.n_docs == 3 and index.last_doc_id == 3
+    assert index.idf('西昌') < index.idf('卫星') < index.idf('从未出现的词')
+
+    index.remove_document(REPORTS[2])
+    assert index.n_docs == 2
+    assert index.df[index.vocab['投诉']] == 0
+
+
+def test_save_and_extract():
+    """测试持久化后加载一致，提取器随文件更新重新加载"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'corpus_idf.npz')
+        index = CorpusIndex()
+        for i, text in enumerate(REPORTS, start=1):
+            index.add_document(text, doc_id=i)
+        index.save(path)
+
+        loaded = CorpusIndex.load(path)
+        assert loaded.terms == index.terms
+        assert loaded.stats() == index.stats()
+
+        keywords = get_corpus_extractor(path).extract_tags("西昌舆情周报：卫星发射成功", topK=3)
+        print(f"语料 IDF 关键词: {keywords}")
+        assert keywords[0] != '西昌'
+
+        loaded.add_document("火箭发射", doc_id=4)
+        loaded.save(path)
+        os.utime(path, (0, 1))
+        assert get_corpus_extractor(path).idf_freq['火箭'] > 0
+
+
+if __name__ == "__main__":
+    test_incremental_idf()
+    test_save_and_extract()
@@ -0,0 +1,75 @@
+"""
+测试抓取结果缓存的独立脚本
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_cache import CrawlResultCache, TTLCache
+
+
+def test_ttl_and_lru():
+    """测试过期与容量淘汰"""
+    cache = TTLCache(max_size=2, ttl=0.2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    # b 最久未使用，被淘汰
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.evictions == 1
+
+    time.sleep(0.25)
+    assert cache.get('c') == (False, None)
+    assert cache.expirations == 1
+
+
+def test_single_flight():
+    """测试同一关键词并发请求只执行一次抓取"""
+    cache = CrawlResultCache(max_size=16, ttl=60)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return [{'title': '西昌新闻'}]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('西昌', 5, fetch)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    print(f"缓存统计: {stats}")
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert stats['misses'] == 1 and stats['hits'] == 7
+
+
+def test_persistent_tier():
+    """测试持久化缓存在新实例中仍可命中"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'crawl_cache.db')
+        CrawlResultCache(ttl=60, db_path=db_path).get_or_fetch('科技', 3, lambda: [{'title': '科技新闻'}])
+
+        cache = CrawlResultCache(ttl=60, db_path=db_path)
+        value = cache.get_or_fetch('科技', 3, lambda: [])
+        assert value == [{'title': '科技新闻'}]
+        assert cache.stats()['disk_hits'] == 1
+        cache.disk._conn.close()
+
+
+if __name__ == "__main__":
+    test_ttl_and_lru()
+    test_single_flight()
+    test_persistent_tier()
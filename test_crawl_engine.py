@@ -0,0 +1,50 @@
+"""
+测试批量抓取引擎的独立脚本
+"""
+import sys
+import os
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_engine import CrawlEngine
+from data_crawler import NewsCrawler
+
+
+class SlowCrawler(NewsCrawler):
+    """模拟响应缓慢的数据源"""
+
+    def search_news(self, keyword, max_results=10):
+        if keyword == '慢':
+            time.sleep(2)
+        return super().search_news(keyword, max_results)
+
+
+def test_batch_search():
+    """测试多关键词并发抓取"""
+    engine = CrawlEngine(max_workers=4, per_host_limit=2)
+    batch = engine.batch_search(["西昌", "科技", "财经", "人工智能", "西昌"], max_results=3)
+    engine.shutdown()
+
+    print(f"耗时 {batch['elapsed']} 秒，完成 {len(batch['results'])} 个关键词")
+    assert batch['complete']
+    assert list(batch['results']) == ["西昌", "科技", "财经", "人工智能"]
+    assert len(batch['results']["西昌"]) == 2
+
+
+def test_batch_search_deadline():
+    """测试截止时间到达后返回部分结果"""
+    engine = CrawlEngine(crawler_factory=SlowCrawler, max_workers=2, per_host_limit=2)
+    batch = engine.batch_search(["慢", "科技"], max_results=3, timeout=0.5)
+    engine.shutdown(wait=False)
+
+    print(f"超时关键词: {batch['timed_out']}")
+    assert batch['timed_out'] == ["慢"]
+    assert "科技" in batch['results']
+    assert not batch['complete']
+
+
+if __name__ == "__main__":
+    test_batch_search()
+    test_batch_search_deadline()
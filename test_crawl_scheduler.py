@@ -0,0 +1,82 @@
+"""
+测试后台定时抓取的独立脚本
+"""
+import sys
+import os
+import tempfile
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_scheduler import CrawlJobQueue, CrawlScheduler, PolitenessGate
+
+
+def test_job_queue():
+    """测试任务领取、失败重试与重启恢复"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'jobs.db')
+        queue = CrawlJobQueue(db_path, max_attempts=2)
+        job_id = queue.enqueue('西昌', 5)
+        # 同一关键词未完成时不重复添加
+        assert queue.enqueue('西昌', 5) == job_id
+
+        job = queue.claim()
+        assert job['keyword'] == '西昌' and job['attempts'] == 1
+        assert queue.claim() is None
+
+        assert queue.fail(job_id, '超时', retry_delay=0) is True
+        job = queue.claim()
+        assert job['attempts'] == 2
+        queue.close()
+
+        # 模拟进程退出后重启，running 任务恢复为 pending
+        queue = CrawlJobQueue(db_path, max_attempts=2)
+        assert queue.recover() == 1
+        assert queue.stats()['pending'] == 1
+        queue.close()
+
+
+def test_politeness_gate():
+    """测试同一主机的请求间隔"""
+    gate = PolitenessGate(delay=0.1)
+    started = time.monotonic()
+    for _ in range(3):
+        gate.wait('news.example.com')
+    gate.wait('other.example.com')
+    assert time.monotonic() - started >= 0.2
+
+
+def test_scheduler_runs_jobs():
+    """测试调度器生成任务并把结果交给入库函数"""
+    stored = {}
+
+    def crawl(keyword, max_results):
+        return [{'title': f'{keyword}新闻{i}'} for i in range(max_results)]
+
+    def store(keyword, items):
+        stored[keyword] = items
+        return len(items)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        queue = CrawlJobQueue(os.path.join(tmp_dir, 'jobs.db'))
+        scheduler = CrawlScheduler(queue, crawl, store, ['西昌', '科技'], interval=60, jitter=0,
+                                   workers=2, politeness_delay=0, max_results=3, poll_interval=0.05)
+        scheduler.start()
+        deadline = time.time() + 5
+        while len(stored) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        scheduler.stop()
+
+        print(f"调度器状态: {scheduler.status()}")
+        assert set(stored) == {'西昌', '科技'}
+        assert queue.stats()['done'] == 2
+        # 间隔未到，不会再次生成任务
+        assert scheduler.schedule_due() == []
+        queue.close()
+
+
+if __name__ == "__main__":
+    test_job_queue()
+    test_politeness_gate()
+    test_scheduler_runs_jobs()
@@ -3,11 +3,15 @@
 """
 import sys
 import os
+import gzip
+import tempfile
 
 # 添加当前目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from data_crawler import NewsCrawler
+from data_crawler import NewsCrawler, configure_shared_session, get_shared_session
+from news_parsers import available_backends
+from http_cache import ResponseCache
 
 def test_crawler():
     """测试抓取器功能"""
@@ -57,5 +61,89 @@ def test_crawler():
         
         print("\n" + "=" * 50)
 
+def test_shared_session():
+    """测试抓取器实例复用进程内共享连接池"""
+    first = NewsCrawler()
+    second = NewsCrawler()
+    assert first.session is second.session
+
+    # 修改配置后重建共享会话
+    configure_shared_session(pool_maxsize=4)
+    adapter = get_shared_session().get_adapter('https://www.baidu.com')
+    assert adapter._pool_maxsize == 4
+    assert NewsCrawler().session is not first.session
+    configure_shared_session(pool_maxsize=10)
+
+
+def test_parser_backends():
+    """测试不同解析后端返回相同的数据"""
+    html = """
+    <div class="result c-container"><h3 class="news-title"><a href="https://example.com/a">西昌新闻标题<em>测试</em></a></h3>
+    <div class="c-summary">这是一段用于测试解析后端的新闻概要内容<!-- 注释 --></div>
+    <p class="c-author">新华社 1小时前</p><img src="//img.example.com/a.jpg"></div>
+    """
+    outputs = []
+    for backend in available_backends():
+        crawler = NewsCrawler(parser_backend=backend)
+        items = crawler.parse_news_html(html, 5) + crawler.parse_advanced_news_html(html, 5)
+        outputs.append([{k: v for k, v in item.items() if k != 'crawl_time'} for item in items])
+
+    assert outputs[0][0]['title'] == '西昌新闻标题测试'
+    assert outputs[0][0]['cover'] == 'https://img.example.com/a.jpg'
+    assert all(output == outputs[0] for output in outputs)
+
+
+class FakeResponse:
+    """模拟 requests 响应"""
+
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class FakeSession:
+    """带 ETag 校验的模拟数据源，页面内容以 gzip 返回且未声明 Content-Encoding"""
+
+    def __init__(self, html):
+        self.html = html
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, gzip.compress(self.html.encode('utf-8')), {'ETag': '"v1"'})
+
+
+def test_conditional_requests():
+    """测试条件请求：304 时复用已解析的结果，不再重新解析"""
+    html = """<html><head><meta charset="utf-8"></head><body>
+    <div class="result"><h3 class="news-title"><a href="https://example.com/n">测试关键词相关新闻标题</a></h3>
+    <div class="c-summary">新闻概要</div></div></body></html>"""
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        session = FakeSession(html)
+        crawler = NewsCrawler(session=session, response_cache=ResponseCache(cache_dir),
+                              enable_real_search=True)
+        first = crawler.search_news('未收录的关键词', 5)
+        assert first[0]['title'] == '测试关键词相关新闻标题'
+
+        parse_calls = []
+        crawler.parse_news_html = lambda *args: parse_calls.append(args) or []
+        second = crawler.search_news('未收录的关键词', 5)
+
+        assert session.requests[1].get('If-None-Match') == '"v1"'
+        assert second == first
+        assert not parse_calls
+
+
 if __name__ == "__main__":
-    test_crawler()
\ No newline at end of file
+    test_crawler()
+    test_shared_session()
+    test_parser_backends()
+    test_conditional_requests()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+测试数据库迁移的独立脚本
+"""
+import sys
+import os
+
+from sqlalchemy import create_engine, inspect, text
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from migrations import MIGRATIONS, backfill_report_keywords, get_version, migrate
+
+
+def make_engine():
+    """没有索引的旧版报告表（关键词为 str(列表)）和 create_all 新建的关键词表"""
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE public_opinion_report (id INTEGER PRIMARY KEY, title VARCHAR(200), keywords TEXT, '
+            'sentiment VARCHAR(20), source VARCHAR(100), report_date DATE, created_by INTEGER, created_at DATETIME)'
+        ))
+        conn.execute(text(
+            'CREATE TABLE report_keyword (id INTEGER PRIMARY KEY, report_id INTEGER NOT NULL, '
+            'keyword VARCHAR(100) NOT NULL, weight FLOAT, UNIQUE (report_id, keyword))'
+        ))
+        conn.execute(text('INSERT INTO public_opinion_report (title, keywords, sentiment) VALUES '
+                          "('旧报告', :legacy, 'neutral'), ('无关键词', NULL, 'neutral'), ('格式错误', 'x(', 'neutral')"),
+                     {'legacy': "[('西昌', 0.5), ('卫星', 0.25), ('西昌', 0.25)]"})
+    return engine
+
+
+def test_migrate_existing_database():
+    """为已有表添加索引，数据保留，重复执行不做任何操作"""
+    engine = make_engine()
+    assert migrate(engine) == [version for version, _, _ in MIGRATIONS]
+    with engine.connect() as conn:
+        assert get_version(conn) == MIGRATIONS[-1][0]
+        assert conn.execute(text('SELECT count(*) FROM public_opinion_report')).scalar() == 3
+    names = {index['name'] for index in inspect(engine).get_indexes('public_opinion_report')}
+    assert {'ix_report_created_at_id', 'ix_report_sentiment_created_at'} <= names
+    assert migrate(engine) == []
+
+
+def test_backfill_report_keywords():
+    """分批拆分关键词（重复词语合并），keywords 列改写为 JSON（无法解析的保持原样），可重复执行"""
+    engine = make_engine()
+    for _ in range(2):
+        with engine.begin() as conn:
+            assert backfill_report_keywords(conn, batch_size=2) == 3
+    with engine.connect() as conn:
+        rows = conn.execute(text('SELECT report_id, keyword, weight FROM report_keyword ORDER BY weight DESC')).all()
+        keywords = conn.execute(text('SELECT keywords FROM public_opinion_report ORDER BY id')).scalars().all()
+    assert [tuple(row) for row in rows] == [(1, '西昌', 0.75), (1, '卫星', 0.25)]
+    assert keywords == ['[["西昌",0.75],["卫星",0.25]]', None, 'x(']
+
+
+def test_migration_steps_and_failure():
+    """函数步骤、按版本号顺序执行，失败的迁移不更新版本号"""
+    engine = make_engine()
+    calls = []
+    migrations = [
+        (2, '第二步', [lambda conn: calls.append(get_version(conn))]),
+        (1, '第一步', ['CREATE INDEX IF NOT EXISTS ix_title ON public_opinion_report (title)']),
+    ]
+    assert migrate(engine, migrations) == [1, 2]
+    assert calls == [1]
+
+    def fail(conn):
+        raise RuntimeError('迁移失败')
+
+    try:
+        migrate(engine, migrations + [(3, '失败', [fail])])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError('迁移失败时应抛出异常')
+    with engine.connect() as conn:
+        assert get_version(conn) == 2
+
+
+if __name__ == "__main__":
+    test_migrate_existing_database()
+    test_backfill_report_keywords()
+    test_migration_steps_and_failure()
@@ -0,0 +1,62 @@
+"""
+测试近似重复新闻检测的独立脚本
+"""
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from near_dup import NearDuplicateDetector, SimHashIndex, article_fingerprint, hamming_distance
+
+
+TITLE = "西昌卫星发射中心成功发射新一代通信卫星"
+SUMMARY = "西昌卫星发射中心今日成功发射新一代通信卫星，卫星顺利进入预定轨道，发射任务取得圆满成功。"
+
+
+def test_syndicated_copies():
+    """测试转载稿（加前缀、后缀、署名）与原文指纹接近，不同文章距离较远"""
+    original = article_fingerprint(TITLE, SUMMARY)
+    copies = [
+        article_fingerprint(f"【转载】{TITLE}", SUMMARY),
+        article_fingerprint(f"{TITLE}_新浪新闻", SUMMARY + "（来源：新华社）"),
+        article_fingerprint(TITLE, SUMMARY[:30]),
+    ]
+    other = article_fingerprint("A股市场震荡上行，投资者信心增强", "今日A股三大指数集体上涨，成交量明显放大。")
+
+    for copy in copies:
+        print(f"转载稿距离: {hamming_distance(original, copy)}")
+        assert hamming_distance(original, copy) <= 3
+    assert hamming_distance(original, other) > 3
+
+
+def test_index_lookup():
+    """测试分段索引能找到距离不超过阈值的指纹"""
+    index = SimHashIndex(max_distance=3)
+    index.add('a', 0b1011 << 40)
+    assert index.find((0b1011 << 40) ^ 0b111) == ('a', 3)
+    assert index.find((0b1011 << 40) ^ 0b1111) is None
+    assert len(index) == 1
+
+
+def test_collapse():
+    """测试合并近似重复新闻并记录转载来源"""
+    items = [
+        {"title": TITLE, "summary": SUMMARY, "source": "新华网", "url": "http://a"},
+        {"title": f"【转载】{TITLE}", "summary": SUMMARY, "source": "网易", "url": "http://b"},
+        {"title": "A股市场震荡上行", "summary": "今日A股三大指数集体上涨。", "source": "财经网", "url": "http://c"},
+    ]
+    detector = NearDuplicateDetector()
+    collapsed = detector.collapse(items, use_index=True)
+    assert [item['url'] for item in collapsed] == ["http://a", "http://c"]
+    assert collapsed[0]['duplicate_count'] == 1
+    assert collapsed[0]['duplicate_sources'] == ["网易"]
+
+    # 已进入索引的文章再次出现时被过滤
+    assert detector.collapse(items[1:2], use_index=True) == []
+
+
+if __name__ == "__main__":
+    test_syndicated_copies()
+    test_index_lookup()
+    test_collapse()
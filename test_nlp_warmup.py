@@ -0,0 +1,38 @@
+"""
+测试分词预热的独立脚本
+"""
+import sys
+import os
+import gc
+import marshal
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_warmup import build_jieba_cache, freeze_heap
+
+
+def test_build_jieba_cache():
+    """测试预构建的词典缓存可被 jieba 的缓存格式读取"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'jieba.cache')
+        count = build_jieba_cache(cache_path)
+        with open(cache_path, 'rb') as f:
+            freq, total = marshal.load(f)
+        print(f"词典缓存词条数: {count}")
+        assert len(freq) == count and total > 0
+        assert freq.get('卫星', 0) > 0
+
+
+def test_freeze_heap():
+    """测试冻结后已加载的对象不再参与垃圾回收"""
+    try:
+        assert freeze_heap() > 0
+    finally:
+        gc.unfreeze()
+
+
+if __name__ == "__main__":
+    test_build_jieba_cache()
+    test_freeze_heap()
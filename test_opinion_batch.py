@@ -0,0 +1,51 @@
+"""
+测试批量舆情分析的独立脚本
+"""
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from opinion_batch import analyze_documents, init_worker
+from tokenizer_pool import TokenizerPool
+
+DOCUMENTS = [
+    "西昌市经济发展势头良好，群众满意度显著提升。",
+    "",
+    {"id": "a-1", "content": "部分小区供暖出现问题，居民投诉不断。"},
+    {"id": "a-2"},
+    "人工智能技术取得突破，产业创新能力持续增强。",
+]
+
+
+def check_results(results):
+    """检查结果顺序与单篇错误"""
+    assert [item['index'] for item in results] == list(range(len(DOCUMENTS)))
+    assert results[0]['sentiment'] == 'positive'
+    assert results[1]['error'] == '内容不能为空'
+    assert results[2]['id'] == 'a-1' and results[2]['sentiment'] == 'negative'
+    assert results[3] == {'index': 3, 'id': 'a-2', 'error': '内容不能为空'}
+    assert results[4]['keywords']
+
+
+def test_in_process():
+    """测试在当前进程中批量分析"""
+    check_results(analyze_documents(DOCUMENTS, top_k=5, chunk_size=2))
+
+
+def test_process_pool():
+    """测试在分词进程池中批量分析，结果与输入顺序一致"""
+    pool = TokenizerPool(workers=2, inline_threshold=0, initializer=init_worker)
+    try:
+        results = analyze_documents(DOCUMENTS, top_k=5, pool=pool, chunk_size=1)
+    finally:
+        pool.shutdown()
+    print(f"批量分析结果: {results[0]}")
+    check_results(results)
+    assert pool.stats()['completed'] == 3 and pool.stats()['inline'] == 0
+
+
+if __name__ == "__main__":
+    test_in_process()
+    test_process_pool()
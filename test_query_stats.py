@@ -0,0 +1,84 @@
+"""
+测试 SQL 语句统计的独立脚本
+"""
+import sys
+import os
+
+from sqlalchemy import ForeignKey, String, create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, joinedload, mapped_column, relationship
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import query_stats
+from query_stats import count_queries
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Author(Base):
+    __tablename__ = 'author'
+    id: Mapped[int] = mapped_column(primary_key=True)
+    username: Mapped[str] = mapped_column(String(80))
+
+
+class Report(Base):
+    __tablename__ = 'report'
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_by: Mapped[int] = mapped_column(ForeignKey('author.id'))
+    creator: Mapped[Author] = relationship()
+
+
+def make_session():
+    """内存数据库：5 个用户各创建 2 篇报告"""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    query_stats.track(engine)
+    query_stats.track(engine)
+    session = Session(engine)
+    authors = [Author(username=f'user{i}') for i in range(5)]
+    session.add_all(authors)
+    session.add_all(Report(creator=author) for author in authors for _ in range(2))
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+def test_counts_n_plus_one():
+    """懒加载创建人时每个用户多一条查询，预加载后只有一条"""
+    session = make_session()
+    with count_queries() as lazy:
+        names = [report.creator.username for report in session.scalars(select(Report))]
+    assert len(names) == 10
+    assert lazy.count == 1 + 5
+    assert lazy.elapsed > 0 and len(lazy.statements) == lazy.count
+
+    session.expunge_all()
+    with count_queries() as eager:
+        names = [report.creator.username
+                 for report in session.scalars(select(Report).options(joinedload(Report.creator)))]
+    assert len(names) == 10
+    assert eager.count == 1
+    assert 'JOIN' in eager.statements[0][0]
+
+
+def test_nested_and_untracked():
+    """嵌套统计互不影响，统计结束后的语句不计入"""
+    session = make_session()
+    assert query_stats.current() is None
+    with count_queries(keep_statements=False) as outer:
+        session.scalars(select(Author)).all()
+        with count_queries() as inner:
+            session.scalars(select(Report)).all()
+        assert query_stats.current() is outer
+    session.scalars(select(Author)).all()
+    assert outer.count == 1 and inner.count == 1
+    assert outer.statements == []
+    assert outer.to_dict()['count'] == 1
+
+
+if __name__ == "__main__":
+    test_counts_n_plus_one()
+    test_nested_and_untracked()
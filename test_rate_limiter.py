@@ -0,0 +1,112 @@
+"""
+测试数据源限流与熔断的独立脚本
+"""
+import sys
+import os
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_crawler import NewsCrawler
+from rate_limiter import HostRateLimiter, RateLimitTimeout, SourceBlockedError, classify_response
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_classify_response():
+    """测试响应信号识别，包括保存下来的百度安全验证页面"""
+    with open(os.path.join(BASE_DIR, 'debug_西昌_raw.html'), 'rb') as f:
+        captcha_page = f.read()
+
+    assert classify_response(200, body=captcha_page) == 'blocked'
+    assert classify_response(429) == 'throttled'
+    assert classify_response(200, 'https://wappass.baidu.com/static/captcha/') == 'blocked'
+    assert classify_response(200, body=b'<html></html>') == 'suspicious'
+    assert classify_response(200, body=b'<html>' + b' ' * 4096 + b'</html>') == 'ok'
+
+
+def test_token_bucket():
+    """测试突发容量用完后按速率放行，等待过久时直接超时"""
+    limiter = HostRateLimiter(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.acquire('news.example.com')
+    assert time.monotonic() - started >= 0.09
+
+    slow = HostRateLimiter(rate=0.1, capacity=1)
+    slow.acquire('news.example.com')
+    try:
+        slow.acquire('news.example.com', timeout=0.5)
+        assert False, '应当超时'
+    except RateLimitTimeout:
+        pass
+
+
+def test_circuit_breaker():
+    """测试限流时降速、连续失败后熔断，冷却后探测成功恢复"""
+    limiter = HostRateLimiter(rate=10, capacity=10, failure_threshold=2, cooldown=0.2)
+    limiter.record('news.example.com', 'throttled')
+    assert limiter.status()['news.example.com']['rate'] == 5
+    limiter.record('news.example.com', 'error')
+    assert limiter.status()['news.example.com']['state'] == 'open'
+
+    started = time.monotonic()
+    try:
+        limiter.acquire('news.example.com')
+        assert False, '熔断中应当直接跳过'
+    except SourceBlockedError:
+        assert time.monotonic() - started < 0.05
+
+    time.sleep(0.25)
+    limiter.acquire('news.example.com')
+    assert limiter.status()['news.example.com']['state'] == 'half_open'
+    limiter.record('news.example.com', 'ok')
+    assert limiter.status()['news.example.com']['state'] == 'closed'
+
+
+class CaptchaResponse:
+    """返回验证页面的模拟响应"""
+    status_code = 200
+    headers = {}
+    url = 'https://www.baidu.com/s'
+    history = ()
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class CaptchaSession:
+    """始终返回验证页面的模拟数据源"""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        return CaptchaResponse(self.content)
+
+
+def test_crawler_skips_blocked_source():
+    """测试抓取器遇到验证页面后熔断，后续请求不再访问数据源"""
+    with open(os.path.join(BASE_DIR, 'debug_西昌_raw.html'), 'rb') as f:
+        session = CaptchaSession(f.read())
+    crawler = NewsCrawler(session=session, enable_real_search=True,
+                          rate_limiter=HostRateLimiter(rate=100, cooldown=60))
+
+    assert crawler.search_news('未收录的关键词', 5) == []
+    calls = session.calls
+    assert crawler.search_news('另一个未收录的关键词', 5) == []
+    assert session.calls == calls
+    assert crawler.rate_limiter.status()['www.baidu.com']['state'] == 'open'
+
+
+if __name__ == "__main__":
+    test_classify_response()
+    test_token_bucket()
+    test_circuit_breaker()
+    test_crawler_skips_blocked_source()
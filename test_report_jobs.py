@@ -0,0 +1,65 @@
+"""
+测试汇总舆情报告生成的独立脚本
+"""
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from report_jobs import OTHER_CLUSTER, ReportBuilder
+
+GROUPS = [
+    ('供暖', '小区供暖出现问题，居民投诉不断，物业维修缓慢'),
+    ('发射', '卫星发射中心成功发射卫星，航天事业取得突破'),
+]
+
+
+def make_frame(start, count):
+    """两类文章交替的示例数据"""
+    rows = []
+    for i in range(start, start + count):
+        name, summary = GROUPS[i % 2]
+        rows.append({'id': i + 1, 'title': f'{name}新闻{i}', 'summary': summary,
+                     'source': '新华网' if i % 3 else None, 'url': f'http://example.com/{i}'})
+    return pd.DataFrame(rows).set_index('id')
+
+
+def test_streaming_batches():
+    """分批加入文章后汇总情感、关键词、来源和话题"""
+    builder = ReportBuilder(total=20, n_clusters=2, excerpts=2, top_k=5)
+    for start in range(0, 20, 6):
+        builder.add_batch(make_frame(start, min(6, 20 - start)))
+    result = builder.build('测试报告', '测试范围内')
+    stats = result['stats']
+
+    assert builder.processed == 20
+    assert stats['sentiments'] == {'positive': 10, 'negative': 10, 'neutral': 0}
+    assert dict(stats['sources']) == {'新华网': 13, '未知': 7}
+    assert len(result['keywords']) == 5
+
+    clusters = stats['clusters']
+    assert sorted(cluster['size'] for cluster in clusters) == [10, 10]
+    heating = next(cluster for cluster in clusters if '供暖' in cluster['keywords'])
+    assert heating['sentiments'] == {'negative': 10}
+    assert len(heating['excerpts']) == 2
+    assert all(excerpt['title'].startswith('供暖') for excerpt in heating['excerpts'])
+    assert '【主要话题】' in result['content'] and '消极：10 篇（50.0%）' in result['content']
+
+
+def test_fewer_articles_than_clusters():
+    """有效文章少于话题数时按实际文章数聚类，无有效词语的文章归入其他"""
+    frame = make_frame(0, 2)
+    frame.loc[3] = {'title': '', 'summary': '', 'source': '本地', 'url': ''}
+    builder = ReportBuilder(total=3, n_clusters=5)
+    builder.add_batch(frame)
+    clusters = builder.build('测试报告')['stats']['clusters']
+    assert builder.model.n_clusters == 2
+    assert clusters[-1]['cluster_id'] == OTHER_CLUSTER and clusters[-1]['size'] == 1
+
+
+if __name__ == "__main__":
+    test_streaming_batches()
+    test_fewer_articles_than_clusters()
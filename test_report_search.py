@@ -0,0 +1,91 @@
+"""
+测试报告全文检索的独立脚本
+"""
+import sys
+import os
+
+from sqlalchemy import create_engine, text
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from report_search import (TOKEN_SEPARATOR, build_match_query, create_index, desegment, index_rows,
+                           remove_rows, render_highlight, search, segment)
+
+REPORTS = [
+    (1, '西昌市卫星发射中心成功发射新型卫星', '今天上午，西昌卫星发射中心成功将一颗卫星送入预定轨道。'),
+    (2, '小区供暖投诉增多', '多个小区居民反映暖气温度不达标，物业表示将尽快维修。'),
+    (3, '人工智能产业发展报告', '人工智能芯片和大模型训练带动算力需求增长，西昌也在建设数据中心。'),
+]
+
+
+def make_connection():
+    """内存数据库：FTS5 索引和用于情感筛选的报告表"""
+    engine = create_engine('sqlite://')
+    conn = engine.connect()
+    create_index(conn)
+    conn.execute(text('CREATE TABLE public_opinion_report (id INTEGER PRIMARY KEY, sentiment TEXT)'))
+    conn.execute(text('INSERT INTO public_opinion_report VALUES (1, :p), (2, :n), (3, :p)'),
+                 {'p': 'positive', 'n': 'negative'})
+    index_rows(conn, REPORTS)
+    return conn
+
+
+def test_segment_round_trip():
+    """分词结果去掉分隔符即为原文"""
+    content = REPORTS[0][2]
+    segmented = segment(content)
+    assert TOKEN_SEPARATOR in segmented
+    assert desegment(segmented) == content
+    assert segment(None) == ''
+
+
+def test_build_match_query():
+    """查询词按搜索引擎模式分词，加引号转义后以 AND 连接"""
+    assert build_match_query('卫星 发射') == '"卫星" "发射"'
+    assert build_match_query('a"b') == '"a" "b"'
+    assert build_match_query('，。！') == ''
+
+
+def test_search_chinese():
+    """中文查询：标题命中排在前面，可匹配长词中切出的短词"""
+    conn = make_connection()
+    result = search(conn, '西昌')
+    assert result['total'] == 2
+    assert [item['id'] for item in result['items']] == [1, 3]
+    assert '<mark>西昌</mark>' in result['items'][0]['title']
+    assert '<mark>西昌</mark>' in result['items'][1]['snippet']
+    assert search(conn, '暖气 物业')['total'] == 1
+    assert search(conn, '暖气 卫星')['total'] == 0
+    assert search(conn, '西昌', sentiment='negative')['total'] == 0
+
+
+def test_search_pagination_and_sync():
+    """分页、覆盖写入和删除"""
+    conn = make_connection()
+    assert [item['id'] for item in search(conn, '西昌', page=2, per_page=1)['items']] == [3]
+    index_rows(conn, [(3, '人工智能产业发展报告', '芯片和算力需求增长。')])
+    assert search(conn, '西昌')['total'] == 1
+    remove_rows(conn, [1])
+    assert search(conn, '西昌')['total'] == 0
+    assert conn.execute(text('SELECT count(*) FROM report_fts')).scalar() == 2
+
+
+def test_render_highlight_escapes_html():
+    """原文中的 HTML 被转义，只有检索词被标记（不区分大小写，长词优先）"""
+    conn = create_engine('sqlite://').connect()
+    create_index(conn)
+    index_rows(conn, [(1, '<b>通知</b>', '<script>alert(1)</script>通知内容')])
+    item = search(conn, '通知')['items'][0]
+    assert item['title'] == '&lt;b&gt;<mark>通知</mark>&lt;/b&gt;'
+    assert '<script>' not in item['snippet']
+    assert render_highlight(segment('A&b a'), ['a']) == '<mark>A</mark>&amp;b <mark>a</mark>'
+    assert render_highlight(segment('西昌市'), ['西昌', '西昌市']) == '<mark>西昌市</mark>'
+
+
+if __name__ == "__main__":
+    test_segment_round_trip()
+    test_build_match_query()
+    test_search_chinese()
+    test_search_pagination_and_sync()
+    test_render_highlight_escapes_html()
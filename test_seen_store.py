@@ -0,0 +1,44 @@
+"""
+测试增量抓取（已抓取文章记录）的独立脚本
+"""
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_crawler import NewsCrawler
+from seen_store import SeenUrlStore
+
+
+def test_incremental_search():
+    """测试增量搜索只返回新文章，游标可读取之后新增的文章"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SeenUrlStore(os.path.join(tmp_dir, 'seen.db'))
+        crawler = NewsCrawler(seen_store=store)
+
+        first = crawler.search_incremental("西昌", 5)
+        assert len(first) == 2
+        cursor = store.latest_cursor()
+
+        # 再次抓取时已记录的文章不再返回
+        assert crawler.search_incremental("西昌", 5) == []
+
+        crawler.mock_news_data["西昌"].append({
+            "title": "西昌新增新闻",
+            "summary": "",
+            "url": "https://example.com/news/new",
+            "source": "新华社",
+            "cover": "",
+            "crawl_time": ""
+        })
+        second = crawler.search_incremental("西昌", 5)
+        assert [item['title'] for item in second] == ["西昌新增新闻"]
+        assert store.items_since(cursor, keyword="西昌") == second
+        assert store.count() == 3
+        store.close()
+
+
+if __name__ == "__main__":
+    test_incremental_search()
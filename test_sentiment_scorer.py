@@ -0,0 +1,63 @@
+"""
+测试词典情感打分的独立脚本
+"""
+import sys
+import os
+import random
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sentiment_scorer import AhoCorasick, SentimentScorer
+
+
+def test_automaton_matches():
+    """测试自动机找出的匹配与逐个子串查找一致"""
+    words = ['he', 'she', 'his', 'hers', '发展', '发展中', '展']
+    automaton = AhoCorasick({w: None for w in words})
+    text = 'ushers 发展中国家发展'
+    found = sorted(automaton.iter_matches(text))
+    expected = sorted((i, i + len(w), w) for w in words
+                      for i in range(len(text)) if text.startswith(w, i))
+    assert found == expected
+
+
+def test_scores():
+    """测试否定词、程度副词、屏蔽词和标签推导"""
+    scorer = SentimentScorer.from_directory()
+
+    result = scorer.score('服务非常好，但是投诉处理不满意。')
+    print(f"情感得分: {result}")
+    assert result['positive'] == 1.8
+    assert result['negative'] == 3.0
+    assert result['negative_hits'] == 2
+    assert result['label'] == 'negative'
+
+    assert scorer.score('产品没有问题')['label'] == 'positive'
+    # “不断”中的“不”不是否定词
+    assert scorer.score('经济不断发展')['score'] == 0.5
+    assert scorer.score('今天天气晴')['label'] == 'neutral'
+    assert scorer.score('项目失败，损失严重')['negative_hits'] == 1
+
+
+def test_large_lexicon():
+    """测试数万词条的词典仍只需单次扫描"""
+    rng = random.Random(0)
+    chars = '的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经'
+    lexicon = {''.join(rng.choice(chars) for _ in range(rng.randint(2, 4))): rng.choice([-1, 1])
+               for _ in range(30000)}
+    scorer = SentimentScorer(lexicon)
+    text = ''.join(rng.choice(chars) for _ in range(20000))
+
+    started = time.perf_counter()
+    result = scorer.score(text)
+    elapsed = time.perf_counter() - started
+    print(f"3 万词条、2 万字文本打分耗时 {elapsed * 1000:.1f} ms，命中 {sum(result['hits'].values())} 次")
+    assert sum(result['hits'].values()) > 0
+
+
+if __name__ == "__main__":
+    test_automaton_matches()
+    test_scores()
+    test_large_lexicon()
@@ -0,0 +1,52 @@
+"""
+测试分词进程池的独立脚本
+"""
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tokenizer_pool import TokenizerPool, extract_tags
+
+SHORT_TEXT = "西昌卫星发射中心成功发射新型通信卫星"
+LONG_TEXT = "人工智能技术在各行业广泛应用，推动产业数字化转型。" * 200
+
+
+def test_inline_small_input():
+    """测试短文本在当前进程中处理，不启动工作进程"""
+    pool = TokenizerPool(workers=2, inline_threshold=100)
+    assert pool.extract_tags(SHORT_TEXT, top_k=3) == extract_tags(SHORT_TEXT, 3)
+    stats = pool.stats()
+    assert stats['inline'] == 1 and not stats['pool_started']
+
+
+def test_pool_large_input():
+    """测试长文本和批量输入在工作进程中处理，并统计吞吐量"""
+    pool = TokenizerPool(workers=2, inline_threshold=100)
+    try:
+        assert pool.extract_tags(LONG_TEXT, top_k=5) == extract_tags(LONG_TEXT, 5)
+        results = pool.extract_tags_many([LONG_TEXT, SHORT_TEXT, ''], top_k=5, chunk_size=1)
+        assert [len(r) for r in results] == [5, len(extract_tags(SHORT_TEXT, 5)), 0]
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    print(f"分词进程池指标: {stats}")
+    assert stats['pool_started'] is False
+    assert stats['completed'] == 4 and stats['inline'] == 0
+    assert stats['in_flight'] == 0 and stats['chars_per_sec'] > 0
+
+
+def test_disabled_pool():
+    """测试未配置工作进程时全部在当前进程中处理"""
+    pool = TokenizerPool(workers=0, inline_threshold=0)
+    future = pool.submit(extract_tags, LONG_TEXT, 3, chars=len(LONG_TEXT))
+    assert len(future.result()) == 3
+    assert pool.stats()['inline'] == 1
+
+
+if __name__ == "__main__":
+    test_inline_small_input()
+    test_pool_large_input()
+    test_disabled_pool()
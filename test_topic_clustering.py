@@ -0,0 +1,69 @@
+"""
+测试话题聚类的独立脚本
+"""
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from topic_clustering import TopicModel
+
+SPACE = ['卫星', '发射', '火箭', '航天', '轨道']
+HEATING = ['供暖', '小区', '居民', '投诉', '物业']
+
+
+def make_items(start, count):
+    """两个话题交替的示例文档"""
+    items = []
+    for i in range(start, start + count):
+        words = SPACE if i % 2 == 0 else HEATING
+        items.append((i, '，'.join(words[i % 5:] + words[:i % 5]) + '。'))
+    return items
+
+
+def test_pending_until_enough_documents():
+    """文档数少于话题数时暂存，凑够后一并返回"""
+    model = TopicModel(n_clusters=2, n_features=2 ** 10)
+    assert model.partial_fit(make_items(0, 1)) == []
+    assert model.predict(['卫星发射']) is None
+    assignments = model.partial_fit(make_items(1, 5))
+    assert [key for key, _ in assignments] == list(range(6))
+
+
+def test_separates_topics():
+    """两个话题分到不同聚类，关键词来自各自的词表"""
+    model = TopicModel(n_clusters=2, n_features=2 ** 10)
+    labels = dict(model.partial_fit(make_items(0, 40)))
+    labels.update(model.partial_fit(make_items(40, 40)))
+    assert {labels[i] for i in range(0, 80, 2)} != {labels[i] for i in range(1, 80, 2)}
+    assert len({labels[i] for i in range(0, 80, 2)}) == 1
+
+    topics = {topic['cluster_id']: topic for topic in model.topics()}
+    space_topic = topics[labels[0]]
+    assert space_topic['size'] == 40
+    assert set(space_topic['keywords']) <= set(SPACE)
+    assert model.predict(['火箭发射卫星进入轨道']) == [labels[0]]
+
+
+def test_save_and_load():
+    """保存后加载，聚类结果与游标保持不变"""
+    model = TopicModel(n_clusters=2, n_features=2 ** 10)
+    model.partial_fit(make_items(0, 20))
+    model.cursors['report'] = 20
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'topic_model.pkl')
+        model.save(path)
+        loaded = TopicModel.load(path, n_clusters=2)
+        assert loaded.cursors == {'report': 20}
+        assert loaded.topics() == model.topics()
+        assert loaded.predict(['小区供暖投诉']) == model.predict(['小区供暖投诉'])
+        # 话题数量变化时重新训练
+        assert not TopicModel.load(path, n_clusters=3).fitted
+
+
+if __name__ == "__main__":
+    test_pending_until_enough_documents()
+    test_separates_topics()
+    test_save_and_load()
@@ -0,0 +1,78 @@
+"""
+测试趋势汇总的独立脚本
+"""
+import sys
+import os
+from collections import namedtuple
+from datetime import date
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trend_rollups import (bucket_sentiment, dump_keywords, merge_keywords, parse_keywords, report_rollup_rows,
+                           rising_keywords)
+
+Row = namedtuple('Row', 'day source positive negative neutral total')
+
+
+def test_parse_keywords():
+    """解析 str(关键词列表)，格式错误时返回空列表"""
+    assert parse_keywords("[('西昌', 1.5), ('经济', 1)]") == [('西昌', 1.5), ('经济', 1.0)]
+    assert parse_keywords("['西昌', '经济']") == [('西昌', 1.0), ('经济', 1.0)]
+    assert parse_keywords("[['西昌', 0.5], ('坏', 'x'), 3]") == [('西昌', 0.5)]
+    assert parse_keywords('') == [] and parse_keywords(None) == []
+    assert parse_keywords("__import__('os')") == []
+    assert parse_keywords('{"a": 1}') == []
+    assert parse_keywords('[["西昌",0.5],"经济",["坏",true]]') == [('西昌', 0.5), ('经济', 1.0)]
+
+
+def test_dump_keywords():
+    """紧凑 JSON 存储格式，可由 parse_keywords 还原"""
+    keywords = [('西昌', 0.5), ('卫星', 1)]
+    assert dump_keywords(keywords) == '[["西昌",0.5],["卫星",1.0]]'
+    assert parse_keywords(dump_keywords(keywords)) == [('西昌', 0.5), ('卫星', 1.0)]
+    assert dump_keywords(['西昌']) == '[["西昌",1.0]]'
+    assert dump_keywords(None) == '[]'
+    assert merge_keywords([('西昌', 0.5), ('卫星', 1.0), ('西昌', 0.25)]) == [('西昌', 0.75), ('卫星', 1.0)]
+
+
+def test_report_rollup_rows():
+    """一篇报告的增量：未知情感计入 neutral，空来源使用默认来源，重复关键词合并"""
+    day = date(2024, 5, 6)
+    sentiment_row, keyword_rows = report_rollup_rows(day, None, 'mixed', "[('西昌', 1.0), ('西昌', 0.5)]", -1)
+    assert sentiment_row == {'day': day, 'source': '未知', 'total': -1,
+                             'positive': 0, 'negative': 0, 'neutral': -1}
+    assert keyword_rows == [{'day': day, 'source': '未知', 'keyword': '西昌',
+                             'report_count': -1, 'weight': -1.5}]
+
+
+def test_bucket_sentiment():
+    """按周合并（周一开始），跳过报告已全部删除的周期"""
+    rows = [
+        Row(date(2024, 5, 6), '网络', 1, 0, 0, 1),   # 周一
+        Row(date(2024, 5, 12), '网络', 0, 2, 0, 2),  # 周日
+        Row(date(2024, 5, 13), '手动输入', 0, 0, 1, 1),
+        Row(date(2024, 5, 20), '网络', 0, 0, 0, 0),
+    ]
+    weekly = bucket_sentiment(rows, 'week', by_source=False)
+    assert [item['period'] for item in weekly] == ['2024-05-06', '2024-05-13']
+    assert weekly[0]['positive'] == 1 and weekly[0]['negative'] == 2 and weekly[0]['total'] == 3
+    assert weekly[0]['negative_ratio'] == round(2 / 3, 4)
+    assert len(bucket_sentiment(rows, 'day')) == 3
+
+
+def test_rising_keywords():
+    """按增长倍数排序，过滤偶发和下降的词语"""
+    recent = {'供暖': 6, '投诉': 4, '西昌': 10, '偶发': 1}
+    previous = {'供暖': 1, '西昌': 12}
+    rising = rising_keywords(recent, previous, limit=5, min_count=2)
+    assert [item['keyword'] for item in rising] == ['投诉', '供暖']
+    assert rising[1] == {'keyword': '供暖', 'count': 6, 'previous': 1, 'growth': 3.5}
+
+
+if __name__ == "__main__":
+    test_parse_keywords()
+    test_dump_keywords()
+    test_report_rollup_rows()
+    test_bucket_sentiment()
+    test_rising_keywords()
@@ -0,0 +1,250 @@
+"""
+分词进程池服务 - 在独立工作进程中执行 jieba 分词与关键词提取，避免长文档占用 Web 进程的 GIL
+"""
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import jieba
+import jieba.analyse
+
+from corpus_index import get_corpus_extractor
+
+
+def init_worker():
+    """工作进程初始化：构建 jieba 前缀词典"""
+    jieba.initialize()
+
+
+def extract_tags(text, top_k=10, with_weight=True, idf_path=None):
+    """
+    关键词提取（可在工作进程或当前进程中执行）
+
+    Args:
+        idf_path (str): 语料 IDF 文件，为空或文件不存在时使用 jieba 自带的 IDF
+    """
+    extractor = get_corpus_extractor(idf_path) if idf_path else None
+    extractor = extractor or jieba.analyse.default_tfidf
+    return list(extractor.extract_tags(text, topK=top_k, withWeight=with_weight))
+
+
+def extract_tags_batch(texts, top_k=10, with_weight=True, idf_path=None):
+    """批量关键词提取"""
+    return [extract_tags(text, top_k, with_weight, idf_path) for text in texts]
+
+
+class TokenizerPool:
+    """分词进程池
+
+    每个工作进程只加载一次 jieba 词典。短文本直接在当前进程中处理，
+    避免进程间传输的开销超过分词本身；长文本和批量任务提交到工作进程。
+    进程池异常退出时自动重建。
+    """
+
+    def __init__(self, workers=2, inline_threshold=2000, initializer=init_worker, initargs=(),
+                 timeout=30, metrics_window=60, start_method='spawn'):
+        """
+        初始化分词进程池（工作进程在首次提交任务时启动）
+
+        Args:
+            workers (int): 工作进程数，0 表示全部在当前进程中处理
+            inline_threshold (int): 不超过该字符数的输入在当前进程中处理
+            initializer (callable): 工作进程初始化函数，需包含 jieba 词典加载
+            initargs (tuple): 初始化函数参数
+            timeout (float): 等待单个任务结果的最长时间（秒）
+            metrics_window (float): 吞吐量统计的时间窗口（秒）
+            start_method (str): 工作进程启动方式。spawn 的工作进程各自加载词典；
+                fork 的工作进程与父进程共享已加载的词典，应在启动阶段（尚未创建其他线程时）调用 start()
+        """
+        self.workers = workers
+        self.inline_threshold = inline_threshold
+        self.initializer = initializer
+        self.initargs = initargs
+        self.timeout = timeout
+        self.metrics_window = metrics_window
+        self.start_method = start_method
+        self._executor = None
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.inline = 0
+        self.in_flight = 0
+        self.restarts = 0
+        self.finished_tasks = 0
+        self.busy_time = 0.0
+        self._recent = deque()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+            return self._executor
+
+    def start(self):
+        """立即启动全部工作进程并等待初始化完成（默认在首次提交长文本时启动）"""
+        if self.workers <= 0:
+            return
+        executor = self._get_executor()
+        futures = [executor.submit(int) for _ in range(self.workers)]
+        for future in futures:
+            future.result(timeout=self.timeout)
+
+    def _restart(self, broken):
+        """重建异常退出的进程池"""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, started, docs, chars, ok):
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += docs
+            else:
+                self.failed += docs
+            self.finished_tasks += 1
+            self.busy_time += now - started
+            self._recent.append((now, docs, chars))
+            while self._recent and self._recent[0][0] < now - self.metrics_window:
+                self._recent.popleft()
+
+    def _begin(self, docs):
+        """登记一个新任务，返回开始时间"""
+        with self._lock:
+            self.submitted += docs
+            self.in_flight += 1
+        return time.monotonic()
+
+    def submit(self, fn, *args, docs=1, chars=0):
+        """
+        提交任务到工作进程（进程池不可用时在当前进程中执行）
+
+        Args:
+            fn (callable): 模块级函数（需可在工作进程中导入）
+            docs (int): 任务包含的文档数，用于统计
+            chars (int): 任务包含的字符数，用于统计
+
+        Returns:
+            Future: 任务结果
+        """
+        started = self._begin(docs)
+        if self.workers <= 0:
+            return self._run_inline(fn, args, started, docs, chars)
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            print("分词进程池异常退出，正在重建")
+            self._restart(executor)
+            try:
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+            except Exception as e:
+                print(f"分词进程池不可用，改为在当前进程中处理: {e}")
+                return self._run_inline(fn, args, started, docs, chars)
+
+        def on_done(done_future):
+            error = done_future.exception() if not done_future.cancelled() else True
+            self._record(started, docs, chars, error is None)
+            if isinstance(error, BrokenProcessPool):
+                self._restart(executor)
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _run_inline(self, fn, args, started, docs, chars):
+        future = Future()
+        ok = True
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            ok = False
+            future.set_exception(e)
+        with self._lock:
+            self.inline += docs
+        self._record(started, docs, chars, ok)
+        return future
+
+    def extract_tags(self, text, top_k=10, with_weight=True, idf_path=None):
+        """
+        关键词提取，短文本在当前进程中处理
+
+        Returns:
+            list: 与 jieba.analyse.extract_tags 相同格式的关键词列表
+        """
+        text = text or ''
+        if len(text) <= self.inline_threshold:
+            return self._run_inline(extract_tags, (text, top_k, with_weight, idf_path),
+                                    self._begin(1), 1, len(text)).result()
+        return self.submit(extract_tags, text, top_k, with_weight, idf_path,
+                           chars=len(text)).result(timeout=self.timeout)
+
+    def extract_tags_many(self, texts, top_k=10, with_weight=True, chunk_size=16, idf_path=None):
+        """
+        批量关键词提取
+
+        Returns:
+            list: 与 texts 顺序一致的关键词列表
+        """
+        texts = [text or '' for text in texts]
+        total_chars = sum(len(text) for text in texts)
+        if total_chars <= self.inline_threshold:
+            return self._run_inline(extract_tags_batch, (texts, top_k, with_weight, idf_path),
+                                    self._begin(len(texts)), len(texts), total_chars).result()
+
+        futures = []
+        for i in range(0, len(texts), chunk_size):
+            chunk = texts[i:i + chunk_size]
+            futures.append(self.submit(extract_tags_batch, chunk, top_k, with_weight, idf_path,
+                                       docs=len(chunk), chars=sum(len(t) for t in chunk)))
+        results = []
+        for future in futures:
+            results.extend(future.result(timeout=self.timeout))
+        return results
+
+    def stats(self):
+        """
+        运行指标
+
+        Returns:
+            dict: 累计文档数、当前排队深度、时间窗口内的吞吐量等
+        """
+        with self._lock:
+            now = time.monotonic()
+            recent = [item for item in self._recent if item[0] >= now - self.metrics_window]
+            window = self.metrics_window
+            return {
+                'workers': self.workers,
+                'pool_started': self._executor is not None,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'inline': self.inline,
+                'in_flight': self.in_flight,
+                'queue_depth': max(0, self.in_flight - max(self.workers, 1)),
+                'restarts': self.restarts,
+                'docs_per_sec': round(sum(item[1] for item in recent) / window, 3),
+                'chars_per_sec': round(sum(item[2] for item in recent) / window, 1),
+                'avg_task_seconds': round(self.busy_time / self.finished_tasks, 4) if self.finished_tasks else 0.0
+            }
+
+    def shutdown(self, wait=True):
+        """关闭工作进程"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
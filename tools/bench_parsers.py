@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+结果页解析后端性能测试
+
+用法:
+    python tools/bench_parsers.py [--rounds 20] [--max-results 10]
+
+依次使用每个可用的解析后端解析仓库中保存的 debug_*.html 页面，
+输出每个后端的 pages/sec 和单页解析的内存峰值，并校验各后端返回的数据是否一致。
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from news_parsers import available_backends, get_parser_backend
+
+# 仓库中保存的百度新闻结果页
+FIXTURE_PAGES = ['debug_西昌.html', 'debug_科技.html', 'debug_财经.html', 'debug_人工智能.html']
+
+
+def build_sample_page(results=30):
+    """生成与百度新闻结果页结构一致的示例页面，用于校验字段提取结果"""
+    blocks = []
+    for i in range(results):
+        blocks.append(f'''
+<div class="result-op c-container xpath-log new-pmd result" srcid="200" id="{i + 1}">
+  <div class="c-row">
+    <h3 class="news-title_1YtI1 news-title"><a href="https://news.example.com/{i}" target="_blank">
+      示例新闻标题 <em>关键词</em> 第{i}条报道</a></h3>
+    <div class="c-span3"><img class="c-img" src="//t.example.com/img/{i}.jpg"></div>
+    <div class="c-span9">
+      <div class="c-summary c-row">这是第{i}条新闻的概要内容，描述了事件发生的时间地点和主要经过。<!-- 注释 --></div>
+      <p class="c-author"><span class="c-color-gray">新华网 {i}小时前</span></p>
+      <span class="c-color-gray2">新华网·{i}小时前</span>
+    </div>
+  </div>
+</div>''')
+    filler = '<div class="s-tab"><a href="/s?tn=news">网页</a></div>' * 200
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>百度资讯搜索</title>'
+            f'<script>var s = "<div class=result>";</script></head><body>{filler}'
+            f'<div id="content_left">{"".join(blocks)}</div></body></html>')
+
+
+def load_pages():
+    """读取 debug_*.html 页面"""
+    pages = []
+    for name in FIXTURE_PAGES:
+        path = os.path.join(ROOT_DIR, name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((name, f.read()))
+    pages.append(('sample(生成)', build_sample_page()))
+    return pages
+
+
+def strip_time(items):
+    """去掉抓取时间，便于比较不同后端的结果"""
+    return [{k: v for k, v in item.items() if k != 'crawl_time'} for item in items]
+
+
+def bench(backend, html, max_results, rounds):
+    """测量单个页面的解析速度（pages/sec）"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        backend.parse_news(html, max_results)
+        backend.parse_advanced(html, max_results)
+    elapsed = time.perf_counter() - started
+    # 每轮分别执行基本解析和高级解析，按页面次数计算
+    return rounds * 2 / elapsed
+
+
+def peak_memory(backend, html, max_results):
+    """测量单页解析（基本解析+高级解析）的内存峰值（KB）"""
+    tracemalloc.start()
+    try:
+        backend.parse_news(html, max_results)
+        backend.parse_advanced(html, max_results)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='结果页解析后端性能测试')
+    parser.add_argument('--rounds', type=int, default=20, help='每个页面的解析轮数')
+    parser.add_argument('--max-results', type=int, default=10, help='最大结果数量')
+    args = parser.parse_args()
+
+    backends = [get_parser_backend(name) for name in available_backends()]
+    pages = load_pages()
+
+    print(f"可用解析后端: {', '.join(b.name for b in backends)}")
+
+    for name, html in pages:
+        outputs = [(strip_time(b.parse_news(html, args.max_results)),
+                    strip_time(b.parse_advanced(html, args.max_results))) for b in backends]
+        consistent = all(output == outputs[0] for output in outputs)
+        count = len(outputs[0][0]) + len(outputs[0][1])
+
+        print(f"\n{name}  大小 {len(html.encode('utf-8')) / 1024:.1f} KB，"
+              f"结果 {count} 条，各后端结果{'一致' if consistent else '不一致'}")
+        for backend in backends:
+            speed = bench(backend, html, args.max_results, args.rounds)
+            peak = peak_memory(backend, html, args.max_results)
+            print(f"  {backend.name:<12}{speed:>10.1f} pages/sec{peak:>12.0f} KB 峰值")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+话题聚类性能测试
+
+用法:
+    python tools/bench_topics.py [--docs 100000] [--batch-size 1000] [--clusters 20]
+
+按若干潜在话题的词表随机生成文档，模拟按批次增量入库的过程，
+输出分词/向量化、partial_fit 的每批耗时、单篇预测延迟、读取话题列表的耗时，
+以及聚类结果相对潜在话题的纯度。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from topic_clustering import TopicModel
+
+# 潜在话题词表
+TOPIC_WORDS = [
+    ['卫星', '发射', '火箭', '航天', '轨道', '载荷', '测控', '升空'],
+    ['供暖', '小区', '居民', '投诉', '物业', '暖气', '维修', '温度'],
+    ['人工智能', '算法', '模型', '芯片', '算力', '数据', '训练', '智能'],
+    ['股市', '指数', '上涨', '投资者', '证券', '成交额', '板块', '行情'],
+    ['旅游', '景区', '游客', '假期', '酒店', '门票', '文旅', '客流'],
+    ['教育', '学校', '学生', '教师', '课程', '考试', '招生', '校园'],
+    ['医院', '医生', '患者', '医保', '药品', '门诊', '诊疗', '健康'],
+    ['交通', '道路', '拥堵', '地铁', '公交', '出行', '高速', '车辆'],
+    ['农业', '种植', '丰收', '农民', '粮食', '灌溉', '农产品', '乡村'],
+    ['环保', '污染', '排放', '空气', '治理', '生态', '河流', '监测'],
+]
+COMMON_WORDS = ['今天', '记者', '报道', '相关', '部门', '表示', '工作', '情况', '进一步', '发展']
+
+
+def generate_documents(count, seed=0):
+    """生成 (潜在话题编号, 文本) 列表"""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        topic = rng.randrange(len(TOPIC_WORDS))
+        words = rng.choices(TOPIC_WORDS[topic], k=8) + rng.choices(COMMON_WORDS, k=4)
+        rng.shuffle(words)
+        documents.append((topic, '，'.join(words) + '。'))
+    return documents
+
+
+def purity(assignments, truth):
+    """每个聚类中占多数的潜在话题所占比例"""
+    members = defaultdict(Counter)
+    for key, label in assignments:
+        members[label][truth[key]] += 1
+    return sum(counter.most_common(1)[0][1] for counter in members.values()) / max(len(assignments), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='话题聚类性能测试')
+    parser.add_argument('--docs', type=int, default=100000, help='文档数')
+    parser.add_argument('--batch-size', type=int, default=1000, help='每批文档数')
+    parser.add_argument('--clusters', type=int, default=20, help='话题数量')
+    args = parser.parse_args()
+
+    documents = generate_documents(args.docs)
+    truth = {i: topic for i, (topic, _) in enumerate(documents)}
+    model = TopicModel(n_clusters=args.clusters)
+
+    weigh_time = fit_time = 0.0
+    batches = 0
+    assignments = []
+    for start in range(0, len(documents), args.batch_size):
+        batch = [(i, text) for i, (_, text) in enumerate(documents[start:start + args.batch_size], start)]
+        started = time.perf_counter()
+        weighted = [model.weigh_terms(text) for _, text in batch]
+        model.vectorize(weighted)
+        weigh_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        assignments.extend(model.partial_fit(batch))
+        fit_time += time.perf_counter() - started
+        batches += 1
+
+    samples = [text for _, text in documents[:200]]
+    started = time.perf_counter()
+    for text in samples:
+        model.predict([text])
+    predict_ms = (time.perf_counter() - started) / len(samples) * 1000
+
+    started = time.perf_counter()
+    topics = model.topics()
+    topics_ms = (time.perf_counter() - started) * 1000
+
+    print(f"文档数: {args.docs}  批次: {batches}  话题数: {args.clusters}")
+    print(f"分词+向量化: {weigh_time:.2f}s（{weigh_time / batches * 1000:.1f} ms/批）")
+    print(f"partial_fit（含分词）: {fit_time:.2f}s（{fit_time / batches * 1000:.1f} ms/批，"
+          f"{args.docs / fit_time:.0f} docs/sec）")
+    print(f"单篇预测: {predict_ms:.2f} ms")
+    print(f"读取话题列表: {topics_ms:.2f} ms")
+    print(f"聚类纯度: {purity(assignments, truth):.3f}")
+    for topic in sorted(topics, key=lambda t: -t['heat'])[:5]:
+        print(f"  #{topic['cluster_id']} size={topic['size']} heat={topic['heat']:.1f} {'、'.join(topic['keywords'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,9 @@ def main():
     # 运行数据库迁移
     run_command("python manage.py migrate", "运行数据库迁移")
     
+    # 预构建 jieba 词典缓存，服务启动时直接加载
+    run_command("python nlp_warmup.py instance/jieba.cache", "预构建分词词典缓存")
+    
     # 重启服务（这里需要根据实际部署环境调整）
     print("\n=== 部署完成 ===")
     print("请根据您的部署环境重启服务")
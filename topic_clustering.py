@@ -0,0 +1,169 @@
+"""
+话题聚类 - 基于哈希 TF-IDF 向量和 MiniBatchKMeans 的增量话题聚类
+"""
+import math
+import os
+import pickle
+import tempfile
+import threading
+from collections import Counter
+
+import jieba.analyse
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import normalize
+
+from corpus_index import tokenize_terms
+
+
+def default_idf(term):
+    """jieba 内置 IDF 表中的词语权重"""
+    tfidf = jieba.analyse.default_tfidf
+    return tfidf.idf_freq.get(term, tfidf.median_idf)
+
+
+class TopicModel:
+    """增量话题模型
+
+    文本按 (1 + log tf) × IDF 加权后经特征哈希映射为定长稀疏向量（词表无需预先拟合，
+    新词不会改变特征空间），再用 MiniBatchKMeans.partial_fit 增量更新聚类中心。
+    每个话题维护按时间衰减的词语权重，用于给出话题关键词。
+    """
+
+    def __init__(self, n_clusters=20, n_features=2 ** 15, decay=0.98, keywords_per_topic=8,
+                 max_terms_per_topic=2000, random_state=0):
+        """
+        初始化话题模型
+
+        Args:
+            n_clusters (int): 话题数量
+            n_features (int): 哈希特征维数（聚类中心为稠密矩阵，占用 n_clusters × n_features × 8 字节）
+            decay (float): 每批数据后话题热度与词语权重的衰减系数
+            keywords_per_topic (int): 每个话题保留的关键词数量
+            max_terms_per_topic (int): 每个话题最多跟踪的词语数
+            random_state (int): 随机种子
+        """
+        self.n_clusters = n_clusters
+        self.decay = decay
+        self.keywords_per_topic = keywords_per_topic
+        self.max_terms_per_topic = max_terms_per_topic
+        self.hasher = FeatureHasher(n_features=n_features, input_type='dict', alternate_sign=False)
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+        self.fitted = False
+        self.sizes = np.zeros(n_clusters, dtype=np.int64)
+        self.heat = np.zeros(n_clusters, dtype=np.float64)
+        self.term_weights = [Counter() for _ in range(n_clusters)]
+        # 模型尚未拟合时暂存的文档（首批至少需要 n_clusters 篇）
+        self.pending = []
+        self.cursors = {}
+        self._lock = threading.Lock()
+
+    def weigh_terms(self, text, idf=default_idf):
+        """文本 -> 词语权重字典（忽略纯数字）"""
+        counts = Counter(term for term in tokenize_terms(text) if not term.isdigit())
+        return {term: (1 + math.log(count)) * idf(term) for term, count in counts.items()}
+
+    def vectorize(self, weighted_docs):
+        """词语权重字典列表 -> L2 归一化的稀疏矩阵"""
+        return normalize(self.hasher.transform(weighted_docs))
+
+    def partial_fit(self, items, idf=default_idf, with_distance=False):
+        """
+        用一批新文档更新模型
+
+        Args:
+            items (list): (文档键, 文本) 列表
+            idf (callable): 词语 -> IDF 权重
+            with_distance (bool): 是否同时返回文档与所属聚类中心的距离
+
+        Returns:
+            list: (文档键, 话题编号) 列表，with_distance 时为 (文档键, 话题编号, 距离)；
+                  模型尚未拟合时暂存的文档在拟合后一并返回
+        """
+        weighted = [(key, self.weigh_terms(text, idf)) for key, text in items]
+        weighted = [(key, terms) for key, terms in weighted if terms]
+        with self._lock:
+            if not self.fitted:
+                self.pending.extend(weighted)
+                if len(self.pending) < self.n_clusters:
+                    return []
+                weighted, self.pending = self.pending, []
+            if not weighted:
+                return []
+
+            matrix = self.vectorize([terms for _, terms in weighted])
+            self.kmeans.partial_fit(matrix)
+            self.fitted = True
+            labels = self.kmeans.predict(matrix)
+
+            self.heat *= self.decay
+            for (_, terms), label in zip(weighted, labels):
+                self.sizes[label] += 1
+                self.heat[label] += 1
+                self.term_weights[label].update(terms)
+            for label in set(labels.tolist()):
+                self._trim_terms(label)
+            if with_distance:
+                distances = self.kmeans.transform(matrix)[np.arange(len(labels)), labels]
+                return [(key, int(label), float(distance))
+                        for (key, _), label, distance in zip(weighted, labels, distances)]
+            return [(key, int(label)) for (key, _), label in zip(weighted, labels)]
+
+    def _trim_terms(self, label):
+        """衰减话题词语权重，只保留权重最高的部分词语"""
+        weights = self.term_weights[label]
+        for term in weights:
+            weights[term] *= self.decay
+        if len(weights) > self.max_terms_per_topic:
+            self.term_weights[label] = Counter(dict(weights.most_common(self.max_terms_per_topic)))
+
+    def predict(self, texts, idf=default_idf):
+        """预测文本所属话题（不更新模型），模型尚未拟合时返回 None"""
+        if not self.fitted:
+            return None
+        matrix = self.vectorize([self.weigh_terms(text, idf) for text in texts])
+        return self.kmeans.predict(matrix).tolist()
+
+    def topics(self):
+        """
+        话题列表
+
+        Returns:
+            list: 每个话题包含 cluster_id、keywords、size、heat
+        """
+        with self._lock:
+            return [{
+                'cluster_id': label,
+                'keywords': [term for term, _ in self.term_weights[label].most_common(self.keywords_per_topic)],
+                'size': int(self.sizes[label]),
+                'heat': round(float(self.heat[label]), 4)
+            } for label in range(self.n_clusters)]
+
+    def save(self, path):
+        """写入模型文件（先写临时文件再替换）"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.pkl')
+        with self._lock:
+            state = {k: v for k, v in self.__dict__.items() if k != '_lock'}
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **options):
+        """加载模型文件，不存在或参数不一致时返回新模型"""
+        model = cls(**options)
+        if not os.path.exists(path):
+            return model
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"加载话题模型失败，将重新训练: {e}")
+            return model
+        if state.get('n_clusters') != model.n_clusters:
+            return model
+        model.__dict__.update(state)
+        return model
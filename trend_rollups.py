@@ -0,0 +1,169 @@
+"""
+趋势汇总 - 报告关键词的解析与存储格式、按日汇总行的增量计算，以及按周/日分桶和上升关键词排序
+"""
+import ast
+import json
+from collections import defaultdict
+from datetime import timedelta
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+
+# 未填写来源的报告在汇总表中使用的来源名
+UNKNOWN_SOURCE = '未知'
+
+
+def parse_keywords(text):
+    """
+    解析报告中保存的关键词
+
+    keywords 列保存的是紧凑 JSON（[[词语, 权重], ...]），早期的报告为 str(关键词列表)，
+    元素为 (词语, 权重) 元组或单独的词语。先按 JSON 解析，失败时使用 ast.literal_eval，
+    格式不正确时返回空列表。
+
+    Returns:
+        list: (词语, 权重) 列表
+    """
+    if not text:
+        return []
+    try:
+        value = json.loads(text)
+    except ValueError:
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            return []
+    if not isinstance(value, (list, tuple)):
+        return []
+    keywords = []
+    for item in value:
+        if isinstance(item, str):
+            keywords.append((item, 1.0))
+        elif (isinstance(item, (list, tuple)) and len(item) == 2 and isinstance(item[0], str)
+              and isinstance(item[1], (int, float)) and not isinstance(item[1], bool)):
+            keywords.append((item[0], float(item[1])))
+    return keywords
+
+
+def merge_keywords(keywords):
+    """
+    合并重复的词语（权重相加），保持首次出现的顺序
+
+    Returns:
+        list: (词语, 权重) 列表
+    """
+    merged = defaultdict(float)
+    for word, weight in keywords:
+        merged[word] += weight
+    return list(merged.items())
+
+
+def dump_keywords(keywords):
+    """
+    把关键词列表保存为紧凑 JSON（报告 keywords 列的存储格式）
+
+    Args:
+        keywords (list): (词语, 权重) 列表或词语列表
+
+    Returns:
+        str: 形如 [["西昌",0.85],["卫星",0.6]] 的 JSON
+    """
+    items = [[item, 1.0] if isinstance(item, str) else [item[0], round(float(item[1]), 6)]
+             for item in keywords or []]
+    return json.dumps(items, ensure_ascii=False, separators=(',', ':'))
+
+
+def report_rollup_rows(day, source, sentiment, keywords_text, sign=1):
+    """
+    一篇报告对按日汇总表的增量
+
+    Args:
+        day (date): 报告日期
+        source (str): 数据来源
+        sentiment (str): positive / negative / neutral，其他取值计入 neutral
+        keywords_text (str): 报告中保存的关键词
+        sign (int): 1 新增报告，-1 删除报告
+
+    Returns:
+        tuple: (情感汇总行, 关键词汇总行列表)
+    """
+    source = source or UNKNOWN_SOURCE
+    sentiment = sentiment if sentiment in SENTIMENTS else 'neutral'
+    sentiment_row = {'day': day, 'source': source, 'total': sign}
+    for name in SENTIMENTS:
+        sentiment_row[name] = sign if name == sentiment else 0
+
+    keyword_rows = [{'day': day, 'source': source, 'keyword': word,
+                     'report_count': sign, 'weight': sign * weight}
+                    for word, weight in merge_keywords(parse_keywords(keywords_text))]
+    return sentiment_row, keyword_rows
+
+
+def period_start(day, granularity='day'):
+    """所在周期的第一天（周从周一开始）"""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def bucket_sentiment(rows, granularity='day', by_source=True):
+    """
+    把按日汇总行合并为按日/按周的序列
+
+    Args:
+        rows (iterable): 包含 day、source、positive、negative、neutral、total 属性的汇总行
+        granularity (str): day 或 week
+        by_source (bool): 是否按来源分别统计
+
+    Returns:
+        list: 按周期（及来源）排序的统计字典，不含报告已全部删除的周期
+    """
+    buckets = defaultdict(lambda: dict.fromkeys(SENTIMENTS + ('total',), 0))
+    for row in rows:
+        key = (period_start(row.day, granularity), row.source if by_source else None)
+        bucket = buckets[key]
+        for name in SENTIMENTS + ('total',):
+            bucket[name] += getattr(row, name)
+
+    series = []
+    for (start, source), counts in sorted(buckets.items(), key=lambda item: (item[0][0], item[0][1] or '')):
+        if not counts['total']:
+            continue
+        item = {'period': start.strftime('%Y-%m-%d')}
+        if by_source:
+            item['source'] = source
+        item.update(counts)
+        item['negative_ratio'] = round(counts['negative'] / counts['total'], 4) if counts['total'] else 0.0
+        series.append(item)
+    return series
+
+
+def rising_keywords(recent, previous, limit=20, min_count=2):
+    """
+    上升关键词
+
+    按 (本期次数 + 1) / (上期次数 + 1) 的增长倍数排序，倍数相同时按本期次数排序。
+
+    Args:
+        recent (dict): 关键词 -> 本期出现的报告数
+        previous (dict): 关键词 -> 上期出现的报告数
+        limit (int): 返回数量
+        min_count (int): 本期至少出现的报告数，过滤偶发词语
+
+    Returns:
+        list: 包含 keyword、count、previous、growth 的字典
+    """
+    ranked = []
+    for keyword, count in recent.items():
+        if count < min_count:
+            continue
+        before = previous.get(keyword, 0)
+        if count <= before:
+            continue
+        ranked.append({
+            'keyword': keyword,
+            'count': int(count),
+            'previous': int(before),
+            'growth': round((count + 1) / (before + 1), 4)
+        })
+    ranked.sort(key=lambda item: (-item['growth'], -item['count'], item['keyword']))
+    return ranked[:limit]